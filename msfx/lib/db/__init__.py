@@ -12,11 +12,12 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from datetime import date, time, datetime, timedelta
+import struct
+from datetime import date, time, datetime, timedelta, timezone
 from decimal import Decimal, ROUND_HALF_UP
 from enum import Enum
 from numbers import Complex
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Iterable
 
 from msfx.lib import round_num
 
@@ -42,13 +43,16 @@ class Types(Enum):
 
     @staticmethod
     def get_type(value: object):
+        type = _TYPES_BY_CLASS.get(value.__class__)
+        if type is not None: return type
         if isinstance(value, bool): return Types.BOOLEAN
         if isinstance(value, Decimal): return Types.DECIMAL
         if isinstance(value, int): return Types.INTEGER
         if isinstance(value, float): return Types.FLOAT
+        if isinstance(value, complex): return Types.COMPLEX
+        if isinstance(value, datetime): return Types.DATETIME
         if isinstance(value, date): return Types.DATE
         if isinstance(value, time): return Types.TIME
-        if isinstance(value, datetime): return Types.DATETIME
         if isinstance(value, bytes): return Types.BINARY
         if isinstance(value, str): return Types.STRING
         if isinstance(value, (tuple, list)): return Types.LIST
@@ -68,8 +72,63 @@ class Types(Enum):
     def accepts_none(self) -> bool: return self in Types.get_types_none()
 
     """ End of class Types """
+
+# Dispatch tables built once, used by Types.get_type and Value.
+
+_TYPES_BY_CLASS = {
+    bool: Types.BOOLEAN,
+    Decimal: Types.DECIMAL,
+    int: Types.INTEGER,
+    float: Types.FLOAT,
+    complex: Types.COMPLEX,
+    date: Types.DATE,
+    time: Types.TIME,
+    datetime: Types.DATETIME,
+    bytes: Types.BINARY,
+    str: Types.STRING,
+    tuple: Types.LIST,
+    list: Types.LIST,
+    dict: Types.DICT,
+}
+_CLASSES_BY_TYPE = {
+    Types.BOOLEAN: bool,
+    Types.DECIMAL: Decimal,
+    Types.INTEGER: int,
+    Types.FLOAT: float,
+    Types.COMPLEX: complex,
+    Types.DATE: date,
+    Types.TIME: time,
+    Types.DATETIME: datetime,
+    Types.BINARY: (bytes, bytearray),
+    Types.STRING: str,
+    Types.LIST: list,
+    Types.DICT: dict,
+}
+_COMPARABLE_CLASSES_BY_TYPE = {
+    Types.BOOLEAN: bool,
+    Types.DECIMAL: (int, float, complex, Decimal),
+    Types.INTEGER: (int, float, complex, Decimal),
+    Types.FLOAT: (int, float, complex, Decimal),
+    Types.COMPLEX: (int, float, complex, Decimal),
+    Types.DATE: date,
+    Types.TIME: time,
+    Types.DATETIME: datetime,
+    Types.BINARY: bytes,
+    Types.STRING: str,
+    Types.LIST: list,
+    Types.DICT: dict,
+}
+_TYPES_NONE = frozenset(Types.get_types_none())
+_TYPES_NUMERIC = frozenset(Types.get_types_numeric())
+
 class Value:
-    """ Encapsulates a mutable value of one of the supported types. """
+    """
+    Encapsulates a mutable value of one of the supported types.
+    Slotted to keep million row result sets compact, type checks are
+    resolved through dispatch tables built once at import.
+    """
+    __slots__ = ("__value", "__type", "__modified")
+
     def __init__(self, value):
         # Argument value can not be None: either it is a non None value,
         # or a type which value can be None.
@@ -77,24 +136,22 @@ class Value:
 
         # If value is an instance of Types is must be one of the types
         # that are nullable (DATE, TIME, DATETIME and BINARY).
-        if isinstance(value, Types):
-            if value not in Types.get_types_none():
-                raise TypeError(f"Only types {Types.get_types_none()} accept a None value")
-
-        self.__value = None
-        self.__type: Optional[Types] = None
-        self.__modified: bool = False
-
         # The type is passed as argument value is None, and we are done.
         if isinstance(value, Types):
-            self.__type = value
+            if value not in _TYPES_NONE:
+                raise TypeError(f"Only types {Types.get_types_none()} accept a None value")
+            self.__value = None
+            self.__type: Types = value
+            self.__modified: bool = False
             return
 
         # Assing the proper type or raise an exception if not supported.
-        self.__type = Types.get_type(value)
+        type = _TYPES_BY_CLASS.get(value.__class__)
+        self.__type: Types = type if type is not None else Types.get_type(value)
 
         # Assign the value.
         self.__value = value
+        self.__modified: bool = False
 
     def type(self) -> Types:
         return self.__type
@@ -105,111 +162,103 @@ class Value:
         return self.__modified
 
     def is_boolean(self) -> bool:
-        return self.__type == Types.BOOLEAN
+        return self.__type is Types.BOOLEAN
     def is_decimal(self) -> bool:
-        return self.__type == Types.DECIMAL
+        return self.__type is Types.DECIMAL
     def is_integer(self) -> bool:
-        return self.__type == Types.INTEGER
+        return self.__type is Types.INTEGER
     def is_float(self) -> bool:
-        return self.__type == Types.FLOAT
+        return self.__type is Types.FLOAT
     def is_complex(self) -> bool:
-        return self.__type == Types.COMPLEX
+        return self.__type is Types.COMPLEX
     def is_numeric(self) -> bool:
-        return self.__type in Types.get_types_numeric()
+        return self.__type in _TYPES_NUMERIC
     def is_date(self) -> bool:
-        return self.__type == Types.DATE
+        return self.__type is Types.DATE
     def is_time(self) -> bool:
-        return self.__type == Types.TIME
+        return self.__type is Types.TIME
     def is_datetime(self) -> bool:
-        return self.__type == Types.DATETIME
+        return self.__type is Types.DATETIME
     def is_binary(self) -> bool:
-        return self.__type == Types.BINARY
+        return self.__type is Types.BINARY
     def is_string(self) -> bool:
-        return self.__type == Types.STRING
+        return self.__type is Types.STRING
     def is_list(self) -> bool:
-        return self.__type == Types.LIST
+        return self.__type is Types.LIST
     def is_dict(self) -> bool:
-        return self.__type == Types.DICT
+        return self.__type is Types.DICT
 
     def get_boolean(self) -> bool:
-        if not self.is_boolean():
+        if self.__type is not Types.BOOLEAN:
             raise TypeError("Type is not BOOLEAN")
-        if self.is_none():
+        if self.__value is None:
             return False
         return bool(self.__value)
     def get_decimal(self) -> Decimal:
-        if not self.is_numeric():
+        if self.__type not in _TYPES_NUMERIC:
             raise TypeError("Type is not NUMERIC")
-        if self.is_none():
+        if self.__value is None:
             return Decimal(0)
         return Decimal(self.__value)
     def get_integer(self) -> int:
-        if not self.is_numeric():
+        if self.__type not in _TYPES_NUMERIC:
             raise TypeError("Type is not NUMERIC")
-        if self.is_none():
+        if self.__value is None:
             return 0
         return int(self.__value)
     def get_float(self) -> float:
-        if not self.is_numeric():
+        if self.__type not in _TYPES_NUMERIC:
             raise TypeError("Type is not NUMERIC")
-        if self.is_none():
+        if self.__value is None:
             return 0.0
         return float(self.__value)
     def get_complex(self) -> complex:
-        if not self.is_numeric():
+        if self.__type not in _TYPES_NUMERIC:
             raise TypeError("Type is not NUMERIC")
-        if self.is_none():
+        if self.__value is None:
             return complex(0, 0)
         return complex(self.__value)
     def get_date(self) -> Optional[date]:
-        if not self.is_date():
+        if self.__type is not Types.DATE:
             raise TypeError("Type is not DATE.")
-        if self.is_none():
-            return None
         return self.__value
     def get_time(self) -> Optional[time]:
-        if not self.is_time():
+        if self.__type is not Types.TIME:
             raise TypeError("Type is not TIME.")
-        if self.is_none():
-            return None
         return self.__value
     def get_datetime(self) -> Optional[datetime]:
-        if not self.is_datetime():
+        if self.__type is not Types.DATETIME:
             raise TypeError("Type is not DATETIME.")
-        if self.is_none():
-            return None
         return self.__value
     def get_binary(self) -> bytes:
-        if not self.is_binary():
+        if self.__type is not Types.BINARY:
             raise TypeError("Type is not BINARY.")
-        if self.is_none():
+        if self.__value is None:
             return bytes([])
         return self.__value
     def get_string(self) -> str:
-        if not self.is_string():
+        if self.__type is not Types.STRING:
             raise TypeError("Type is not STRING.")
-        if self.is_none():
+        if self.__value is None:
             return ""
         return self.__value
     def get_list(self) -> list:
-        if not self.is_list():
+        if self.__type is not Types.LIST:
             raise TypeError("Type is not LIST.")
-        if self.is_none():
+        if self.__value is None:
             return []
         return self.__value
     def get_dict(self) -> dict:
-        if not self.is_dict():
+        if self.__type is not Types.DICT:
             raise TypeError("Type is not DICT")
-        if self.is_none():
+        if self.__value is None:
             return {}
         return self.__value
 
     def get_scale(self) -> int:
-        if self.__type not in (Types.DECIMAL, Types.INTEGER):
+        if self.__type is not Types.DECIMAL and self.__type is not Types.INTEGER:
             raise TypeError("The scale has sense only for DECIMAL and INTEGER types")
-        if self.is_none():
-            return 0
-        if self.is_integer():
+        if self.__value is None or self.__type is Types.INTEGER:
             return 0
         return abs(int(self.get_decimal().as_tuple().exponent))
 
@@ -246,44 +295,27 @@ class Value:
     def __set__(self, value):
         # The value can not be None in a set operation.
         if value is None:
-            if self.__type not in (Types.DATE, Types.TIME, Types.DATETIME):
+            if self.__type not in _TYPES_NONE:
                 raise ValueError("Value can only be None for types DATE, TIME, DATETIME.")
+            self.__value = None
+            self.__modified = True
+            return
 
         # Exact type matching
-        exact_matches = [
-            (lambda v: isinstance(v, bool), lambda: self.is_boolean()),
-            (lambda v: isinstance(v, Decimal), lambda: self.is_decimal()),
-            (lambda v: isinstance(v, int), lambda: self.is_integer()),
-            (lambda v: isinstance(v, float), lambda: self.is_float()),
-            (lambda v: isinstance(v, complex), lambda: self.is_complex()),
-            (lambda v: isinstance(v, date), lambda: self.is_date()),
-            (lambda v: isinstance(v, time), lambda: self.is_time()),
-            (lambda v: isinstance(v, datetime), lambda: self.is_datetime()),
-            (lambda v: isinstance(v, (bytes, bytearray)), lambda: self.is_binary()),
-            (lambda v: isinstance(v, str), lambda: self.is_string()),
-            (lambda v: isinstance(v, list), lambda: self.is_list()),
-            (lambda v: isinstance(v, dict), lambda: self.is_dict())
-        ]
-        for value_type, self_type in exact_matches:
-            if value_type(value) and self_type():
-                self.__value = value
-                self.__modified = True
-                return
+        if isinstance(value, _CLASSES_BY_TYPE[self.__type]):
+            self.__value = value
+            self.__modified = True
+            return
 
         # Compatible numeric type matching
-        if isinstance(value, (Decimal, int, float, complex)) and self.is_numeric():
+        if isinstance(value, (Decimal, int, float, complex)) and self.__type in _TYPES_NUMERIC:
             if isinstance(value, complex): value = value.real
-            if self.is_decimal():
+            if self.__type is Types.DECIMAL:
                 # self is decimal and not None, preserve scale
                 scale = self.get_scale()
                 self.__value = round_num(value, scale)
             else:
-                if self.is_integer():
-                    self.__value = int(value)
-                if self.is_float():
-                    self.__value = float(value)
-                if self.is_complex():
-                    self.__value = complex(value)
+                self.__value = _CLASSES_BY_TYPE[self.__type](value)
             self.__modified = True
             return
 
@@ -297,30 +329,10 @@ class Value:
         return 1
     def is_comparable(self, other) -> bool:
         if isinstance(other, Value):
-            if self.is_numeric() and other.is_numeric():
-                return True
-            if self.__type == other.__type:
+            if self.__type in _TYPES_NUMERIC and other.__type in _TYPES_NUMERIC:
                 return True
-            return False
-        if self.is_boolean():
-            return isinstance(other, bool)
-        if self.is_numeric():
-            return isinstance(other, (int, float, complex, Decimal))
-        if self.is_date():
-            return isinstance(other, date)
-        if self.is_time():
-            return isinstance(other, time)
-        if self.is_datetime():
-            return isinstance(other, datetime)
-        if self.is_binary():
-            return isinstance(other, bytes)
-        if self.is_string():
-            return isinstance(other, str)
-        if self.is_list():
-            return isinstance(other, list)
-        if self.is_dict():
-            return isinstance(other, dict)
-        return False
+            return self.__type is other.__type
+        return isinstance(other, _COMPARABLE_CLASSES_BY_TYPE[self.__type])
 
     def __lt__(self, other) -> bool:
         if isinstance(other, Value):
@@ -363,13 +375,134 @@ class Value:
             return ""
         return str(self.__value)
     def __repr__(self):
-        if self.is_string():
+        if self.__type is Types.STRING:
             return "'" + str(self.__value) + "'"
         return self.__str__()
     """ End of class Value """
+
+# Sort keys. A segment (value, asc) compiles to two items, a null flag and a primitive,
+# None sorting first in ascending segments and last in descending ones, and descending
+# values inverted, so that keys compare as native tuples. Values are inverted by class.
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROS = timedelta(microseconds=1)
+
+def get_micros(value: datetime) -> int:
+    """ Returns the microseconds since the epoch of a date-time, aware ones in UTC. """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROS
+def get_datetime_from_micros(micros: int) -> datetime:
+    """ Returns the naive date-time of the microseconds since the epoch. """
+    return _EPOCH + micros * _MICROS
+def get_time_micros(value: time) -> int:
+    """ Returns the microseconds since midnight of a time. """
+    return ((value.hour * 60 + value.minute) * 60 + value.second) * 1000000 + value.microsecond
+def get_time_from_micros(micros: int) -> time:
+    """ Returns the time of the microseconds since midnight. """
+    seconds, microsecond = divmod(micros, 1000000)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return time(hour, minute, second, microsecond)
+
+def _encode_bytes(value: bytes) -> bytes:
+    # Zero bytes escaped as 00 FF and the end as 00 01, so that a prefix sorts first.
+    return bytes(value).replace(b"\x00", b"\x00\xff") + b"\x00\x01"
+
+# Table to complement bytes, descending strings and binaries are their complemented encoding.
+_INVERSION = bytes(range(255, -1, -1))
+
+_SORT_INVERTERS = {
+    bool: lambda value: -int(value),
+    int: lambda value: -value,
+    float: lambda value: -value,
+    Decimal: lambda value: -value,
+    date: lambda value: -value.toordinal(),
+    time: lambda value: -get_time_micros(value),
+    datetime: lambda value: -get_micros(value),
+    str: lambda value: _encode_bytes(value.encode("utf-8")).translate(_INVERSION),
+    bytes: lambda value: _encode_bytes(value).translate(_INVERSION),
+    bytearray: lambda value: _encode_bytes(value).translate(_INVERSION),
+}
+
+def get_sort_key(segments: Iterable[tuple]) -> tuple:
+    """
+    Returns the native sort key of a sequence of (value, asc) segments, a flat tuple of
+    primitives that compares as the segments in their direction.
+    :param segments: The (value, asc) tuples, values can be Value instances or raw values.
+    :return: The tuple of primitives.
+    """
+    key = []
+    for value, asc in segments:
+        if isinstance(value, Value): value = value.value()
+        if value is None:
+            key += (0, 0) if asc else (1, 0)
+        elif asc:
+            key += (1, value)
+        else:
+            invert = _SORT_INVERTERS.get(value.__class__)
+            if invert is None: raise TypeError(f"Not sortable value {value!r}")
+            key += (0, invert(value))
+    return tuple(key)
+
+# Byte encodings whose unsigned byte order is the order of the values.
+
+_INT64_SIGN = 1 << 63
+
+def _encode_int(value: int) -> bytes:
+    if not -_INT64_SIGN <= value < _INT64_SIGN:
+        raise ValueError(f"Integer {value} out of the 64 bits range")
+    return (value + _INT64_SIGN).to_bytes(8, "big")
+def _encode_float(value: float) -> bytes:
+    bits = int.from_bytes(struct.pack(">d", value), "big")
+    bits = bits ^ 0xFFFFFFFFFFFFFFFF if bits & _INT64_SIGN else bits | _INT64_SIGN
+    return bits.to_bytes(8, "big")
+def _encode_decimal(value: Decimal) -> bytes:
+    # Marker of the sign, then for non zero values the exponent of the normalized digits
+    # 0.d1d2...dn and the digits ended by a zero byte, all inverted for negative values.
+    if not value.is_finite(): raise ValueError(f"Not sortable decimal {value}")
+    if value.is_zero(): return b"\x02"
+    sign, digits, exponent = value.normalize().as_tuple()
+    encoded = (len(digits) + exponent + _INT64_SIGN).to_bytes(8, "big") + bytes(48 + d for d in digits) + b"\x00"
+    if sign: return b"\x01" + encoded.translate(_INVERSION)
+    return b"\x03" + encoded
+
+_SORT_ENCODERS = {
+    bool: lambda value: b"\x01" if value else b"\x00",
+    int: _encode_int,
+    float: _encode_float,
+    Decimal: _encode_decimal,
+    date: lambda value: value.toordinal().to_bytes(4, "big"),
+    time: lambda value: get_time_micros(value).to_bytes(8, "big"),
+    datetime: lambda value: _encode_int(get_micros(value)),
+    str: lambda value: _encode_bytes(value.encode("utf-8")),
+    bytes: _encode_bytes,
+    bytearray: _encode_bytes,
+}
+
+def get_sort_bytes(segments: Iterable[tuple]) -> bytes:
+    """
+    Returns the memcmp-able encoding of a sequence of (value, asc) segments, bytes that
+    compare as the segments in their direction. Integers must fit in 64 bits, and a segment
+    must hold values of the same class in all the keys compared.
+    :param segments: The (value, asc) tuples, values can be Value instances or raw values.
+    :return: The encoded bytes.
+    """
+    encoded = bytearray()
+    for value, asc in segments:
+        if isinstance(value, Value): value = value.value()
+        if value is None:
+            segment = b"\x00"
+        else:
+            encode = _SORT_ENCODERS.get(value.__class__)
+            if encode is None: raise TypeError(f"Not sortable value {value!r}")
+            segment = b"\x01" + encode(value)
+        encoded += segment if asc else segment.translate(_INVERSION)
+    return bytes(encoded)
+
 class Key:
     """
-    A key or list of tuples of a value and an ascending/descending boolean.
+    A key or list of values, all ascending.
     A key is just aimed to append segments and use it.
     The clear method is there to reuse the key.
     """
@@ -381,6 +514,13 @@ class Key:
     def clear(self):
         self.__segments.clear()
 
+    def get_sort_key(self) -> tuple:
+        """ Returns the native sort key, computed on each call as values are mutable. """
+        return get_sort_key((value, True) for value in self.__segments)
+    def get_sort_bytes(self) -> bytes:
+        """ Returns the memcmp-able encoding of the key. """
+        return get_sort_bytes((value, True) for value in self.__segments)
+
     def __iter__(self):
         return self.__segments.__iter__()
     def __len__(self) -> int:
@@ -388,23 +528,24 @@ class Key:
     def __getitem__(self, index: int) -> Value:
         return self.__segments[index]
     def __lt__(self, other) -> bool:
-        return self.__segments < other.__segments
+        return self.get_sort_key() < other.get_sort_key()
     def __le__(self, other) -> bool:
-        return self.__segments <= other.__segments
+        return self.get_sort_key() <= other.get_sort_key()
     def __eq__(self, other) -> bool:
         return self.__segments == other.__segments
     def __ne__(self, other) -> bool:
         return not self.__segments == other.__segments
     def __gt__(self, other) -> bool:
-        return self.__segments > other.__segments
+        return self.get_sort_key() > other.get_sort_key()
     def __ge__(self, other) -> bool:
-        return self.__segments >= other.__segments
-    """ End of class OrderKey """
+        return self.get_sort_key() >= other.get_sort_key()
+    """ End of class Key """
 class OrderKey:
     """
     An order key or list of tuples of a value and an ascending/descending boolean.
     An order key is just aimed to append segments and use it.
     The clear method is there to reuse the key.
+    Order comparisons use the native sort key, so descending segments compare inverted.
     """
     def __init__(self):
         self.__segments = []
@@ -414,6 +555,13 @@ class OrderKey:
     def clear(self):
         self.__segments.clear()
 
+    def get_sort_key(self) -> tuple:
+        """ Returns the native sort key, computed on each call as values are mutable. """
+        return get_sort_key(self.__segments)
+    def get_sort_bytes(self) -> bytes:
+        """ Returns the memcmp-able encoding of the key. """
+        return get_sort_bytes(self.__segments)
+
     def __iter__(self):
         return self.__segments.__iter__()
     def __len__(self) -> int:
@@ -421,17 +569,17 @@ class OrderKey:
     def __getitem__(self, index: int) -> (Value, bool):
         return self.__segments[index]
     def __lt__(self, other) -> bool:
-        return self.__segments < other.__segments
+        return self.get_sort_key() < other.get_sort_key()
     def __le__(self, other) -> bool:
-        return self.__segments <= other.__segments
+        return self.get_sort_key() <= other.get_sort_key()
     def __eq__(self, other) -> bool:
         return self.__segments == other.__segments
     def __ne__(self, other) -> bool:
         return not self.__segments == other.__segments
     def __gt__(self, other) -> bool:
-        return self.__segments > other.__segments
+        return self.get_sort_key() > other.get_sort_key()
     def __ge__(self, other) -> bool:
-        return self.__segments >= other.__segments
+        return self.get_sort_key() >= other.get_sort_key()
     """ End of class OrderKey """
 
 TYPE_MAPPING = {
@@ -516,6 +664,13 @@ def get_value(type: Types, scale: int, raw_value: any) -> Value:
         if type == Types.INTEGER: return Value(int(raw_value.real))
         if type == Types.FLOAT: return Value(float(raw_value.real))
 
+    # Conversion of ISO text, as stored by engines without temporal or decimal types.
+    if isinstance(raw_value, str):
+        if type == Types.DATE: return Value(date.fromisoformat(raw_value))
+        if type == Types.TIME: return Value(time.fromisoformat(raw_value))
+        if type == Types.DATETIME: return Value(datetime.fromisoformat(raw_value))
+        if type == Types.DECIMAL: return Value(round_num(Decimal(raw_value), scale))
+
     # Conversion of time_delta to time.
     if type == Types.TIME and isinstance(raw_value, timedelta):
         time_of_day = (datetime.min + raw_value).time()
@@ -528,4 +683,63 @@ def get_value(type: Types, scale: int, raw_value: any) -> Value:
         if type == Types.TIME: return Value(value.time())
         if type == Types.DATETIME: return Value(value)
 
-    raise ValueError(f"Unsupported value {raw_value} for type {type}")
\ No newline at end of file
+    raise ValueError(f"Unsupported value {raw_value} for type {type}")
+
+def get_converter(type: Types, scale: int) -> Callable[[Any], Value]:
+    """
+    Returns a function that converts a raw value into a value of the given type and scale,
+    with the same semantics as get_value, but validating the type and scale only once.
+    Raw values of the expected class are converted directly, any other raw value is
+    delegated to get_value.
+    :param type: The type to get the value for.
+    :param scale: The scale to apply for decimals.
+    :return: The converter function.
+    """
+
+    # The type must be correct.
+    if not isinstance(type, Types):
+        raise TypeError(f"Type {type} is not a Types instance")
+
+    # If the type is DECIMAL then the scale must be GE 0.
+    if type == Types.DECIMAL:
+        if not isinstance(scale, int) or scale < 0:
+            raise ValueError(f"Scale {scale} is not a positive integer")
+
+    def fallback(raw_value) -> Value:
+        return get_value(type, scale, raw_value)
+
+    if type == Types.DECIMAL:
+        quantum = Decimal(f"1e-{scale}")
+        def decimal_converter(raw_value) -> Value:
+            if raw_value.__class__ is Decimal:
+                return Value(raw_value.quantize(quantum, rounding=ROUND_HALF_UP))
+            return fallback(raw_value)
+        return decimal_converter
+
+    if type == Types.TIME:
+        def time_converter(raw_value) -> Value:
+            if raw_value.__class__ is timedelta:
+                return Value((datetime.min + raw_value).time())
+            if raw_value.__class__ is time:
+                return Value(raw_value)
+            return fallback(raw_value)
+        return time_converter
+
+    if type == Types.DATETIME:
+        def datetime_converter(raw_value) -> Value:
+            if raw_value.__class__ is datetime:
+                return Value(raw_value)
+            if raw_value.__class__ is str:
+                return Value(datetime.fromisoformat(raw_value))
+            if raw_value.__class__ is int:
+                return Value(datetime.fromtimestamp(raw_value / 1000))
+            return fallback(raw_value)
+        return datetime_converter
+
+    # Rest of types, direct match of the raw value class.
+    expected_class = TYPE_MAPPING.get(type)
+    def converter(raw_value) -> Value:
+        if raw_value.__class__ is expected_class:
+            return Value(raw_value)
+        return fallback(raw_value)
+    return converter
@@ -14,14 +14,20 @@
 
 """ Defines an simple interface that SQL databases connectors must implement. """
 
+import sys
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import date, time, datetime
 from decimal import Decimal
-from typing import Callable, Optional
+from functools import partial
+from time import perf_counter
+from typing import Callable, Optional, Iterable, Iterator, Union
 
 from msfx.lib.db import Types, Value
-from msfx.lib.db.md import Column, ColumnList
-from msfx.lib.db.rs import Record
+from msfx.lib.db.md import Column, ColumnList, Table, get_converters
+from msfx.lib.db.rs import Record, LazyRecord
+from msfx.lib.db.rs.batch import ColumnBatch, get_batch
 
 
 class DBAdapter(ABC):
@@ -42,6 +48,12 @@ class DBAdapter(ABC):
     def get_column_from_cursor_descr(self, descr: tuple) -> Column:
         """ Returns the database column from the given cursor tuple description. """
         pass
+    def get_columns_from_cursor_descr(self, description) -> ColumnList:
+        """ Returns the column list of a cursor description, a column per description tuple. """
+        columns = ColumnList()
+        for descr in description:
+            columns.append(self.get_column_from_cursor_descr(descr))
+        return columns
     @abstractmethod
     def get_column_db_def(self, column: Column) -> str:
         """ Returns the database column definition as a string. """
@@ -73,13 +85,13 @@ class DBAdapter(ABC):
         if value is None:
             return "NULL"
         if isinstance(value, bool):
-            return "Y" if value else "N"
+            return "'Y'" if value else "'N'"
+        if isinstance(value, datetime):
+            return self.to_sql_datetime(value)
         if isinstance(value, date):
             return self.to_sql_date(value)
         if isinstance(value, time):
             return self.to_sql_time(value)
-        if isinstance(value, datetime):
-            return self.to_sql_datetime(value)
         if isinstance(value, (Decimal, float, int, complex)):
             return str(value)
         if isinstance(value, (bytes, bytearray)):
@@ -88,7 +100,7 @@ class DBAdapter(ABC):
             return "'" + value + "'"
         if isinstance(value, Value):
             if value.is_none(): return "NULL"
-            if value.is_boolean(): return "Y" if value.get_boolean() else "N"
+            if value.is_boolean(): return "'Y'" if value.get_boolean() else "'N'"
             if value.is_decimal(): return str(value.get_decimal())
             if value.is_float(): return str(value.get_float())
             if value.is_integer(): return str(value.get_integer())
@@ -99,13 +111,143 @@ class DBAdapter(ABC):
             if value.is_binary(): return self.to_sql_binary(value.get_binary())
             if value.is_string(): return "'" + value.get_string() + "'"
         raise TypeError(f"Unsupported value: " + str(value))
+
+    def get_table_name(self, table: Table) -> str:
+        """ Returns the table name qualified with the schema if present. """
+        schema = table.get_schema()
+        return schema + "." + table.get_name() if schema else table.get_name()
+    def get_pk_names(self, table: Table) -> list:
+        """ Returns the names of the primary key columns of the table. """
+        primary_key = table.get_primary_key()
+        if primary_key is not None:
+            return [column.get_name() for column, _ in primary_key]
+        return [column.get_name() for column in table.columns if column.is_primary_key()]
+
+    @abstractmethod
+    def get_bulk_insert(self, table: Table, on_duplicate: str) -> str:
+        """
+        Returns the parameterized INSERT statement of all the columns of the table,
+        aimed to be executed with executemany.
+        :param table: The table.
+        :param on_duplicate: The action on duplicate keys, "update" to update the non
+        primary key columns, "ignore" to skip the row or "error" to raise the error.
+        :return: The INSERT statement.
+        """
+        pass
+
+    def to_param(self, value):
+        """ Returns the value as a statement parameter, booleans are stored as Y/N. """
+        if isinstance(value, Value):
+            if value.is_boolean(): return "Y" if value.get_boolean() else "N"
+            if value.is_complex(): return str(value.get_complex())
+            return value.value()
+        if isinstance(value, bool):
+            return "Y" if value else "N"
+        if isinstance(value, complex):
+            return str(value)
+        return value
     """ End class DBAdapter """
+class BulkInsertStats:
+    """ Statistics of a bulk insert. """
+    def __init__(self):
+        self.rows: int = 0
+        self.batches: int = 0
+        self.commits: int = 0
+        self.seconds: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.rows} rows, {self.batches} batches, {self.commits} commits, "
+                f"{self.seconds:.3f} s, {self.rows_per_sec:.0f} rows/s")
+    def __repr__(self): return self.__str__()
+    """ End class BulkInsertStats """
+class FetchStats:
+    """ Statistics of the chunked fetches of the last scan of a cursor. """
+    def __init__(self):
+        self.chunk_sizes: list = []
+        self.rows: list = []
+        self.fetch_secs: list = []
+        self.consume_secs: list = []
+
+    def clear(self):
+        self.chunk_sizes.clear()
+        self.rows.clear()
+        self.fetch_secs.clear()
+        self.consume_secs.clear()
+
+    @property
+    def round_trips(self) -> int: return len(self.chunk_sizes)
+    @property
+    def total_rows(self) -> int: return sum(self.rows)
+    @property
+    def total_fetch_secs(self) -> float: return sum(self.fetch_secs)
+
+    def __str__(self) -> str:
+        return (f"{self.total_rows} rows, {self.round_trips} round trips, "
+                f"{self.total_fetch_secs:.3f} s fetching, sizes {self.chunk_sizes}")
+    def __repr__(self): return self.__str__()
+    """ End class FetchStats """
+class AdaptiveFetch:
+    """
+    Chunk size policy that aims at a target number of bytes per round trip, given the
+    observed row width, and shrinks the chunk when consuming it takes longer than the
+    maximum latency, so that slow consumers apply backpressure. The size changes at
+    most by a factor of two per round trip.
+    """
+    def __init__(self,
+                 target_bytes: int = 1024 * 1024,
+                 initial_size: int = 1000,
+                 min_size: int = 10,
+                 max_size: int = 100000,
+                 max_latency: float = 0.5):
+        if not 0 < min_size <= initial_size <= max_size:
+            raise ValueError("Sizes must verify 0 < min_size <= initial_size <= max_size")
+        self.target_bytes: int = target_bytes
+        self.initial_size: int = initial_size
+        self.min_size: int = min_size
+        self.max_size: int = max_size
+        self.max_latency: float = max_latency
+
+    @staticmethod
+    def get_row_bytes(row: tuple) -> int:
+        """ Returns an estimation of the width in bytes of a row. """
+        return sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+
+    def next_size(self, size: int, rows: list, consume_secs: float) -> int:
+        """
+        Returns the size of the next chunk.
+        :param size: The size of the last chunk.
+        :param rows: The rows of the last chunk.
+        :param consume_secs: The seconds spent consuming the last chunk.
+        :return: The size of the next chunk.
+        """
+        next_size = size
+        if rows:
+            next_size = self.target_bytes // max(self.get_row_bytes(rows[0]), 1)
+        if consume_secs > self.max_latency:
+            next_size = min(next_size, int(size * self.max_latency / consume_secs))
+        next_size = max(size // 2, min(next_size, size * 2))
+        return max(self.min_size, min(next_size, self.max_size))
+    """ End class AdaptiveFetch """
 class DBCursor(ABC):
+    def __init__(self):
+        self.__fetch_stats = FetchStats()
+
+    @property
+    def fetch_stats(self) -> FetchStats:
+        """ The statistics of the chunked fetches of the last columnar scan or stream. """
+        return self.__fetch_stats
+
     @abstractmethod
     def get_adapter(self) -> DBAdapter: pass
     @abstractmethod
     def execute(self, operation, **parameters): pass
     @abstractmethod
+    def executemany(self, operation, seq_of_parameters): pass
+    @abstractmethod
     def fetchone(self) -> object: pass
     @abstractmethod
     def fetchall(self) -> object: pass
@@ -122,8 +264,18 @@ class DBCursor(ABC):
     @abstractmethod
     def close(self): pass
 
-    @abstractmethod
-    def executeSelect(self, select: str, columns: Optional[ColumnList], callback: Callable[[int, Record], bool]):
+    def __columns__(self, columns: Optional[ColumnList]) -> ColumnList:
+        # If no columns are provided, build it using the description.
+        if not isinstance(columns, ColumnList):
+            columns = self.get_adapter().get_columns_from_cursor_descr(self.description)
+        return columns
+
+    def executeSelect(self,
+                      select: str,
+                      columns: Optional[ColumnList],
+                      callback: Callable[[int, Record], bool],
+                      lazy: bool = False,
+                      cache=None):
         """
         Execute a SELECT query and scan the cursor calling the callback function
         and passing a Record as argument. If a column list is provided, the record
@@ -133,10 +285,161 @@ class DBCursor(ABC):
         :param columns: The optional column list that defines the types of the select columns.
         :param callback: The callback function that will be called with the record. The callback
         function must return a boolean indicating whether to continue execution or not.
+        :param lazy: If True, the records are LazyRecord instances backed by the raw row, that
+        convert the values only when accessed.
+        :param cache: An optional ResultCache. On a hit the cached rows are scanned and the query
+        is not executed, on a miss the rows of a complete scan are cached.
         """
-        pass
+        # The generation before the lookup, the rows are not cached if a table is written meanwhile.
+        generation = None if cache is None else cache.get_generation()
+        cached = None if cache is None else cache.get(select, columns)
+        if cached is None:
+            self.execute(select)
+            read_columns = self.__columns__(columns).freeze()
+            fetch = self.fetchone
+        else:
+            read_columns, rows = cached
+            fetch = partial(next, iter(rows), None)
+
+        converters = get_converters(read_columns)
+        collected = [] if cache is not None and cached is None else None
+        max_rows = 0
+
+        # Scan the cursor
+        count = 0
+        row = fetch()
+        while row:
+            count += 1
+            if collected is not None:
+                if count == 1: max_rows = cache.get_max_rows(row)
+                collected.append(row)
+                if count > max_rows:
+                    cache.reject()
+                    collected = None
+            if lazy:
+                record: Record = LazyRecord(read_columns, row, converters)
+            else:
+                values = tuple([convert(raw) for convert, raw in zip(converters, row)])
+                record: Record = Record(read_columns, values)
+            if not callback(count, record):
+                collected = None
+                break
+            row = fetch()
+
+        self.close()
+        if collected is not None:
+            cache.put(select, columns, read_columns, collected, generation=generation)
+
+    def execute_select_columnar(self,
+                                select: str,
+                                columns: Optional[ColumnList],
+                                callback: Callable[[int, ColumnBatch], bool],
+                                chunk_size: Union[int, AdaptiveFetch] = 10000):
+        """
+        Execute a SELECT query and scan the cursor fetching chunks of rows, calling the
+        callback function with a ColumnBatch per chunk. No Record is built per row.
+        :param select: The SELECT query to execute.
+        :param columns: The optional column list that defines the types of the select columns.
+        :param callback: The callback function that will be called with the batch number (1 based)
+        and the batch. The callback function must return a boolean indicating whether to continue
+        execution or not.
+        :param chunk_size: The number of rows to fetch per round trip, or an AdaptiveFetch policy.
+        """
+        self.__check_chunk_size__(chunk_size)
+        self.execute(select)
+        columns = self.__columns__(columns).freeze()
+
+        # Scan the cursor by chunks.
+        count = 0
+        for rows in self.__chunks__(chunk_size):
+            count += 1
+            batch: ColumnBatch = get_batch(columns, rows)
+            if not callback(count, batch): break
+
+        self.close()
+
+    def stream(self,
+               select: str,
+               columns: Optional[ColumnList] = None,
+               chunk_size: Union[int, AdaptiveFetch] = 1000,
+               columnar: bool = False,
+               lazy: bool = False) -> Iterator:
+        """
+        Execute a SELECT query and return a generator that lazily yields the records,
+        or the column batches, fetching chunks of rows from the cursor as they are
+        consumed. Memory is bounded by the chunk size. The cursor is closed when the
+        generator is exhausted or closed, even if closed early.
+        :param select: The SELECT query to execute.
+        :param columns: The optional column list that defines the types of the select columns.
+        :param chunk_size: The number of rows to fetch per round trip, or an AdaptiveFetch policy.
+        :param columnar: If True, yield a ColumnBatch per chunk instead of records.
+        :param lazy: If True, the records are LazyRecord instances.
+        :return: The generator.
+        """
+        self.__check_chunk_size__(chunk_size)
+        return self.__stream__(select, columns, chunk_size, columnar, lazy)
+
+    def __stream__(self, select: str, columns: Optional[ColumnList], chunk_size, columnar: bool, lazy: bool):
+        for block in self.__blocks__(select, columns, chunk_size, columnar, lazy):
+            if columnar:
+                yield block
+            else:
+                yield from block
+
+    def __blocks__(self, select: str, columns: Optional[ColumnList], chunk_size, columnar: bool, lazy: bool):
+        # Generate a block per chunk fetched, a ColumnBatch or a list of records, closing the cursor
+        # when exhausted or closed.
+        try:
+            self.execute(select)
+            columns = self.__columns__(columns).freeze()
+            converters = get_converters(columns)
+
+            for rows in self.__chunks__(chunk_size):
+                if columnar:
+                    yield get_batch(columns, rows)
+                elif lazy:
+                    yield [LazyRecord(columns, row, converters) for row in rows]
+                else:
+                    yield [Record(columns, tuple([convert(raw) for convert, raw in zip(converters, row)]))
+                           for row in rows]
+        finally:
+            self.close()
+
+    @staticmethod
+    def __check_chunk_size__(chunk_size):
+        if isinstance(chunk_size, AdaptiveFetch): return
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError(f"Chunk size {chunk_size} is not a positive integer")
+
+    def __chunks__(self, chunk_size: Union[int, AdaptiveFetch]):
+        # Generate the chunks of rows of the executed query, recording the statistics and,
+        # if the chunk size is adaptive, resizing the next chunk. The time spent by the
+        # caller between chunks is the consume time of the chunk.
+        adaptive = chunk_size if isinstance(chunk_size, AdaptiveFetch) else None
+        size = adaptive.initial_size if adaptive else chunk_size
+        stats = self.__fetch_stats
+        stats.clear()
+        while True:
+            start = perf_counter()
+            rows = self.fetchmany(size)
+            fetched = perf_counter()
+            stats.chunk_sizes.append(size)
+            stats.rows.append(len(rows))
+            stats.fetch_secs.append(fetched - start)
+            if not rows: break
+            yield rows
+            consume_secs = perf_counter() - fetched
+            stats.consume_secs.append(consume_secs)
+            if len(rows) < size: break
+            if adaptive: size = adaptive.next_size(size, rows, consume_secs)
     """ End class DBCursor """
 class DBConnection(ABC):
+    # Maximum number of prepared cursors kept per connection.
+    PREPARED_CACHE_SIZE = 32
+
+    def __init__(self):
+        self.__prepared: OrderedDict = OrderedDict()
+
     @abstractmethod
     def get_adapter(self) -> DBAdapter: pass
     @abstractmethod
@@ -154,6 +457,102 @@ class DBConnection(ABC):
         :return: The cursor
         """
         pass
+
+    def prepared(self, statement: str) -> DBCursor:
+        """
+        Returns the prepared cursor of the parameterized statement, created on first use and
+        reused while the connection is open, so that repeated executions skip the parsing.
+        Cursors are kept in an LRU of PREPARED_CACHE_SIZE statements, the cursor returned must
+        not be closed by the caller, and its result must be fetched before the next execute.
+        :param statement: The parameterized statement, i.e. from msfx.lib.db.sql.
+        :return: The cursor, to execute with the statement and its parameters.
+        """
+        prepared = self.__prepared
+        cursor = prepared.get(statement)
+        if cursor is not None:
+            prepared.move_to_end(statement)
+            return cursor
+        cursor = self.cursor(prepared=True, buffered=True)
+        prepared[statement] = cursor
+        if len(prepared) > self.PREPARED_CACHE_SIZE:
+            _, evicted = prepared.popitem(last=False)
+            evicted.close()
+        return cursor
+
+    def close_prepared(self):
+        """ Close the prepared cursors, connectors call it when the connection is closed. """
+        cursors = list(self.__prepared.values())
+        self.__prepared.clear()
+        for cursor in cursors:
+            cursor.close()
+
+    def bulk_insert(self,
+                    table: Table,
+                    rows: Iterable,
+                    batch_size: int = 1000,
+                    on_duplicate: str = "update",
+                    commit_interval: int = 10,
+                    cache=None) -> BulkInsertStats:
+        """
+        Insert rows into the table executing the parameterized INSERT with executemany,
+        by batches of rows, and committing every commit_interval batches. On error the
+        uncommitted batches are rolled back.
+        :param table: The table, rows must have a value for every column of the table.
+        :param rows: An iterable of Records or tuples of values or raw values.
+        :param batch_size: The number of rows per executemany.
+        :param on_duplicate: The action on duplicate keys, "update", "ignore" or "error".
+        :param commit_interval: The number of batches between commits.
+        :param cache: An optional ResultCache, the results on the table are invalidated after
+        each commit.
+        :return: The statistics, with the rows per second.
+        """
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError(f"Batch size {batch_size} is not a positive integer")
+        if not isinstance(commit_interval, int) or commit_interval <= 0:
+            raise ValueError(f"Commit interval {commit_interval} is not a positive integer")
+        if on_duplicate not in ("update", "ignore", "error"):
+            raise ValueError(f"Invalid value for on_duplicate {on_duplicate}")
+
+        adapter = self.get_adapter()
+        insert = adapter.get_bulk_insert(table, on_duplicate)
+        to_param = adapter.to_param
+        stats = BulkInsertStats()
+        start = perf_counter()
+
+        cursor = self.cursor()
+        batch = []
+        def flush():
+            cursor.executemany(insert, batch)
+            stats.rows += len(batch)
+            stats.batches += 1
+            batch.clear()
+            if stats.batches % commit_interval == 0:
+                self.commit()
+                stats.commits += 1
+                if cache is not None: cache.invalidate(table)
+        try:
+            for row in rows:
+                values = row.values if isinstance(row, Record) else row
+                batch.append(tuple([to_param(value) for value in values]))
+                if len(batch) >= batch_size: flush()
+            if batch: flush()
+            if stats.batches % commit_interval != 0:
+                self.commit()
+                stats.commits += 1
+                if cache is not None: cache.invalidate(table)
+        except Exception:
+            self.rollback()
+            raise
+        finally:
+            cursor.close()
+
+        stats.seconds = perf_counter() - start
+        return stats
+
+    def __enter__(self):
+        return self
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     """ End class DBConnection """
 class DBConnectionPool(ABC):
     @abstractmethod
@@ -172,6 +571,15 @@ class DBConnectionPool(ABC):
         Explicitly close the connection pool and all connections.
         """
         pass
+
+    @contextmanager
+    def connection(self):
+        """ Context manager that gets a connection and guarantees its return to the pool. """
+        conn = self.get_connection()
+        try:
+            yield conn
+        finally:
+            conn.close()
     """ End class DBConnectionPool """
 class DB(ABC):
     def __init__(self, **parameters): pass
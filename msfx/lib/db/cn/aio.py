@@ -0,0 +1,246 @@
+#  Copyright (c) 2025 Miquel Sas.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Asyncio front-end of the db connector layer. The blocking DB implementations run on a
+bounded thread pool, the calls on a connection and its cursors are serialized, and many
+connections of the underlying pool serve concurrent queries.
+
+    adb = AsyncDB(MariaDB(...), max_workers=5)
+    async with adb.connection() as conn:
+        async with conn.cursor().stream("SELECT ...") as records:
+            async for record in records:
+                ...
+        await conn.commit()
+    await adb.close()
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, Future
+from contextlib import asynccontextmanager
+from inspect import getgeneratorstate, GEN_CREATED
+from threading import Lock
+from typing import Optional, Callable, Union, Iterable
+
+from msfx.lib.db.cn import DB, DBConnection, DBCursor, DBAdapter, AdaptiveFetch, BulkInsertStats, FetchStats
+from msfx.lib.db.md import ColumnList, Table
+from msfx.lib.db.rs import Record
+from msfx.lib.db.rs.batch import ColumnBatch
+
+class AsyncStream:
+    """
+    Asynchronous iterator over a stream of records or batches, that is also an asynchronous
+    context manager. A cancelled stream is closed when the generator is finalized, use it as
+    a context manager to close the cursor as soon as the block exits.
+    """
+    def __init__(self, generator):
+        self.__generator = generator
+    def __aiter__(self):
+        return self
+    async def __anext__(self):
+        return await self.__generator.__anext__()
+    async def aclose(self):
+        await self.__generator.aclose()
+    async def __aenter__(self):
+        return self
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+    """ End class AsyncStream """
+class AsyncCursor:
+    """ Asynchronous cursor, the calls run on the thread pool holding the connection lock. """
+    def __init__(self, conn, cursor: DBCursor):
+        self.__conn: AsyncConnection = conn
+        self.__cursor: DBCursor = cursor
+
+    @property
+    def cursor(self) -> DBCursor: return self.__cursor
+    @property
+    def fetch_stats(self) -> FetchStats: return self.__cursor.fetch_stats
+
+    async def execute(self, operation, **kwargs):
+        await self.__conn.__run__(self.__cursor.execute, operation, **kwargs)
+    async def executemany(self, operation, seq_of_parameters):
+        await self.__conn.__run__(self.__cursor.executemany, operation, seq_of_parameters)
+    async def fetchone(self) -> object:
+        return await self.__conn.__run__(self.__cursor.fetchone)
+    async def fetchmany(self, size=100) -> object:
+        return await self.__conn.__run__(self.__cursor.fetchmany, size)
+    async def fetchall(self) -> object:
+        return await self.__conn.__run__(self.__cursor.fetchall)
+    async def close(self):
+        await self.__conn.__run__(self.__cursor.close)
+
+    async def executeSelect(self,
+                            select: str,
+                            columns: Optional[ColumnList],
+                            callback: Callable[[int, Record], bool],
+                            lazy: bool = False,
+                            cache=None):
+        """
+        Execute a SELECT query and scan the cursor as DBCursor.executeSelect. Note that the
+        callback is called from a thread of the pool, not from the event loop.
+        """
+        await self.__conn.__run__(self.__cursor.executeSelect, select, columns, callback, lazy, cache)
+
+    async def execute_select_columnar(self,
+                                      select: str,
+                                      columns: Optional[ColumnList],
+                                      callback: Callable[[int, ColumnBatch], bool],
+                                      chunk_size: Union[int, AdaptiveFetch] = 10000):
+        """
+        Execute a SELECT query and scan the cursor by batches as DBCursor.execute_select_columnar.
+        Note that the callback is called from a thread of the pool, not from the event loop.
+        """
+        await self.__conn.__run__(self.__cursor.execute_select_columnar, select, columns, callback, chunk_size)
+
+    def stream(self,
+               select: str,
+               columns: Optional[ColumnList] = None,
+               chunk_size: Union[int, AdaptiveFetch] = 1000,
+               columnar: bool = False,
+               lazy: bool = False) -> AsyncStream:
+        """
+        Execute a SELECT query and return an asynchronous generator that yields the records,
+        or the column batches, as DBCursor.stream. Each chunk is fetched and converted on the
+        thread pool. The cursor is closed when the stream is exhausted or closed, or when the
+        consuming task is cancelled, as soon as the stream context exits if used as context
+        manager, or when the stream is finalized if not.
+        :param select: The SELECT query to execute.
+        :param columns: The optional column list that defines the types of the select columns.
+        :param chunk_size: The number of rows to fetch per round trip, or an AdaptiveFetch policy.
+        :param columnar: If True, yield a ColumnBatch per chunk instead of records.
+        :param lazy: If True, the records are LazyRecord instances.
+        :return: The asynchronous stream.
+        """
+        self.__cursor.__check_chunk_size__(chunk_size)
+        blocks = self.__cursor.__blocks__(select, columns, chunk_size, columnar, lazy)
+        return AsyncStream(self.__stream__(blocks, columnar))
+
+    async def __stream__(self, blocks, columnar: bool):
+        try:
+            while True:
+                block = await self.__conn.__run__(next, blocks, None)
+                if block is None: break
+                if columnar:
+                    yield block
+                else:
+                    for record in block:
+                        yield record
+        finally:
+            # Shielded, a pending fetch runs to the end before the close, and the close is not
+            # cancelled with the task.
+            await asyncio.shield(asyncio.wrap_future(self.__conn.__submit__(self.__close_blocks__, blocks)))
+
+    def __close_blocks__(self, blocks):
+        # A generator not started does not run its finally clause when closed.
+        if getgeneratorstate(blocks) == GEN_CREATED:
+            self.__cursor.close()
+        blocks.close()
+    """ End class AsyncCursor """
+class AsyncConnection:
+    """ Asynchronous connection, the calls on the connection and its cursors are serialized. """
+    def __init__(self, db, conn: DBConnection):
+        self.__db: AsyncDB = db
+        self.__conn: DBConnection = conn
+        self.__lock = Lock()
+
+    @property
+    def connection(self) -> DBConnection: return self.__conn
+    def get_adapter(self) -> DBAdapter: return self.__conn.get_adapter()
+
+    def __locked__(self, function: Callable, *args, **kwargs):
+        with self.__lock:
+            return function(*args, **kwargs)
+    def __submit__(self, function: Callable, *args, **kwargs) -> Future:
+        return self.__db.__submit__(self.__locked__, function, *args, **kwargs)
+    async def __run__(self, function: Callable, *args, **kwargs):
+        return await asyncio.wrap_future(self.__submit__(function, *args, **kwargs))
+
+    def cursor(self, **kwargs) -> AsyncCursor:
+        return AsyncCursor(self, self.__conn.cursor(**kwargs))
+    async def commit(self):
+        await self.__run__(self.__conn.commit)
+    async def rollback(self):
+        await self.__run__(self.__conn.rollback)
+    async def close(self):
+        await self.__run__(self.__conn.close)
+    async def bulk_insert(self,
+                          table: Table,
+                          rows: Iterable,
+                          batch_size: int = 1000,
+                          on_duplicate: str = "update",
+                          commit_interval: int = 10,
+                          cache=None) -> BulkInsertStats:
+        """ Insert rows into the table as DBConnection.bulk_insert. """
+        return await self.__run__(self.__conn.bulk_insert,
+                                  table, rows, batch_size, on_duplicate, commit_interval, cache)
+
+    async def __aenter__(self):
+        return self
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+    """ End class AsyncConnection """
+class AsyncDB:
+    """
+    Asynchronous front-end of a DB, that runs the blocking calls on a bounded thread pool.
+    Connections are acquired on a separate thread pool, so that callers waiting for a
+    connection never hold the threads that run the queries that would release one.
+    """
+    def __init__(self, db: DB, max_workers: int = 5):
+        """
+        :param db: The blocking database, i.e. MariaDB or SQLite.
+        :param max_workers: The maximum number of threads running blocking calls.
+        """
+        if not isinstance(db, DB): raise TypeError("Invalid db")
+        if not isinstance(max_workers, int) or max_workers <= 0:
+            raise ValueError(f"Max workers {max_workers} is not a positive integer")
+        self.__db: DB = db
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="msfx-db")
+        self.__acquire_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="msfx-db-acquire")
+
+    @property
+    def db(self) -> DB: return self.__db
+    def get_adapter(self) -> DBAdapter: return self.__db.get_adapter()
+
+    def __submit__(self, function: Callable, *args, **kwargs) -> Future:
+        return self.__executor.submit(function, *args, **kwargs)
+
+    async def get_connection(self) -> AsyncConnection:
+        future = self.__acquire_executor.submit(self.__db.get_connection)
+        try:
+            conn = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # The connection got once cancelled is returned to the pool.
+            future.add_done_callback(self.__release__)
+            raise
+        return AsyncConnection(self, conn)
+    @staticmethod
+    def __release__(future: Future):
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+
+    @asynccontextmanager
+    async def connection(self):
+        """ Asynchronous context manager that gets a connection and guarantees its close. """
+        conn = await self.get_connection()
+        try:
+            yield conn
+        finally:
+            await conn.close()
+
+    async def close(self):
+        """ Close the database and shutdown the thread pool once the pending calls finish. """
+        await asyncio.wrap_future(self.__submit__(self.__db.close))
+        self.__executor.shutdown(wait=False)
+        self.__acquire_executor.shutdown(wait=False)
+    """ End class AsyncDB """
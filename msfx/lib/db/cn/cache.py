@@ -0,0 +1,264 @@
+#  Copyright (c) 2025 Miquel Sas.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Opt-in cache of query results, passed to DBCursor.executeSelect. The raw rows of a SELECT
+are kept by the SQL text and the signature of the column list, with an estimation of their
+size in bytes, evicted least recently used when the cache exceeds its size, expired by the
+TTL of the tables queried, and invalidated by table when they are written. Results read
+before an invalidation of any of their tables are not cached.
+"""
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+from time import monotonic
+from typing import Optional, Union, Iterable, Tuple, Callable
+
+from msfx.lib.db.cn import AdaptiveFetch
+from msfx.lib.db.md import ColumnList, Table
+
+# FROM and JOIN clauses of a SELECT, up to the next clause, subquery or end.
+_CLAUSE_PATTERN = re.compile(
+    r"\b(?:FROM|JOIN)\s+(.*?)(?=\b(?:SELECT|FROM|JOIN|WHERE|GROUP|ORDER|HAVING|LIMIT|UNION|ON|USING|"
+    r"INNER|LEFT|RIGHT|FULL|CROSS|NATURAL|STRAIGHT_JOIN|WINDOW|FOR|LOCK)\b|[();]|$)",
+    re.IGNORECASE | re.DOTALL)
+# Table name at the start of an item of a FROM list.
+_TABLE_PATTERN = re.compile(r"[\w.`\"]+")
+
+def get_table_key(table: Union[str, Table]) -> str:
+    """ Returns the key of a table in the cache, its lower case name without schema. """
+    name = table.get_name() if isinstance(table, Table) else table
+    return name.strip("`\"").split(".")[-1].strip("`\"").lower()
+
+@lru_cache(maxsize=1024)
+def get_tables(select: str) -> Tuple[str, ...]:
+    """
+    Returns the keys of the tables referenced in the FROM and JOIN clauses of a SELECT,
+    comma separated lists of tables included. Pass the tables explicitly to put when the
+    query is not that simple.
+    """
+    tables = set()
+    for clause in _CLAUSE_PATTERN.findall(select):
+        for item in clause.split(","):
+            match = _TABLE_PATTERN.match(item.strip())
+            if match: tables.add(get_table_key(match.group()))
+    return tuple(sorted(tables))
+
+def get_signature(columns: Optional[ColumnList]) -> Optional[tuple]:
+    """ Returns the signature of a column list, the tuple of (alias, type, scale) of its columns. """
+    if columns is None: return None
+    return tuple([(column.get_alias(), column.get_type(), column.get_scale()) for column in columns])
+
+class CacheStats:
+    """ Counters of a result cache. """
+    def __init__(self):
+        self.hits: int = 0
+        self.misses: int = 0
+        self.puts: int = 0
+        self.rejections: int = 0
+        self.stale: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+        self.invalidations: int = 0
+        self.entries: int = 0
+        self.bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+    def copy(self):
+        stats = CacheStats()
+        stats.__dict__.update(self.__dict__)
+        return stats
+
+    def __str__(self) -> str:
+        return (f"hits {self.hits}, misses {self.misses}, hit ratio {self.hit_ratio:.2f}, "
+                f"entries {self.entries}, bytes {self.bytes}, puts {self.puts}, rejections {self.rejections}, "
+                f"stale {self.stale}, evictions {self.evictions}, expirations {self.expirations}, invalidations {self.invalidations}")
+    def __repr__(self): return self.__str__()
+    """ End class CacheStats """
+class CacheEntry:
+    """ The rows of a query, the columns they were read with, and the tables queried. """
+    __slots__ = ("columns", "rows", "tables", "bytes", "expires")
+    def __init__(self, columns: ColumnList, rows: list, tables: Tuple[str, ...], bytes: int, expires: Optional[float]):
+        self.columns: ColumnList = columns
+        self.rows: list = rows
+        self.tables: Tuple[str, ...] = tables
+        self.bytes: int = bytes
+        self.expires: Optional[float] = expires
+    """ End class CacheEntry """
+class ResultCache:
+    """
+    LRU cache of query results bounded in bytes. Entries expire after the minimum TTL of the
+    tables queried, tables without TTL take the default TTL, and None never expires, which
+    suits historical tables of closed periods. Writers call invalidate(table) after commit.
+
+    Each invalidation takes a new generation, recorded by table. Readers take the generation
+    before the lookup and pass it to put, that drops the rows if any of their tables has been
+    invalidated since, as the query may have read them before the write.
+    """
+    def __init__(self,
+                 max_bytes: int = 64 * 1024 * 1024,
+                 max_entry_bytes: Optional[int] = None,
+                 default_ttl: Optional[float] = None,
+                 clock: Callable[[], float] = monotonic):
+        """
+        :param max_bytes: The maximum estimated bytes of all the entries.
+        :param max_entry_bytes: The maximum estimated bytes of an entry, by default a fourth of max bytes.
+        :param default_ttl: The default time to live in seconds, None never expires.
+        :param clock: The function that returns the current time in seconds.
+        """
+        if not isinstance(max_bytes, int) or max_bytes <= 0:
+            raise ValueError(f"Max bytes {max_bytes} is not a positive integer")
+        if max_entry_bytes is None: max_entry_bytes = max_bytes // 4
+        if not isinstance(max_entry_bytes, int) or not 0 < max_entry_bytes <= max_bytes:
+            raise ValueError(f"Max entry bytes {max_entry_bytes} must be between 1 and max bytes {max_bytes}")
+        self.__max_bytes: int = max_bytes
+        self.__max_entry_bytes: int = max_entry_bytes
+        self.__default_ttl: Optional[float] = default_ttl
+        self.__ttls: dict = {}
+        self.__clock = clock
+        self.__entries: OrderedDict = OrderedDict()
+        self.__generation: int = 0
+        self.__generations: dict = {}
+        self.__cleared: int = 0
+        self.__lock = Lock()
+        self.__stats = CacheStats()
+
+    def set_ttl(self, table: Union[str, Table], ttl: Optional[float]):
+        """ Set the time to live in seconds of the results of queries on the table, None never expires. """
+        with self.__lock:
+            self.__ttls[get_table_key(table)] = ttl
+
+    def get_max_rows(self, row: tuple) -> int:
+        """ Returns the maximum number of rows like the argument row that fit in an entry. """
+        return self.__max_entry_bytes // max(AdaptiveFetch.get_row_bytes(row), 1)
+
+    def reject(self):
+        """ Count a result not cached because it exceeds the maximum bytes of an entry. """
+        with self.__lock:
+            self.__stats.rejections += 1
+
+    def get_generation(self) -> int:
+        """ Returns the current generation, to take before the lookup and pass to put. """
+        with self.__lock:
+            return self.__generation
+
+    def get(self, select: str, columns: Optional[ColumnList]) -> Optional[Tuple[ColumnList, list]]:
+        """
+        Returns the cached columns and rows of the query, or None.
+        :param select: The SELECT query.
+        :param columns: The column list passed to executeSelect, or None.
+        :return: The tuple (columns, rows) or None.
+        """
+        key = (select, get_signature(columns))
+        with self.__lock:
+            stats = self.__stats
+            entry: CacheEntry = self.__entries.get(key)
+            if entry is not None and entry.expires is not None and entry.expires <= self.__clock():
+                self.__remove__(key)
+                stats.expirations += 1
+                entry = None
+            if entry is None:
+                stats.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            stats.hits += 1
+            return entry.columns, entry.rows
+
+    def put(self,
+            select: str,
+            columns: Optional[ColumnList],
+            read_columns: ColumnList,
+            rows: list,
+            tables: Optional[Iterable[Union[str, Table]]] = None,
+            generation: Optional[int] = None) -> bool:
+        """
+        Put the rows of a query.
+        :param select: The SELECT query.
+        :param columns: The column list passed to executeSelect, or None.
+        :param read_columns: The columns the rows were read with.
+        :param rows: The list of raw rows.
+        :param tables: The tables queried, by default those in the FROM and JOIN clauses.
+        :param generation: The generation taken before the lookup, None if the rows are known current.
+        :return: A boolean indicating whether the rows were cached, or rejected by size or as stale.
+        """
+        key = (select, get_signature(columns))
+        tables = get_tables(select) if tables is None else tuple(get_table_key(table) for table in tables)
+        bytes = AdaptiveFetch.get_row_bytes(rows[0]) * len(rows) if rows else 0
+        with self.__lock:
+            stats = self.__stats
+            if bytes > self.__max_entry_bytes:
+                stats.rejections += 1
+                return False
+            if generation is not None and self.__is_stale__(tables, generation):
+                stats.stale += 1
+                return False
+            ttls = [self.__ttls.get(table, self.__default_ttl) for table in tables]
+            ttls = [ttl for ttl in ttls if ttl is not None]
+            expires = self.__clock() + min(ttls) if ttls else None
+            if key in self.__entries: self.__remove__(key)
+            self.__entries[key] = CacheEntry(read_columns, rows, tables, bytes, expires)
+            stats.puts += 1
+            stats.entries += 1
+            stats.bytes += bytes
+            while stats.bytes > self.__max_bytes:
+                self.__remove__(next(iter(self.__entries)))
+                stats.evictions += 1
+            return True
+
+    def invalidate(self, table: Union[str, Table]) -> int:
+        """
+        Remove the results of the queries on the table, writers call it after commit.
+        :param table: The table or its name.
+        :return: The number of entries removed.
+        """
+        table = get_table_key(table)
+        with self.__lock:
+            self.__generation += 1
+            self.__generations[table] = self.__generation
+            keys = [key for key, entry in self.__entries.items() if table in entry.tables]
+            for key in keys:
+                self.__remove__(key)
+            self.__stats.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        """ Remove all the entries. """
+        with self.__lock:
+            self.__generation += 1
+            self.__cleared = self.__generation
+            self.__generations.clear()
+            self.__stats.invalidations += len(self.__entries)
+            self.__entries.clear()
+            self.__stats.entries = 0
+            self.__stats.bytes = 0
+
+    def __is_stale__(self, tables: Tuple[str, ...], generation: int) -> bool:
+        if self.__cleared > generation: return True
+        return any(self.__generations.get(table, 0) > generation for table in tables)
+
+    def __remove__(self, key):
+        entry = self.__entries.pop(key)
+        self.__stats.entries -= 1
+        self.__stats.bytes -= entry.bytes
+
+    def get_stats(self) -> CacheStats:
+        """ Returns a copy of the current counters. """
+        with self.__lock:
+            return self.__stats.copy()
+    """ End class ResultCache """
@@ -13,16 +13,171 @@
 #  limitations under the License.
 
 """ Implementation of the db_back connector interface for MariaDB. """
-from typing import Optional, Callable
 from datetime import time, datetime, date
+from functools import lru_cache
+from typing import Optional, NamedTuple
 
 from mariadb import Cursor, Connection, ConnectionPool
-from mariadb.constants import FIELD_FLAG, CURSOR
+from mariadb.constants import FIELD_FLAG
 
-from msfx.lib.db import Types, Value, get_value
+from msfx.lib.db import Types, Value
 from msfx.lib.db.cn import DBCursor, DBConnection, DBConnectionPool, DBAdapter, DB
-from msfx.lib.db.md import Column, ColumnList
-from msfx.lib.db.rs import Record
+from msfx.lib.db.cn.pool import BoundedPool, PoolStats
+from msfx.lib.db.md import Column, ColumnList, FrozenColumnList, Table
+
+# Cache sizes of the decoded description tuples and of the column lists by description.
+DESCR_CACHE_SIZE = 4096
+COLUMNS_CACHE_SIZE = 256
+
+# Flags that determine the database type.
+_TYPE_FLAGS = FIELD_FLAG.BINARY | FIELD_FLAG.NUMERIC | FIELD_FLAG.BLOB
+
+def _get_db_types() -> dict:
+    """
+    Returns the database types by (t_code, flags, i_length), with the flags masked to
+    _TYPE_FLAGS and i_length None when it does not determine the type. Rules are applied
+    in order for every combination of flags, a later rule overriding a previous one.
+    """
+    binary, numeric, blob = FIELD_FLAG.BINARY, FIELD_FLAG.NUMERIC, FIELD_FLAG.BLOB
+    # (t_code, i_length, required flags, excluded flags, db_type)
+    rules = [
+        # ('col_varchar', 253, 20, 80, 0, 0, True, 0, 'check_types', 'col_varchar', 'check_types')
+        # ('col_char', 254, 1, 4, 0, 0, True, 0, 'check_types', 'col_char', 'check_types')
+        (253, None, 0, binary, "VARCHAR"),
+        (254, None, 0, binary, "CHAR"),
+        # ('col_tinytext', 252, 255, 1020, 0, 0, True, 16, 'check_types', 'col_tinytext', 'check_types')
+        # ('col_text', 252, 65535, 262140, 0, 0, True, 16, 'check_types', 'col_text', 'check_types')
+        # ('col_mediumtext', 252, 16777215, 67108860, 0, 0, True, 16, 'check_types', 'col_mediumtext', 'check_types')
+        # ('col_longtext', 252, 1073741823, -1, 0, 0, True, 16, 'check_types', 'col_longtext', 'check_types')
+        (252, 1020, 0, binary, "TINYTEXT"),
+        (252, 262140, 0, binary, "TEXT"),
+        (252, 67108860, 0, binary, "MEDIUMTEXT"),
+        (252, -1, 0, binary, "LONGTEXT"),
+        # ('col_tinyint', 1, 1, 4, 0, 0, True, 32768, 'check_types', 'col_tinyint', 'check_types')
+        # ('col_smallint', 2, 1, 6, 0, 0, True, 32768, 'check_types', 'col_smallint', 'check_types')
+        # ('col_mediumint', 9, 2, 9, 0, 0, True, 32768, 'check_types', 'col_mediumint', 'check_types')
+        # ('col_int', 3, 2, 11, 0, 0, True, 32768, 'check_types', 'col_int', 'check_types')
+        # ('col_bigint', 8, 5, 20, 0, 0, True, 32768, 'check_types', 'col_bigint', 'check_types')
+        (1, None, numeric, 0, "TINYINT"),
+        (2, None, numeric, 0, "SMALLINT"),
+        (9, None, numeric, 0, "MEDIUMINT"),
+        (3, None, numeric, 0, "INT"),
+        (8, None, numeric, 0, "BIGINT"),
+        # ('col_float', 4, 3, 12, 0, 0, True, 32768, 'check_types', 'col_float', 'check_types')
+        # ('col_double', 5, 5, 22, 0, 0, True, 32768, 'check_types', 'col_double', 'check_types')
+        # ('col_decimal', 246, 23, 22, 22, 6, True, 32768, 'check_types', 'col_decimal', 'check_types')
+        (4, None, numeric, 0, "FLOAT"),
+        (5, None, numeric, 0, "DOUBLE"),
+        (246, None, numeric, 0, "DECIMAL"),
+        # ('col_varbinary', 253, 5, 20, 0, 0, True, 128, 'check_types', 'col_varbinary', 'check_types')
+        # ('col_binary', 254, 5, 20, 0, 0, True, 128, 'check_types', 'col_binary', 'check_types')
+        (253, None, binary, 0, "VARBINARY"),
+        (254, None, binary, 0, "BINARY"),
+        # ('col_tinyblob', 252, 63, 255, 0, 0, True, 144, 'check_types', 'col_tinyblob', 'check_types')
+        # ('col_blob', 252, 16383, 65535, 0, 0, True, 144, 'check_types', 'col_blob', 'check_types')
+        # ('col_mediumblob', 252, 4194303, 16777215, 0, 0, True, 144, 'check_types', 'col_mediumblob', 'check_types')
+        # ('col_longblob', 252, 1073741823, -1, 0, 0, True, 144, 'check_types', 'col_longblob', 'check_types')
+        (252, 255, binary | blob, 0, "TINYBLOB"),
+        (252, 65535, binary | blob, 0, "BLOB"),
+        (252, 16777215, binary | blob, 0, "MEDIUMBLOB"),
+        (252, -1, binary | blob, 0, "LONGBLOB"),
+        # ('col_date', 10, 2, 10, 0, 0, True, 128, 'check_types', 'col_date', 'check_types')
+        # ('col_time', 11, 2, 10, 0, 0, True, 128, 'check_types', 'col_time', 'check_types')
+        # ('col_datetime', 12, 4, 19, 0, 0, True, 128, 'check_types', 'col_datetime', 'check_types')
+        # ('col_timestamp', 7, 4, 19, 0, 0, True, 160, 'check_types', 'col_timestamp', 'check_types')
+        (10, None, 0, 0, "DATE"),
+        (11, None, 0, 0, "TIME"),
+        (12, None, 0, 0, "DATETIME"),
+        (7, None, 0, 0, "TIMESTAMP"),
+    ]
+    db_types = {}
+    for flags in range(_TYPE_FLAGS + 1):
+        if flags & ~_TYPE_FLAGS: continue
+        for t_code, i_length, required, excluded, db_type in rules:
+            if flags & required == required and not flags & excluded:
+                db_types[(t_code, flags, i_length)] = db_type
+    return db_types
+
+_DB_TYPES = _get_db_types()
+
+# Library type and the description field of the length, by root database type.
+_LIB_TYPES = {
+    "VARCHAR": (Types.STRING, 2), "CHAR": (Types.STRING, 2), "TINYTEXT": (Types.STRING, 2),
+    "TEXT": (Types.STRING, 2), "MEDIUMTEXT": (Types.STRING, 2), "LONGTEXT": (Types.STRING, 2),
+    "TINYINT": (Types.INTEGER, None), "SMALLINT": (Types.INTEGER, None), "MEDIUMINT": (Types.INTEGER, None),
+    "INT": (Types.INTEGER, None), "BIGINT": (Types.INTEGER, None),
+    "FLOAT": (Types.FLOAT, None), "DOUBLE": (Types.FLOAT, None),
+    "DECIMAL": (Types.DECIMAL, 4),
+    "VARBINARY": (Types.BINARY, 3), "BINARY": (Types.BINARY, 3), "TINYBLOB": (Types.BINARY, 3),
+    "BLOB": (Types.BINARY, 3), "MEDIUMBLOB": (Types.BINARY, 3), "LONGBLOB": (Types.BINARY, 2),
+    "DATE": (Types.DATE, None), "TIME": (Types.TIME, None),
+    "DATETIME": (Types.DATETIME, None), "TIMESTAMP": (Types.DATETIME, None),
+}
+
+class ColumnDescr(NamedTuple):
+    """ The column attributes decoded from a cursor description tuple. """
+    name: str
+    alias: str
+    type: Types
+    length: Optional[int]
+    scale: Optional[int]
+    nullable: bool
+    table_name: str
+    table_alias: str
+    db_type: str
+
+@lru_cache(maxsize=DESCR_CACHE_SIZE)
+def get_column_descr(descr: tuple) -> ColumnDescr:
+    """
+    Decode a cursor description tuple.
+    :param descr: The tuple (alias, t_code, t_length, i_length, precision, scale, nullable,
+    flags, table_alias, column_name, table_name).
+    :return: The decoded attributes.
+    """
+    column_alias, t_code, t_length, i_length, precision, scale, nullable, flags, table_alias, column_name, table_name = descr[:11]
+    flags &= _TYPE_FLAGS
+    db_type = _DB_TYPES.get((t_code, flags, i_length)) or _DB_TYPES.get((t_code, flags, None))
+    if db_type is None: raise TypeError("Not supported database type {}".format(t_code))
+
+    column_type, length_field = _LIB_TYPES[db_type]
+    length: Optional[int] = None
+    if length_field == 4:
+        length = precision - 2
+    elif length_field is not None:
+        length = descr[length_field]
+
+    # Complete the database type if required.
+    if db_type in ("VARCHAR", "CHAR", "VARBINARY", "BINARY"):
+        db_type += "(" + str(length) + ")"
+    if db_type == "DECIMAL":
+        db_type += "(" + str(length) + "," + str(scale) + ")"
+    return ColumnDescr(column_name, column_alias, column_type, length,
+                       scale if column_type == Types.DECIMAL else None,
+                       nullable, table_name, table_alias, db_type)
+
+def get_column(column_descr: ColumnDescr) -> Column:
+    """ Returns a new column with the decoded attributes. """
+    column = Column()
+    column.set_name(column_descr.name)
+    column.set_alias(column_descr.alias)
+    column.set_type(column_descr.type)
+    if column_descr.length is not None:
+        column.set_length(column_descr.length)
+    if column_descr.scale is not None:
+        column.set_scale(column_descr.scale)
+    column.set_nullable(column_descr.nullable)
+    column.set_table_name(column_descr.table_name)
+    column.set_table_alias(column_descr.table_alias)
+    column.set_db_type(column_descr.db_type)
+    return column
+
+@lru_cache(maxsize=COLUMNS_CACHE_SIZE)
+def get_columns(description: tuple) -> FrozenColumnList:
+    """ Returns the frozen column list of a cursor description, cached by the description. """
+    columns = ColumnList()
+    for descr in description:
+        columns.append(get_column(get_column_descr(descr)))
+    return columns.freeze()
 
 class MariaDBAdapter(DBAdapter):
     def __init__(self): pass
@@ -42,187 +197,74 @@ class MariaDBAdapter(DBAdapter):
         return current_timestamp
 
     def get_column_from_cursor_descr(self, descr: tuple) -> Column:
-
-        ss = CURSOR.READ_ONLY
-
-        column_alias: str = descr[0]
-        t_code: int = descr[1]
-        t_length: int = descr[2]
-        i_length: int = descr[3]
-        precision: int = descr[4]
-        scale: int = descr[5]
-        nullable: bool = descr[6]
-        flags: int = descr[7]
-        table_alias = descr[8]
-        column_name = descr[9]
-        table_name = descr[10]
-
-        # Flags
-
-        binary = bool(flags & FIELD_FLAG.BINARY)
-        numeric = bool(flags & FIELD_FLAG.NUMERIC)
-        blob = bool(flags & FIELD_FLAG.BLOB)
-        primary_key = bool(flags & FIELD_FLAG.PRIMARY_KEY)
-
-        # Determine the root of the database type.
-
-        db_type: Optional[str] = None
-
-        """
-        ('col_varchar', 253, 20, 80, 0, 0, True, 0, 'check_types', 'col_varchar', 'check_types')
-        ('col_char', 254, 1, 4, 0, 0, True, 0, 'check_types', 'col_char', 'check_types')
-        """
-        if t_code == 253 and not binary: db_type = "VARCHAR"
-        if t_code == 254 and not binary: db_type = "CHAR"
-
-        """
-        ('col_tinytext', 252, 255, 1020, 0, 0, True, 16, 'check_types', 'col_tinytext', 'check_types')
-        ('col_text', 252, 65535, 262140, 0, 0, True, 16, 'check_types', 'col_text', 'check_types')
-        ('col_mediumtext', 252, 16777215, 67108860, 0, 0, True, 16, 'check_types', 'col_mediumtext', 'check_types')
-        ('col_longtext', 252, 1073741823, -1, 0, 0, True, 16, 'check_types', 'col_longtext', 'check_types')
-        """
-        if t_code == 252 and not binary and i_length == 1020: db_type = "TINYTEXT"
-        if t_code == 252 and not binary and i_length == 262140: db_type = "TEXT"
-        if t_code == 252 and not binary and i_length == 67108860: db_type = "MEDIUMTEXT"
-        if t_code == 252 and not binary and i_length == -1: db_type = "LONGTEXT"
-
-        """
-        ('col_tinyint', 1, 1, 4, 0, 0, True, 32768, 'check_types', 'col_tinyint', 'check_types')
-        ('col_smallint', 2, 1, 6, 0, 0, True, 32768, 'check_types', 'col_smallint', 'check_types')
-        ('col_mediumint', 9, 2, 9, 0, 0, True, 32768, 'check_types', 'col_mediumint', 'check_types')
-        ('col_int', 3, 2, 11, 0, 0, True, 32768, 'check_types', 'col_int', 'check_types')
-        ('col_bigint', 8, 5, 20, 0, 0, True, 32768, 'check_types', 'col_bigint', 'check_types')
-        """
-        if t_code == 1 and numeric: db_type = "TINYINT"
-        if t_code == 2 and numeric: db_type = "SMALLINT"
-        if t_code == 9 and numeric: db_type = "MEDIUMINT"
-        if t_code == 3 and numeric: db_type = "INT"
-        if t_code == 8 and numeric: db_type = "BIGINT"
-
-        """
-        ('col_float', 4, 3, 12, 0, 0, True, 32768, 'check_types', 'col_float', 'check_types')
-        ('col_double', 5, 5, 22, 0, 0, True, 32768, 'check_types', 'col_double', 'check_types')
-        ('col_decimal', 246, 23, 22, 22, 6, True, 32768, 'check_types', 'col_decimal', 'check_types')
-        """
-        if t_code == 4 and numeric: db_type = "FLOAT"
-        if t_code == 5 and numeric: db_type = "DOUBLE"
-        if t_code == 246 and numeric: db_type = "DECIMAL"
-
-        """
-        ('col_varbinary', 253, 5, 20, 0, 0, True, 128, 'check_types', 'col_varbinary', 'check_types')
-        ('col_binary', 254, 5, 20, 0, 0, True, 128, 'check_types', 'col_binary', 'check_types')
-        """
-        if t_code == 253 and binary: db_type = "VARBINARY"
-        if t_code == 254 and binary: db_type = "BINARY"
-
-        """
-        ('col_tinyblob', 252, 63, 255, 0, 0, True, 144, 'check_types', 'col_tinyblob', 'check_types')
-        ('col_blob', 252, 16383, 65535, 0, 0, True, 144, 'check_types', 'col_blob', 'check_types')
-        ('col_mediumblob', 252, 4194303, 16777215, 0, 0, True, 144, 'check_types', 'col_mediumblob', 'check_types')
-        ('col_longblob', 252, 1073741823, -1, 0, 0, True, 144, 'check_types', 'col_longblob', 'check_types')
+        return get_column(get_column_descr(descr))
+    def get_columns_from_cursor_descr(self, description) -> ColumnList:
         """
-        if t_code == 252 and binary and blob and i_length == 255: db_type = "TINYBLOB"
-        if t_code == 252 and binary and blob and i_length == 65535: db_type = "BLOB"
-        if t_code == 252 and binary and blob and i_length == 16777215: db_type = "MEDIUMBLOB"
-        if t_code == 252 and binary and blob and i_length == -1: db_type = "LONGBLOB"
-
-        """
-        ('col_date', 10, 2, 10, 0, 0, True, 128, 'check_types', 'col_date', 'check_types')
-        ('col_time', 11, 2, 10, 0, 0, True, 128, 'check_types', 'col_time', 'check_types')
-        ('col_year', 13, 1, 4, 0, 0, True, 32864, 'check_types', 'col_year', 'check_types')
-        ('col_datetime', 12, 4, 19, 0, 0, True, 128, 'check_types', 'col_datetime', 'check_types')
-        ('col_timestamp', 7, 4, 19, 0, 0, True, 160, 'check_types', 'col_timestamp', 'check_types')
+        Returns the frozen column list of a cursor description, shared by the statements
+        with the same description.
         """
-        if t_code == 10: db_type = "DATE"
-        if t_code == 11: db_type = "TIME"
-        if t_code == 12: db_type = "DATETIME"
-        if t_code == 7: db_type = "TIMESTAMP"
-
-        if db_type is None: raise TypeError("Not supported database type {}".format(t_code))
-
-        # Determine this library type.
-
-        column_type: Optional[Types] = None
-        if db_type in ("VARCHAR", "CHAR", "TINYTEXT", "TEXT", "MEDIUMTEXT", "LONGTEXT"):
-            column_type = Types.STRING
-        if db_type in ("TINYINT", "SMALLINT", "MEDIUMINT", "INT", "BIGINT"):
-            column_type = Types.INTEGER
-        if db_type in ("FLOAT", "DOUBLE"):
-            column_type = Types.FLOAT
-        if db_type == "DECIMAL":
-            column_type = Types.DECIMAL
-        if db_type in ("VARBINARY", "BINARY", "TINYBLOB", "BLOB", "MEDIUMBLOB", "LONGBLOB"):
-            column_type = Types.BINARY
-        if db_type == "DATE":
-            column_type = Types.DATE
-        if db_type == "TIME":
-            column_type = Types.TIME
-        if db_type in ("DATETIME", "TIMESTAMP"):
-            column_type = Types.DATETIME
-
-        if column_type is None: raise TypeError("Not supported database type {}".format(db_type))
-
-        # Proper length.
-
-        length: Optional[int] = None
-        if db_type in ("VARCHAR", "CHAR", "TINYTEXT", "TEXT", "MEDIUMTEXT", "LONGTEXT", "LONGBLOB"):
-            length = t_length
-        if db_type in ("VARBINARY", "BINARY", "TINYBLOB", "BLOB", "MEDIUMBLOB"):
-            length = i_length
-        if db_type == "DECIMAL":
-            length = precision - 2
-
-        # Complete the database type if required.
-
-        if db_type in ("VARCHAR", "CHAR", "VARBINARY", "BINARY"):
-            db_type += "(" + str(length) + ")"
-        if db_type == "DECIMAL":
-            db_type += "(" + str(length) + "," + str(scale) + ")"
-
-        column = Column()
-        column.set_name(column_name)
-        column.set_alias(column_alias)
-        column.set_type(column_type)
-        if length is not None:
-            column.set_length(length)
-        if db_type.startswith("DECIMAL"):
-            column.set_scale(scale)
-
-        column.set_nullable(nullable)
-
-        column.set_table_name(table_name)
-        column.set_table_alias(table_alias)
-        column.set_db_type(db_type)
-
-        return column
-
+        return get_columns(tuple(description))
+    def get_column_db_type(self, column: Column) -> str:
+        """ Returns the database type of the column, the declared one or the one of its type. """
+        if column.get_db_type(): return column.get_db_type()
+        type = column.get_type()
+        length = column.get_length()
+        if type == Types.BOOLEAN: return "CHAR(1)"
+        if type == Types.INTEGER: return "BIGINT"
+        if type == Types.FLOAT: return "DOUBLE"
+        if type == Types.DECIMAL: return "DECIMAL(" + str(length) + "," + str(max(column.get_scale(), 0)) + ")"
+        if type == Types.DATE: return "DATE"
+        if type == Types.TIME: return "TIME(6)"
+        if type == Types.DATETIME: return "DATETIME(6)"
+        if type == Types.BINARY: return "VARBINARY(" + str(length) + ")" if length > 0 else "LONGBLOB"
+        return "VARCHAR(" + str(length) + ")" if length > 0 else "LONGTEXT"
     def get_column_db_def(self, column: Column) -> str:
         """ Returns the database column definition as a string. """
-        return ""
+        db_def = column.get_name() + " " + self.get_column_db_type(column)
+        if not column.is_nullable(): db_def += " NOT NULL"
+        return db_def
     def get_lib_type(self, db_type: str) -> Types:
         return Types.STRING
     def to_sql_binary(self, value: (bytes, bytearray)) -> str:
-        return ""
+        return "X'" + bytes(value).hex() + "'"
     def to_sql_date(self, value: date) -> str:
-        return ""
+        return "'" + value.isoformat() + "'"
     def to_sql_datetime(self, value: datetime) -> str:
-        return ""
+        return "'" + value.isoformat(sep=" ") + "'"
     def to_sql_time(self, value: time) -> str:
-        return ""
+        return "'" + value.isoformat() + "'"
+
+    def get_bulk_insert(self, table: Table, on_duplicate: str) -> str:
+        names = [column.get_name() for column in table.columns]
+        insert = "INSERT IGNORE INTO " if on_duplicate == "ignore" else "INSERT INTO "
+        insert += self.get_table_name(table)
+        insert += " (" + ", ".join(names) + ")"
+        insert += " VALUES (" + ", ".join(["?"] * len(names)) + ")"
+        if on_duplicate == "update":
+            pk_names = self.get_pk_names(table)
+            updates = [name + " = VALUES(" + name + ")" for name in names if name not in pk_names]
+            if updates:
+                insert += " ON DUPLICATE KEY UPDATE " + ", ".join(updates)
+        return insert
     """ End class MariaDBAdapter """
 class MariaDBCursor(DBCursor):
     def __init__(self, db, cursor: Cursor):
+        super().__init__()
         self.__db = db
         self.__cursor = cursor
     def get_adapter(self) -> DBAdapter: return self.__db.get_adapter()
     def execute(self, operation, **kwargs):
         self.__cursor.execute(operation, **kwargs)
+    def executemany(self, operation, seq_of_parameters):
+        self.__cursor.executemany(operation, seq_of_parameters)
     def fetchone(self) -> object:
         return self.__cursor.fetchone()
     def fetchall(self) -> object:
         return self.__cursor.fetchall()
     def fetchmany(self, size=100) -> object:
-        return self.__cursor.fetchmany()
+        if not isinstance(size, int) or size <= 0:
+            raise ValueError(f"Size {size} is not a positive integer")
+        return self.__cursor.fetchmany(size)
     def count(self) -> int:
         return self.__cursor.rowcount
     @property
@@ -233,44 +275,25 @@ class MariaDBCursor(DBCursor):
         return self.__cursor.rowcount
     def close(self):
         self.__cursor.close()
-
-    def executeSelect(self, select: str, columns: Optional[ColumnList], callback: Callable[[int, Record], bool]):
-        self.__cursor.execute(select)
-
-        # If no columns are provided, build it using the description.
-        if not isinstance(columns, ColumnList):
-            adapter = self.get_adapter()
-            columns = ColumnList()
-            for descr in self.__cursor.description:
-                column = adapter.get_column_from_cursor_descr(descr)
-                columns.append(column)
-
-        def value(col: Column, raw) -> Value:
-            type = col.get_type()
-            scale = col.get_scale()
-            return get_value(type, scale, raw)
-
-        # Scan the cursor
-        count = 0
-        row = self.__cursor.fetchone()
-        while row:
-            count += 1
-            size = len(row)
-            values = tuple(value(columns[i], row[i]) for i in range(size))
-            record: Record = Record(columns, values)
-            if not callback(count, record): break
-            row = self.__cursor.fetchone()
-
-        self.close()
-
     """ End class MariaDBCursor """
 class MariaDBConnection(DBConnection):
-    def __init__(self, db, conn: Connection):
+    def __init__(self, db, conn: Connection, pool: BoundedPool = None):
+        super().__init__()
         self.__db = db
         self.__conn = conn
+        self.__pool = pool
+        self.__closed = False
     def get_adapter(self) -> DBAdapter: return self.__db.get_adapter()
     def close(self):
-        self.__conn.close()
+        # Idempotent, once released the raw connection belongs to the pool.
+        if self.__closed: return
+        self.__closed = True
+        self.close_prepared()
+        if self.__pool is not None:
+            pool, self.__pool = self.__pool, None
+            pool.release(self.__conn)
+        else:
+            self.__conn.close()
     def commit(self):
         self.__conn.commit()
     def rollback(self):
@@ -281,16 +304,37 @@ class MariaDBConnection(DBConnection):
         return MariaDBCursor(self.__db, cs)
     """ End class MariaDBConnection """
 class MariaDBConnectionPool(DBConnectionPool):
+    """
+    Connection pool over the driver pool, bounded to pool_size connections in use.
+    Besides the driver arguments, accepts acquire_timeout (seconds), max_waiting (callers)
+    and prewarm (connections opened on startup). Connections are validated with a ping.
+    """
     def __init__(self, db, **kwargs):
         self.__db = db
-        self.__pool = ConnectionPool(**kwargs)
+        acquire_timeout = kwargs.pop("acquire_timeout", 30.0)
+        max_waiting = kwargs.pop("max_waiting", None)
+        prewarm = kwargs.pop("prewarm", 0)
+        self.__driver_pool = ConnectionPool(**kwargs)
+        self.__pool = BoundedPool(
+            self.__connect__,
+            max_size=kwargs.get("pool_size", 5),
+            acquire_timeout=acquire_timeout,
+            max_waiting=max_waiting,
+            prewarm=prewarm,
+            validate=lambda conn: conn.ping(),
+            reset=lambda conn: conn.rollback())
+    def __connect__(self) -> Connection:
+        conn = self.__driver_pool.get_connection()
+        conn.autocommit = False
+        return conn
     def get_adapter(self) -> DBAdapter: return self.__db.get_adapter()
     def get_connection(self) -> DBConnection:
-        conn = self.__pool.get_connection()
-        conn.autocommit = False
-        return MariaDBConnection(self.__db, conn)
+        return MariaDBConnection(self.__db, self.__pool.acquire(), self.__pool)
+    def get_stats(self) -> PoolStats:
+        return self.__pool.get_stats()
     def close(self):
         self.__pool.close()
+        self.__driver_pool.close()
     """ End class MariaDBConnectionPool """
 class MariaDB(DB):
     def __init__(self, **kwargs):
@@ -0,0 +1,230 @@
+#  Copyright (c) 2025 Miquel Sas.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+""" Bounded pool of driver connections, with acquire timeouts, validation and metrics. """
+
+from contextlib import contextmanager
+from threading import Condition
+from time import perf_counter
+from typing import Callable, Optional, Any
+
+class PoolStats:
+    """ Counters of a bounded pool. """
+
+    # Upper bounds in milliseconds of the buckets of the waited histogram.
+    WAITED_MS_BUCKETS = (1, 5, 10, 50, 100, 500, 1000, 5000, float("inf"))
+
+    def __init__(self):
+        self.acquired: int = 0
+        self.released: int = 0
+        self.created: int = 0
+        self.waits: int = 0
+        self.timeouts: int = 0
+        self.rejections: int = 0
+        self.evictions: int = 0
+        self.validations: int = 0
+        self.validation_failures: int = 0
+        self.validation_secs: float = 0.0
+        self.in_use: int = 0
+        self.idle: int = 0
+        self.waiting: int = 0
+        self.waited_ms: dict = {bound: 0 for bound in PoolStats.WAITED_MS_BUCKETS}
+
+    def add_waited_ms(self, waited_ms: float):
+        for bound in PoolStats.WAITED_MS_BUCKETS:
+            if waited_ms <= bound:
+                self.waited_ms[bound] += 1
+                return
+
+    def copy(self):
+        stats = PoolStats()
+        stats.__dict__.update(self.__dict__)
+        stats.waited_ms = dict(self.waited_ms)
+        return stats
+
+    def __str__(self) -> str:
+        return (f"acquired {self.acquired}, released {self.released}, created {self.created}, "
+                f"in use {self.in_use}, idle {self.idle}, waiting {self.waiting}, waits {self.waits}, "
+                f"timeouts {self.timeouts}, rejections {self.rejections}, evictions {self.evictions}, "
+                f"validation failures {self.validation_failures}/{self.validations}")
+    def __repr__(self): return self.__str__()
+    """ End class PoolStats """
+class BoundedPool:
+    """
+    Pool of driver connections bounded to a maximum in use. Released connections are
+    kept idle and reused. When all connections are in use, callers wait up to the
+    acquire timeout, and at most max_waiting callers can wait, further callers are
+    rejected.
+    """
+    def __init__(self,
+                 connect: Callable[[], Any],
+                 max_size: int = 5,
+                 acquire_timeout: Optional[float] = 30.0,
+                 max_waiting: Optional[int] = None,
+                 prewarm: int = 0,
+                 validate: Optional[Callable[[Any], bool]] = None,
+                 reset: Optional[Callable[[Any], None]] = None):
+        """
+        :param connect: Function that opens a new driver connection.
+        :param max_size: The maximum number of connections in use.
+        :param acquire_timeout: The default seconds to wait for a connection, None waits forever.
+        :param max_waiting: The maximum number of callers waiting, None is unbounded.
+        :param prewarm: The number of connections to open on startup.
+        :param validate: Optional function that validates a connection before handing it out,
+        it must return False or raise an exception if the connection is not valid.
+        :param reset: Optional function applied to a connection when released, i.e. rollback.
+        """
+        if not isinstance(max_size, int) or max_size <= 0:
+            raise ValueError(f"Max size {max_size} is not a positive integer")
+        if not isinstance(prewarm, int) or not 0 <= prewarm <= max_size:
+            raise ValueError(f"Prewarm {prewarm} must be between 0 and max size {max_size}")
+        self.__connect = connect
+        self.__max_size: int = max_size
+        self.__acquire_timeout: Optional[float] = acquire_timeout
+        self.__max_waiting: Optional[int] = max_waiting
+        self.__validate = validate
+        self.__reset = reset
+        self.__idle: list = []
+        self.__closed: bool = False
+        self.__condition = Condition()
+        self.__stats = PoolStats()
+
+        for _ in range(prewarm):
+            self.__idle.append(self.__open__())
+        self.__stats.idle = len(self.__idle)
+
+    def __open__(self):
+        conn = self.__connect()
+        with self.__condition:
+            self.__stats.created += 1
+        return conn
+
+    def __evict__(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def __is_valid__(self, conn) -> bool:
+        start = perf_counter()
+        try:
+            valid = self.__validate(conn) is not False
+        except Exception:
+            valid = False
+        with self.__condition:
+            self.__stats.validations += 1
+            self.__stats.validation_secs += perf_counter() - start
+            if not valid:
+                self.__stats.validation_failures += 1
+                self.__stats.evictions += 1
+        return valid
+
+    def get_stats(self) -> PoolStats:
+        """ Returns a copy of the current counters. """
+        with self.__condition:
+            return self.__stats.copy()
+
+    def acquire(self, timeout: Optional[float] = -1):
+        """
+        Acquire a connection, waiting if all connections are in use.
+        :param timeout: The seconds to wait, -1 for the pool acquire timeout, None waits forever.
+        :return: The driver connection.
+        """
+        if timeout == -1: timeout = self.__acquire_timeout
+        with self.__condition:
+            if self.__closed:
+                raise PermissionError("The pool is closed")
+            stats = self.__stats
+            if stats.in_use >= self.__max_size:
+                if self.__max_waiting is not None and stats.waiting >= self.__max_waiting:
+                    stats.rejections += 1
+                    raise RuntimeError(f"Pool exhausted, {stats.waiting} callers already waiting")
+                stats.waits += 1
+                stats.waiting += 1
+                start = perf_counter()
+                try:
+                    available = self.__condition.wait_for(
+                        lambda: self.__closed or stats.in_use < self.__max_size, timeout)
+                finally:
+                    stats.waiting -= 1
+                    stats.add_waited_ms((perf_counter() - start) * 1000)
+                if not available:
+                    stats.timeouts += 1
+                    raise TimeoutError(f"No connection available after {timeout} seconds")
+                if self.__closed:
+                    raise PermissionError("The pool is closed")
+            stats.in_use += 1
+            stats.acquired += 1
+
+        # Take an idle connection, discarding the invalid ones, or open a new one.
+        # Validation and connection run out of the lock.
+        try:
+            while True:
+                with self.__condition:
+                    conn = self.__idle.pop() if self.__idle else None
+                    self.__stats.idle = len(self.__idle)
+                if conn is None:
+                    return self.__open__()
+                if self.__validate is None or self.__is_valid__(conn):
+                    return conn
+                self.__evict__(conn)
+        except Exception:
+            with self.__condition:
+                self.__stats.in_use -= 1
+                self.__condition.notify()
+            raise
+
+    def release(self, conn, evict: bool = False):
+        """
+        Release a connection to the pool.
+        :param conn: The driver connection.
+        :param evict: If True, the connection is closed and discarded.
+        """
+        if not evict and self.__reset is not None:
+            try:
+                self.__reset(conn)
+            except Exception:
+                evict = True
+        with self.__condition:
+            self.__stats.in_use -= 1
+            self.__stats.released += 1
+            if evict:
+                self.__stats.evictions += 1
+            if evict or self.__closed:
+                self.__evict__(conn)
+            else:
+                self.__idle.append(conn)
+                self.__stats.idle = len(self.__idle)
+            self.__condition.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = -1):
+        """ Context manager that acquires a connection and guarantees its release. """
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """ Close the idle connections, connections in use are closed when released. """
+        with self.__condition:
+            self.__closed = True
+            idle = list(self.__idle)
+            self.__idle.clear()
+            self.__stats.idle = 0
+            self.__condition.notify_all()
+        for conn in idle:
+            conn.close()
+    """ End class BoundedPool """
@@ -0,0 +1,201 @@
+#  Copyright (c) 2025 Miquel Sas.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Parallel scan of a table partitioned by disjoint ranges of an INTEGER or DATETIME column.
+Each range is selected on its own pooled connection from a thread pool, and the records
+are passed to the callback from the calling thread, in order of the ranges or as they
+arrive.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from queue import Queue, Full
+from threading import Event
+from typing import Callable, List, Tuple, Union, Optional
+
+from msfx.lib.db import Types
+from msfx.lib.db.cn import DB, DBAdapter
+from msfx.lib.db.md import Column, Table
+from msfx.lib.db.rs import Record
+
+# Marks the end of the records of a range.
+_END = object()
+
+def get_ranges(start: Union[int, datetime], end: Union[int, datetime], partitions: int) -> List[Tuple]:
+    """
+    Split the closed interval [start, end] into disjoint half open ranges [from, to).
+    :param start: The minimum value, an int or a datetime.
+    :param end: The maximum value, included in the last range.
+    :param partitions: The number of ranges.
+    :return: The list of (from, to) tuples, ascending.
+    """
+    if not isinstance(partitions, int) or partitions <= 0:
+        raise ValueError(f"Partitions {partitions} is not a positive integer")
+    if type(start) is not type(end) or not isinstance(start, (int, datetime)):
+        raise TypeError("Start and end must be both int or both datetime")
+    if end < start:
+        raise ValueError(f"End {end} is less than start {start}")
+
+    if isinstance(start, int):
+        step = max(-(-(end - start + 1) // partitions), 1)
+        bounds = list(range(start, end + 1, step)) + [end + 1]
+    else:
+        step = (end - start) / partitions
+        bounds = [start + step * i for i in range(partitions)] + [end + timedelta(microseconds=1)]
+    ranges = []
+    for i in range(len(bounds) - 1):
+        if bounds[i] < bounds[i + 1]:
+            ranges.append((bounds[i], bounds[i + 1]))
+    return ranges
+
+def get_partition_bounds(db: DB, table: Table, partition_column: Column) -> Optional[Tuple]:
+    """
+    Returns the minimum and maximum values of the partition column, or None if the table is empty.
+    """
+    adapter = db.get_adapter()
+    table_name = adapter.get_table_name(table)
+    name = partition_column.get_name()
+    bounds = []
+    conn = db.get_connection()
+    try:
+        for order in ("ASC", "DESC"):
+            cursor = conn.cursor()
+            try:
+                cursor.execute(f"SELECT {name} FROM {table_name} WHERE {name} IS NOT NULL "
+                               f"ORDER BY {name} {order} LIMIT 1")
+                row = cursor.fetchone()
+            finally:
+                cursor.close()
+            if row is None: return None
+            bounds.append(row[0])
+    finally:
+        conn.close()
+    return bounds[0], bounds[1]
+
+def get_range_select(adapter: DBAdapter, table: Table, partition_column: Column, range: Tuple) -> str:
+    """ Returns the SELECT of the table columns in the range, ordered by the partition column. """
+    name = partition_column.get_name()
+    names = [column.get_name() for column in table.columns]
+    select = "SELECT " + ", ".join(names)
+    select += " FROM " + adapter.get_table_name(table)
+    select += " WHERE " + name + " >= " + adapter.to_sql(range[0])
+    select += " AND " + name + " < " + adapter.to_sql(range[1])
+    select += " ORDER BY " + name
+    return select
+
+def parallel_scan(db: DB,
+                  table: Table,
+                  partition_column: Union[str, Column],
+                  ranges: Union[int, List[Tuple]],
+                  callback: Callable[[int, Record], bool],
+                  workers: int = 4,
+                  ordered: bool = True,
+                  chunk_size: int = 1000,
+                  queue_size: int = 4) -> int:
+    """
+    Scan the table selecting disjoint ranges of the partition column in parallel, each range
+    on its own connection, and call the callback with the records from the calling thread.
+    :param db: The database, its connection pool should have at least workers connections.
+    :param table: The table to scan.
+    :param partition_column: The alias or the column to partition by, INTEGER or DATETIME.
+    :param ranges: The number of ranges to split the values of the column into, or the list of
+    disjoint half open (from, to) ranges.
+    :param callback: The callback function that will be called with the count and the record.
+    It must return a boolean indicating whether to continue the scan or not.
+    :param workers: The number of threads and connections scanning ranges concurrently.
+    :param ordered: If True, records are passed in order of the ranges, and within each range
+    in order of the partition column. If False, records are passed as they arrive.
+    :param chunk_size: The number of rows to fetch per round trip.
+    :param queue_size: The number of chunks per range buffered before the worker waits.
+    :return: The number of records passed to the callback.
+    """
+    if not isinstance(db, DB): raise TypeError("Invalid db")
+    if not isinstance(table, Table): raise TypeError("Invalid table")
+    if isinstance(partition_column, str):
+        partition_column = table.columns.get_by_alias(partition_column)
+    if not isinstance(partition_column, Column): raise TypeError("Invalid partition column")
+    if partition_column.get_type() not in (Types.INTEGER, Types.DATETIME):
+        raise ValueError(f"Partition column type {partition_column.get_type()} is not INTEGER or DATETIME")
+    if not isinstance(workers, int) or workers <= 0:
+        raise ValueError(f"Workers {workers} is not a positive integer")
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError(f"Chunk size {chunk_size} is not a positive integer")
+
+    if isinstance(ranges, int):
+        bounds = get_partition_bounds(db, table, partition_column)
+        if bounds is None: return 0
+        ranges = get_ranges(bounds[0], bounds[1], ranges)
+    ranges = sorted(ranges)
+    for i in range(1, len(ranges)):
+        if ranges[i][0] < ranges[i - 1][1]:
+            raise ValueError(f"Ranges {ranges[i - 1]} and {ranges[i]} overlap")
+
+    adapter = db.get_adapter()
+    columns = table.columns.freeze()
+    stop = Event()
+    shared = None if ordered else Queue(maxsize=queue_size * workers)
+    queues = [Queue(maxsize=queue_size) if ordered else shared for _ in ranges]
+
+    def put(queue: Queue, item) -> bool:
+        # Put waiting for room, unless the scan is stopped.
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def scan(index: int):
+        queue = queues[index]
+        if stop.is_set(): return
+        try:
+            select = get_range_select(adapter, table, partition_column, ranges[index])
+            conn = db.get_connection()
+            try:
+                blocks = conn.cursor().__blocks__(select, columns, chunk_size, False, False)
+                try:
+                    for block in blocks:
+                        if not put(queue, block): break
+                finally:
+                    blocks.close()
+            finally:
+                conn.close()
+            put(queue, _END)
+        except BaseException as e:
+            put(queue, e)
+
+    count = 0
+    pending = len(ranges)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="msfx-scan") as executor:
+        for index in range(len(ranges)):
+            executor.submit(scan, index)
+        try:
+            index = 0
+            while pending > 0:
+                queue = queues[index] if ordered else shared
+                item = queue.get()
+                if item is _END:
+                    pending -= 1
+                    index += 1
+                    continue
+                if isinstance(item, BaseException):
+                    raise item
+                for record in item:
+                    count += 1
+                    if not callback(count, record):
+                        return count
+        finally:
+            stop.set()
+    return count
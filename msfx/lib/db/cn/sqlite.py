@@ -0,0 +1,339 @@
+#  Copyright (c) 2025 Miquel Sas.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Implementation of the db connector interface for SQLite, aimed to run the data
+layer on local cache files and offline tests and benchmarks.
+
+SQLite values are typed per cell, not per column. Decimals and temporal values
+are written as text by the cursor, not by adapters and converters registered
+in the sqlite3 module, that would change it for every user in the process. The
+cursor types each column with the declared type of the column of the same name
+of the tables queried, and the ISO text of columns declared temporal is parsed
+back by the cursor. Other columns, i.e. expressions and aliases, are typed with
+the first non-null value within the first rows read ahead, where text is always
+a string, and columns without a value there are typed as strings. Pass an
+explicit ColumnList when the types matter.
+"""
+import re
+import sqlite3
+from datetime import time, datetime, date
+from decimal import Decimal
+from typing import Optional, Iterable
+
+from msfx.lib.db import Types
+from msfx.lib.db.cn import DBCursor, DBConnection, DBConnectionPool, DBAdapter, DB
+from msfx.lib.db.cn.cache import get_tables
+from msfx.lib.db.cn.pool import BoundedPool, PoolStats
+from msfx.lib.db.md import Column, Table
+
+# Maximum number of rows read ahead to find the first non-null value of each column.
+READ_AHEAD_ROWS = 1000
+
+# Parameters written as text.
+_ADAPTERS = {
+    Decimal: str,
+    date: lambda value: value.isoformat(),
+    time: lambda value: value.isoformat(),
+    datetime: lambda value: value.isoformat(sep=" "),
+}
+# Scale of a declared type, i.e. DECIMAL(10,2).
+_SCALE_PATTERN = re.compile(r"\(\s*\d+\s*,\s*(\d+)\s*\)")
+# Statements that change the declared types of the tables.
+_DDL_PATTERN = re.compile(r"\s*(CREATE|ALTER|DROP)\b", re.IGNORECASE)
+# Parsers of the ISO text of columns declared temporal.
+_PARSERS = {
+    Types.DATE: date.fromisoformat,
+    Types.DATETIME: datetime.fromisoformat,
+    Types.TIME: time.fromisoformat,
+}
+
+def get_params(params) -> tuple:
+    """ Returns the parameters with decimals and temporal values as text. """
+    if isinstance(params, dict):
+        return {name: _ADAPTERS[value.__class__](value) if value.__class__ in _ADAPTERS else value
+                for name, value in params.items()}
+    return tuple([_ADAPTERS[value.__class__](value) if value.__class__ in _ADAPTERS else value for value in params])
+
+class SQLiteAdapter(DBAdapter):
+    def __init__(self): pass
+
+    def get_current_date(self) -> str: return "CURRENT_DATE"
+    def get_current_time(self, prec) -> str: return "CURRENT_TIME"
+    def get_current_datetime(self, prec) -> str: return "CURRENT_TIMESTAMP"
+
+    def get_column_from_cursor_descr(self, descr: tuple) -> Column:
+        """
+        Returns the column from a description completed by the SQLiteCursor, where the
+        type code is the Types of the declared column or of the first row value, or None,
+        and the scale is the declared scale or the scale of the first row value for decimals.
+        """
+        column_alias: str = descr[0]
+        column_type: Optional[Types] = descr[1]
+        scale: Optional[int] = descr[5]
+
+        column = Column()
+        column.set_name(column_alias)
+        column.set_type(column_type if isinstance(column_type, Types) else Types.STRING)
+        if column_type == Types.DECIMAL:
+            column.set_scale(scale)
+        column.set_nullable(True)
+        column.set_db_type(self.get_column_db_type(column))
+        return column
+    def get_column_db_type(self, column: Column) -> str:
+        """ Returns the declared type of the column. """
+        type = column.get_type()
+        if type == Types.INTEGER: return "INTEGER"
+        if type == Types.FLOAT: return "REAL"
+        if type == Types.DECIMAL:
+            if column.get_length() > 0:
+                return "DECIMAL(" + str(column.get_length()) + "," + str(max(column.get_scale(), 0)) + ")"
+            return "DECIMAL"
+        if type == Types.DATE: return "DATE"
+        if type == Types.TIME: return "TIME"
+        if type == Types.DATETIME: return "DATETIME"
+        if type == Types.BINARY: return "BLOB"
+        return "TEXT"
+    def get_column_db_def(self, column: Column) -> str:
+        """ Returns the database column definition as a string. """
+        db_def = column.get_name() + " " + self.get_column_db_type(column)
+        if not column.is_nullable(): db_def += " NOT NULL"
+        return db_def
+    def get_lib_type(self, db_type: str) -> Types:
+        db_type = db_type.upper()
+        if db_type.startswith("DECIMAL"): return Types.DECIMAL
+        if db_type.startswith("DATETIME") or db_type.startswith("TIMESTAMP"): return Types.DATETIME
+        if db_type.startswith("DATE"): return Types.DATE
+        if db_type.startswith("TIME"): return Types.TIME
+        if "INT" in db_type: return Types.INTEGER
+        if "REAL" in db_type or "FLOA" in db_type or "DOUB" in db_type: return Types.FLOAT
+        if "BLOB" in db_type: return Types.BINARY
+        return Types.STRING
+
+    def to_sql_binary(self, value: (bytes, bytearray)) -> str:
+        return "X'" + bytes(value).hex() + "'"
+    def to_sql_date(self, value: date) -> str:
+        return "'" + value.isoformat() + "'"
+    def to_sql_datetime(self, value: datetime) -> str:
+        return "'" + value.isoformat(sep=" ") + "'"
+    def to_sql_time(self, value: time) -> str:
+        return "'" + value.isoformat() + "'"
+
+    def get_bulk_insert(self, table: Table, on_duplicate: str) -> str:
+        names = [column.get_name() for column in table.columns]
+        insert = "INSERT OR IGNORE INTO " if on_duplicate == "ignore" else "INSERT INTO "
+        insert += self.get_table_name(table)
+        insert += " (" + ", ".join(names) + ")"
+        insert += " VALUES (" + ", ".join(["?"] * len(names)) + ")"
+        if on_duplicate == "update":
+            pk_names = self.get_pk_names(table)
+            updates = [name + " = excluded." + name for name in names if name not in pk_names]
+            if pk_names and updates:
+                insert += " ON CONFLICT (" + ", ".join(pk_names) + ")"
+                insert += " DO UPDATE SET " + ", ".join(updates)
+            elif pk_names:
+                insert += " ON CONFLICT DO NOTHING"
+        return insert
+    """ End class SQLiteAdapter """
+class SQLiteCursor(DBCursor):
+    def __init__(self, db, cursor: sqlite3.Cursor):
+        super().__init__()
+        self.__db = db
+        self.__cursor = cursor
+        self.__operation: Optional[str] = None
+        self.__reset__()
+    def __reset__(self):
+        # Rows read ahead to type the columns, the types and scales and the parsers of temporal columns.
+        self.__ahead: list = []
+        self.__types: Optional[list] = None
+        self.__scales: Optional[list] = None
+        self.__parsers: tuple = ()
+    def get_adapter(self) -> DBAdapter: return self.__db.get_adapter()
+    def execute(self, operation, **kwargs):
+        self.__reset__()
+        self.__operation = operation
+        if _DDL_PATTERN.match(operation): self.__db.clear_declared_types()
+        self.__cursor.execute(operation, get_params(kwargs.get("data", ())))
+    def executemany(self, operation, seq_of_parameters: Iterable):
+        self.__reset__()
+        self.__operation = operation
+        self.__cursor.executemany(operation, (get_params(params) for params in seq_of_parameters))
+    def __get_declared_types__(self) -> dict:
+        """
+        Returns the declared type of the columns of the tables queried, by lower case name, as a
+        tuple (type, scale). Names declared with different types in several tables are excluded.
+        """
+        declared = {}
+        ambiguous = set()
+        for table in get_tables(self.__operation):
+            for name, type_scale in self.__db.get_declared_types(self.__cursor.connection, table).items():
+                if declared.get(name, type_scale) != type_scale: ambiguous.add(name)
+                declared[name] = type_scale
+        for name in ambiguous: del declared[name]
+        return declared
+    def __read_ahead__(self):
+        """
+        Types the columns once per statement, with the declared type of the table column of the
+        same name, or the type of the first non-null value within the rows read ahead.
+        """
+        if self.__types is not None or self.__cursor.description is None: return
+        declared = self.__get_declared_types__() if self.__operation else {}
+        columns = len(self.__cursor.description)
+        types = [None] * columns
+        scales = [None] * columns
+        pending = set()
+        for i, descr in enumerate(self.__cursor.description):
+            type_scale = declared.get(descr[0].lower())
+            if type_scale is None: pending.add(i)
+            else: types[i], scales[i] = type_scale
+        while pending and len(self.__ahead) < READ_AHEAD_ROWS:
+            row = self.__cursor.fetchone()
+            if row is None: break
+            self.__ahead.append(row)
+            for i in [i for i in pending if row[i] is not None]:
+                types[i] = Types.get_type(row[i])
+                if types[i] == Types.DECIMAL: scales[i] = max(-row[i].as_tuple().exponent, 0)
+                pending.discard(i)
+        self.__types = types
+        self.__scales = scales
+        self.__parsers = tuple((i, _PARSERS[type]) for i, type in enumerate(types) if type in _PARSERS)
+        if self.__parsers: self.__ahead = self.__parse__(self.__ahead)
+    def __parse__(self, rows: list) -> list:
+        """ Returns the rows with the ISO text of temporal columns parsed. """
+        if not self.__parsers: return rows
+        parsed = []
+        for row in rows:
+            row = list(row)
+            for i, parser in self.__parsers:
+                if row[i].__class__ is str: row[i] = parser(row[i])
+            parsed.append(tuple(row))
+        return parsed
+    def __pop_ahead__(self, size: int) -> list:
+        self.__read_ahead__()
+        rows = self.__ahead[:size]
+        del self.__ahead[:size]
+        return rows
+    def fetchone(self) -> object:
+        rows = self.__pop_ahead__(1)
+        if rows: return rows[0]
+        row = self.__cursor.fetchone()
+        return row if row is None else self.__parse__([row])[0]
+    def fetchall(self) -> object:
+        self.__read_ahead__()
+        return self.__pop_ahead__(len(self.__ahead)) + self.__parse__(self.__cursor.fetchall())
+    def fetchmany(self, size=100) -> object:
+        if not isinstance(size, int) or size <= 0:
+            raise ValueError(f"Size {size} is not a positive integer")
+        rows = self.__pop_ahead__(size)
+        if len(rows) < size: rows += self.__parse__(self.__cursor.fetchmany(size - len(rows)))
+        return rows
+    def count(self) -> int:
+        return self.__cursor.rowcount
+    @property
+    def description(self):
+        if self.__cursor.description is None: return None
+        self.__read_ahead__()
+        description = []
+        for i, descr in enumerate(self.__cursor.description):
+            description.append((descr[0], self.__types[i], None, None, None, self.__scales[i], True))
+        return description
+    @property
+    def rowcount(self):
+        return self.__cursor.rowcount
+    def close(self):
+        self.__cursor.close()
+    """ End class SQLiteCursor """
+class SQLiteConnection(DBConnection):
+    def __init__(self, db, conn: sqlite3.Connection, pool: BoundedPool = None):
+        super().__init__()
+        self.__db = db
+        self.__conn = conn
+        self.__pool = pool
+        self.__closed = False
+    def get_adapter(self) -> DBAdapter: return self.__db.get_adapter()
+    def close(self):
+        # Idempotent, once released the raw connection belongs to the pool.
+        if self.__closed: return
+        self.__closed = True
+        self.close_prepared()
+        if self.__pool is not None:
+            pool, self.__pool = self.__pool, None
+            pool.release(self.__conn)
+        else:
+            self.__conn.close()
+    def commit(self):
+        self.__conn.commit()
+    def rollback(self):
+        self.__conn.rollback()
+    def cursor(self, **kwargs) -> DBCursor:
+        # Cursor arguments (i.e. prepared) are ignored, sqlite3 caches the prepared statements per connection.
+        return SQLiteCursor(self.__db, self.__conn.cursor())
+    """ End class SQLiteConnection """
+class SQLiteConnectionPool(DBConnectionPool):
+    """
+    Pool of connections to a database file, bounded to pool_size connections in use.
+    Accepts acquire_timeout, max_waiting and prewarm as the MariaDB pool. For a shared
+    in-memory database use database="file:name?mode=memory&cache=shared" and uri=True.
+    """
+    def __init__(self, db, **kwargs):
+        self.__db = db
+        kwargs.pop("pool_name", None)
+        pool_size = kwargs.pop("pool_size", 5)
+        acquire_timeout = kwargs.pop("acquire_timeout", 30.0)
+        max_waiting = kwargs.pop("max_waiting", None)
+        prewarm = kwargs.pop("prewarm", 0)
+        kwargs.setdefault("check_same_thread", False)
+        self.__pool = BoundedPool(
+            lambda: sqlite3.connect(**kwargs),
+            max_size=pool_size,
+            acquire_timeout=acquire_timeout,
+            max_waiting=max_waiting,
+            prewarm=prewarm,
+            reset=lambda conn: conn.rollback())
+    def get_adapter(self) -> DBAdapter: return self.__db.get_adapter()
+    def get_connection(self) -> DBConnection:
+        return SQLiteConnection(self.__db, self.__pool.acquire(), self.__pool)
+    def get_stats(self) -> PoolStats:
+        return self.__pool.get_stats()
+    def close(self):
+        self.__pool.close()
+    """ End class SQLiteConnectionPool """
+class SQLite(DB):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.__pool = SQLiteConnectionPool(self, **kwargs)
+        self.__adapter = SQLiteAdapter()
+        # Declared types of the columns by table, cleared when a cursor executes a CREATE, ALTER or DROP.
+        self.__declared_types: dict = {}
+    def get_adapter(self) -> DBAdapter: return self.__adapter
+    def get_declared_types(self, conn: sqlite3.Connection, table: str) -> dict:
+        """
+        Returns the declared type of the columns of a table by lower case name, as a tuple
+        (type, scale). Columns without declared type and decimals without scale are excluded.
+        """
+        declared = self.__declared_types.get(table)
+        if declared is None:
+            declared = {}
+            for row in conn.execute('PRAGMA table_info("' + table + '")'):
+                name, db_type = row[1].lower(), row[2]
+                if not db_type: continue
+                type, match = self.__adapter.get_lib_type(db_type), _SCALE_PATTERN.search(db_type)
+                if type == Types.DECIMAL and not match: continue
+                declared[name] = (type, int(match.group(1)) if type == Types.DECIMAL else None)
+            self.__declared_types[table] = declared
+        return declared
+    def clear_declared_types(self):
+        self.__declared_types = {}
+    def get_connection(self) -> DBConnection: return self.__pool.get_connection()
+    def close(self): self.__pool.close()
@@ -14,10 +14,10 @@
 import decimal
 from decimal import Decimal, ROUND_HALF_UP
 from enum import Enum
-from typing import Tuple, List, Any
+from typing import Tuple, List, Any, Callable, NamedTuple, Optional
 
 from msfx.lib import round_num
-from msfx.lib.db import Types, Value, get_default_value, get_value
+from msfx.lib.db import Types, Value, get_default_value, get_value, get_converter
 from msfx.lib.props import Properties
 
 class ColumnProps(Enum):
@@ -42,6 +42,7 @@ class ColumnListProps(Enum):
     INDEXES = "INDEXES"
     PK_COLUMNS = "PK_COLUMNS"
     DEFAULT_VALUES = "DEFAULT_VALUES"
+    FROZEN = "FROZEN"
 class OrderProps(Enum):
     SEGMENTS = "SEGMENTS"
 class IndexProps(Enum):
@@ -69,11 +70,23 @@ class TableProps(Enum):
     INDEXES = "INDEXES"
     FOREIGN_KEYS = "FOREIGN_KEYS"
     PROPERTIES = "PROPERTIES"
-
+    VERSION = "VERSION"
+
+class ColumnCore(NamedTuple):
+    """ Core attributes of a column, cached to avoid properties round-trips on reads. """
+    name: str
+    alias: str
+    type: Types
+    length: int
+    scale: int
+    primary_key: bool
+    nullable: bool
+    uppercase: bool
 class Column:
     """ Column metadata. """
 
     def __init__(self, **kvargs):
+        self.__core: Optional[ColumnCore] = None
         self.__props = Properties()
         self.__props.set_props(ColumnProps.PROPERTIES, Properties())
         if "name" in kvargs: self.set_name(kvargs["name"])
@@ -92,23 +105,40 @@ class Column:
         col.__props = self.__props.copy()
         return col
 
+    def __setup_core__(self) -> ColumnCore:
+        name = self.__props.get_string(ColumnProps.NAME)
+        self.__core = ColumnCore(
+            name=name,
+            alias=self.__props.get_string(ColumnProps.ALIAS, name),
+            type=self.__props.get_any(ColumnProps.TYPE, Types.STRING),
+            length=self.__props.get_integer(ColumnProps.LENGTH, -1),
+            scale=self.__props.get_integer(ColumnProps.SCALE, -1),
+            primary_key=self.__props.get_bool(ColumnProps.PRIMARY_KEY, False),
+            nullable=self.__props.get_bool(ColumnProps.NULLABLE, True),
+            uppercase=self.__props.get_bool(ColumnProps.UPPERCASE, False))
+        return self.__core
+
+    @property
+    def core(self) -> ColumnCore:
+        return self.__core or self.__setup_core__()
+
     def get_name(self) -> str:
-        return self.__props.get_string(ColumnProps.NAME)
+        return (self.__core or self.__setup_core__()).name
     def get_alias(self) -> str:
-        return self.__props.get_string(ColumnProps.ALIAS, self.get_name())
+        return (self.__core or self.__setup_core__()).alias
     def get_type(self) -> Types:
-        return self.__props.get_any(ColumnProps.TYPE, Types.STRING)
+        return (self.__core or self.__setup_core__()).type
     def get_length(self) -> int:
-        return self.__props.get_integer(ColumnProps.LENGTH, -1)
+        return (self.__core or self.__setup_core__()).length
     def get_scale(self) -> int:
-        return self.__props.get_integer(ColumnProps.SCALE, -1)
+        return (self.__core or self.__setup_core__()).scale
 
     def is_primary_key(self) -> bool:
-        return self.__props.get_bool(ColumnProps.PRIMARY_KEY, False)
+        return (self.__core or self.__setup_core__()).primary_key
     def is_nullable(self) -> bool:
-        return self.__props.get_bool(ColumnProps.NULLABLE, True)
+        return (self.__core or self.__setup_core__()).nullable
     def is_uppercase(self) -> bool:
-        return self.__props.get_bool(ColumnProps.UPPERCASE, False)
+        return (self.__core or self.__setup_core__()).uppercase
 
     def get_header(self) -> str:
         return self.__props.get_string(ColumnProps.HEADER)
@@ -133,21 +163,29 @@ class Column:
 
     def set_name(self, name: str):
         self.__props.set_string(ColumnProps.NAME, name)
+        self.__core = None
     def set_alias(self, alias: str):
         self.__props.set_string(ColumnProps.ALIAS, alias)
+        self.__core = None
     def set_type(self, type: Types):
         self.__props.set_any(ColumnProps.TYPE, type)
+        self.__core = None
     def set_length(self, length: int):
         self.__props.set_integer(ColumnProps.LENGTH, length)
+        self.__core = None
     def set_scale(self, scale: int):
         self.__props.set_integer(ColumnProps.SCALE, scale)
+        self.__core = None
 
     def set_primary_key(self, primary_key: bool):
         self.__props.set_bool(ColumnProps.PRIMARY_KEY, primary_key)
+        self.__core = None
     def set_nullable(self, nullable: bool):
         self.__props.set_bool(ColumnProps.NULLABLE, nullable)
+        self.__core = None
     def set_uppercase(self, uppercase: bool):
         self.__props.set_bool(ColumnProps.UPPERCASE, uppercase)
+        self.__core = None
 
     def set_header(self, header: str):
         self.__props.set_string(ColumnProps.HEADER, header)
@@ -227,15 +265,25 @@ class ColumnList:
         return list(self.__pk_columns)
     @property
     def default_values(self) -> list:
-        return list(self.__default_values)
+        # Default values are kept for a prefix of the columns and completed on demand.
+        default_values = self.__default_values
+        columns = self.__columns
+        for i in range(len(default_values), len(columns)):
+            default_values.append(columns[i].get_default_value())
+        return list(default_values)
 
     def append(self, column: Column):
         if self.__read_only:
             raise PermissionError("Read-only status")
         if not isinstance(column, Column):
             raise TypeError("Arg column must be of type Column")
+        alias = column.get_alias()
+        self.__indexes[alias] = len(self.__columns)
         self.__columns.append(column)
-        self.__setup__()
+        self.__aliases.append(alias)
+        if column.is_primary_key():
+            self.__pk_columns.append(column)
+        self.__props.set_any(ColumnListProps.FROZEN, None)
     def remove(self, key: (int, str)):
         if self.__read_only:
             raise PermissionError("Read-only status")
@@ -247,13 +295,17 @@ class ColumnList:
         if isinstance(key, str):
             index = self.index_of(key)
         if 0 <= index < len(self.__columns):
-            del self.__columns[index]
-            self.__setup__()
+            self.__remove__(index)
+            self.__props.set_any(ColumnListProps.FROZEN, None)
     def clear(self):
         if self.__read_only:
             raise PermissionError("Read-only status")
         self.__columns.clear()
-        self.__setup__()
+        self.__aliases.clear()
+        self.__indexes.clear()
+        self.__pk_columns.clear()
+        self.__default_values.clear()
+        self.__props.set_any(ColumnListProps.FROZEN, None)
 
     def index_of(self, alias: str) -> int:
         if not isinstance(alias, str):
@@ -274,19 +326,51 @@ class ColumnList:
             raise ValueError("Index out of range")
         return self.__columns[index]
 
-    def __setup__(self):
-        self.__aliases.clear()
-        self.__indexes.clear()
-        self.__pk_columns.clear()
-        self.__default_values.clear()
-
-        for i in range(len(self.__columns)):
-            column: Column = self.__columns[i]
-            self.__aliases.append(column.get_alias())
-            self.__indexes[column.get_alias()] = i
-            if column.is_primary_key():
-                self.__pk_columns.append(column)
-            self.__default_values.append(column.get_default_value())
+    def __remove__(self, index: int):
+        # Only the indexes of the columns after the removed one are shifted.
+        columns = self.__columns
+        aliases = self.__aliases
+        indexes = self.__indexes
+        column: Column = columns.pop(index)
+        alias = aliases.pop(index)
+        if indexes.get(alias) == index:
+            del indexes[alias]
+        for i in range(index, len(aliases)):
+            indexes[aliases[i]] = i
+        if alias not in indexes:
+            # A duplicate alias before the removed column resolves to the last one.
+            for i in range(index - 1, -1, -1):
+                if aliases[i] == alias:
+                    indexes[alias] = i
+                    break
+        if column.is_primary_key():
+            pk_columns = self.__pk_columns
+            for i in range(len(pk_columns)):
+                if pk_columns[i] is column:
+                    del pk_columns[i]
+                    break
+        if index < len(self.__default_values):
+            del self.__default_values[index]
+
+    def freeze(self):
+        """
+        Returns an immutable snapshot of this column list, with the aliases, indexes,
+        types, scales and default values precomputed, aimed to scan loops.
+        :return: The FrozenColumnList snapshot.
+        """
+        return FrozenColumnList(self)
+    def get_frozen(self):
+        """
+        Returns the frozen snapshot of this column list, the same instance, shared by the
+        read-only views of the list, until columns are appended or removed. Columns are not
+        expected to change once in the list.
+        :return: The FrozenColumnList snapshot.
+        """
+        frozen = self.__props.get_any(ColumnListProps.FROZEN)
+        if frozen is None:
+            frozen = FrozenColumnList(self)
+            self.__props.set_any(ColumnListProps.FROZEN, frozen)
+        return frozen
 
     def __iter__(self):
         return self.__columns.__iter__()
@@ -294,6 +378,80 @@ class ColumnList:
         return len(self.__columns)
     def __getitem__(self, index: int) -> Column: return self.__columns[index]
     """ End of class ColumnList """
+class FrozenColumnList(ColumnList):
+    """
+    Immutable snapshot of a column list. Fields are plain tuples and a dictionary
+    alias to index, so that alias resolution is a single dictionary lookup.
+    """
+    def __init__(self, columns: ColumnList):
+        if not isinstance(columns, ColumnList):
+            raise TypeError("Arg columns must be of type ColumnList")
+        self.__columns: Tuple[Column, ...] = tuple(columns)
+        self.__names: Tuple[str, ...] = tuple(column.get_name() for column in self.__columns)
+        self.__aliases: Tuple[str, ...] = tuple(column.get_alias() for column in self.__columns)
+        self.__indexes: dict = {alias: index for index, alias in enumerate(self.__aliases)}
+        self.__types: Tuple[Types, ...] = tuple(column.get_type() for column in self.__columns)
+        self.__scales: Tuple[int, ...] = tuple(column.get_scale() for column in self.__columns)
+        self.__pk_columns: Tuple[Column, ...] = tuple(c for c in self.__columns if c.is_primary_key())
+        self.__default_values: Tuple[Value, ...] = tuple(c.get_default_value() for c in self.__columns)
+
+    @property
+    def columns(self): return self
+    @property
+    def names(self) -> Tuple[str, ...]: return self.__names
+    @property
+    def aliases(self) -> Tuple[str, ...]: return self.__aliases
+    @property
+    def types(self) -> Tuple[Types, ...]: return self.__types
+    @property
+    def scales(self) -> Tuple[int, ...]: return self.__scales
+    @property
+    def pk_columns(self) -> Tuple[Column, ...]: return self.__pk_columns
+    @property
+    def default_values(self) -> Tuple[Value, ...]: return self.__default_values
+
+    def append(self, column: Column):
+        raise PermissionError("Read-only status")
+    def remove(self, key: (int, str)):
+        raise PermissionError("Read-only status")
+    def clear(self):
+        raise PermissionError("Read-only status")
+    def freeze(self):
+        return self
+    def get_frozen(self):
+        return self
+
+    def index_of(self, alias: str) -> int:
+        return self.__indexes.get(alias, -1)
+    def get_by_alias(self, alias: str) -> Column:
+        index = self.__indexes.get(alias, -1)
+        if index < 0:
+            raise ValueError(f"Invalid alias {alias}")
+        return self.__columns[index]
+    def get_by_index(self, index: int) -> Column:
+        if index is None or not isinstance(index, int):
+            raise TypeError("Arg index must be of type int")
+        if index < 0 or index >= len(self.__columns):
+            raise ValueError("Index out of range")
+        return self.__columns[index]
+
+    def __iter__(self):
+        return self.__columns.__iter__()
+    def __len__(self) -> int:
+        return len(self.__columns)
+    def __getitem__(self, index: int) -> Column: return self.__columns[index]
+    """ End of class FrozenColumnList """
+
+def get_converters(columns: ColumnList) -> Tuple[Callable[[Any], Value], ...]:
+    """
+    Returns the tuple of converters, one per column, that convert the raw values
+    read from a cursor into values of the column type and scale.
+    :param columns: The column list.
+    :return: The tuple of converters.
+    """
+    if isinstance(columns, FrozenColumnList):
+        return tuple(get_converter(type, scale) for type, scale in zip(columns.types, columns.scales))
+    return tuple(get_converter(column.get_type(), column.get_scale()) for column in columns)
 class Order:
     """ An order definition. """
     def __init__(self):
@@ -462,13 +620,25 @@ class Table:
 
     def get_props(self) -> Properties:
         return self.__props.get_props(TableProps.PROPERTIES)
+    def get_version(self) -> object:
+        """
+        Returns an object that identifies the current definition of the table, replaced when the
+        name, schema, columns or primary key change, i.e. to key the statements rendered on it.
+        """
+        version = self.__props.get_any(TableProps.VERSION)
+        if version is None:
+            version = object()
+            self.__props.set_any(TableProps.VERSION, version)
+        return version
 
     def set_name(self, name: str):
         self.__props.set_string(TableProps.NAME, name)
+        self.__props.set_any(TableProps.VERSION, None)
     def set_alias(self, alias: str):
         self.__props.set_string(TableProps.ALIAS, alias)
     def set_schema(self, schema: str):
         self.__props.set_string(TableProps.SCHEMA, schema)
+        self.__props.set_any(TableProps.VERSION, None)
     def set_description(self, description: str):
         self.__props.set_string(TableProps.DESCRIPTION, description)
     def set_persistent(self, persistent: bool):
@@ -476,11 +646,13 @@ class Table:
     def set_primary_key(self, primary_key: Index):
         primary_key.set_table_props(self.__props)
         self.__props.set_any(TableProps.PRIMARY_KEY, primary_key)
+        self.__props.set_any(TableProps.VERSION, None)
 
     def append_column(self, column: Column):
         column.set_table_name(self.get_name())
-        column.set_alias(self.get_alias())
+        column.set_table_alias(self.get_alias())
         self.__columns.append(column)
+        self.__props.set_any(TableProps.VERSION, None)
     def append_index(self, index: Index):
         index.set_table_props(self.__props)
         self.__indexes.append(index)
@@ -12,7 +12,7 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Callable, Any
 
 from msfx.lib.db import Value
 from msfx.lib.db.md import ColumnList, Column
@@ -45,3 +45,45 @@ class Record:
 
     def __str__(self) -> str: return str(self.__values)
     def __repr__(self): return self.__str__()
+
+class LazyRecord(Record):
+    """
+    A record backed by the raw row read from the cursor. Each cell is converted
+    to a value only on first access, and memoized.
+    """
+    def __init__(self, columns: ColumnList, row: tuple, converters: Tuple[Callable[[Any], Value], ...]):
+        if not isinstance(columns, ColumnList): raise TypeError("Invalid columns")
+        if not isinstance(row, tuple): raise TypeError("Invalid row")
+        if len(columns) != len(row): raise ValueError("Invalid columns/row")
+        if len(converters) != len(row): raise ValueError("Invalid converters/row")
+        self.__columns: ColumnList = columns
+        self.__row: tuple = row
+        self.__converters: Tuple[Callable[[Any], Value], ...] = converters
+        self.__values: list = [None] * len(row)
+
+    @property
+    def columns(self) -> ColumnList: return self.__columns
+    @property
+    def values(self) -> Tuple[Value, ...]:
+        return tuple(self.get_value_by_index(i) for i in range(len(self.__row)))
+    @property
+    def row(self) -> tuple: return self.__row
+
+    def size(self): return len(self.__row)
+
+    def get_column_by_alias(self, alias: str) -> Column:
+        return self.__columns.get_by_alias(alias)
+    def get_column_by_index(self, index: int) -> Column:
+        return self.__columns.get_by_index(index)
+
+    def get_value_by_alias(self, alias: str) -> Value:
+        index = self.__columns.index_of(alias)
+        return self.get_value_by_index(index)
+    def get_value_by_index(self, index: int) -> Value:
+        value = self.__values[index]
+        if value is None:
+            value = self.__converters[index](self.__row[index])
+            self.__values[index] = value
+        return value
+
+    def __str__(self) -> str: return str(self.values)
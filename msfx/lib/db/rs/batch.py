@@ -0,0 +1,107 @@
+#  Copyright (c) 2025 Miquel Sas.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+""" Column oriented batches of rows, aimed to scan large result sets. """
+
+from typing import Tuple, Sequence
+
+import numpy as np
+
+from msfx.lib.db import Types, get_value
+from msfx.lib.db.md import Column, ColumnList
+
+class ColumnBatch:
+    """
+    A batch of rows stored by column. INTEGER, FLOAT and DATETIME columns are
+    NumPy arrays of int64, float64 and datetime64[us], the rest of types are
+    object arrays of the converted raw values. Nulls are NaN and NaT in FLOAT
+    and DATETIME arrays, and masked in INTEGER arrays, that are masked arrays
+    when the batch has nulls.
+    """
+    def __init__(self, columns: ColumnList, arrays: Tuple[np.ndarray, ...]):
+        if not isinstance(columns, ColumnList): raise TypeError("Invalid columns")
+        if not isinstance(arrays, tuple): raise TypeError("Invalid arrays")
+        if len(columns) != len(arrays): raise ValueError("Invalid columns/arrays")
+        self.__columns: ColumnList = columns
+        self.__arrays: Tuple[np.ndarray, ...] = arrays
+
+    @property
+    def columns(self) -> ColumnList: return self.__columns
+    @property
+    def arrays(self) -> Tuple[np.ndarray, ...]: return self.__arrays
+
+    def size(self) -> int:
+        return 0 if len(self.__arrays) == 0 else len(self.__arrays[0])
+
+    def get_column_by_alias(self, alias: str) -> Column:
+        return self.__columns.get_by_alias(alias)
+    def get_column_by_index(self, index: int) -> Column:
+        return self.__columns.get_by_index(index)
+
+    def get_array_by_alias(self, alias: str) -> np.ndarray:
+        index = self.__columns.index_of(alias)
+        if index < 0: raise ValueError(f"Invalid alias {alias}")
+        return self.__arrays[index]
+    def get_array_by_index(self, index: int) -> np.ndarray:
+        return self.__arrays[index]
+
+    def __len__(self) -> int: return self.size()
+    def __str__(self) -> str: return str(self.__arrays)
+    def __repr__(self): return self.__str__()
+    """ End of class ColumnBatch """
+
+def get_array(type: Types, scale: int, raw_values: Sequence) -> np.ndarray:
+    """
+    Returns a NumPy array with the raw values of a column, converted to the column type.
+    Nulls are NaN for FLOAT and NaT for DATETIME, INTEGER arrays with nulls are masked
+    arrays where nulls are masked, and the rest of types take the default value of the type.
+    :param type: The column type.
+    :param scale: The column scale, used for decimals.
+    :param raw_values: The raw values as read from the cursor.
+    :return: The array.
+    """
+    if type == Types.INTEGER:
+        if None in raw_values:
+            mask = [v is None for v in raw_values]
+            return np.ma.masked_array([0 if v is None else v for v in raw_values], mask=mask, dtype=np.int64)
+        return np.array(raw_values, dtype=np.int64)
+    if type == Types.FLOAT:
+        # None converts to NaN.
+        return np.array(raw_values, dtype=np.float64)
+    if type == Types.DATETIME:
+        try:
+            return np.array(raw_values, dtype="datetime64[us]")
+        except (TypeError, ValueError):
+            # Mixed raw values (i.e. time in millis), convert cell by cell.
+            values = [None if v is None else get_value(type, scale, v).value() for v in raw_values]
+            return np.array(values, dtype="datetime64[us]")
+    values = (get_value(type, scale, v).value() for v in raw_values)
+    return np.fromiter(values, dtype=object, count=len(raw_values))
+
+def get_batch(columns: ColumnList, rows: Sequence[tuple]) -> ColumnBatch:
+    """
+    Returns a column batch with the rows read from a cursor.
+    :param columns: The column list that defines the types of the row values.
+    :param rows: The list of rows (tuples of raw values).
+    :return: The column batch.
+    """
+    if len(rows) == 0:
+        raw_columns = [() for _ in range(len(columns))]
+    else:
+        raw_columns = list(zip(*rows))
+    arrays = []
+    for i in range(len(columns)):
+        column: Column = columns[i]
+        arrays.append(get_array(column.get_type(), column.get_scale(), raw_columns[i]))
+    return ColumnBatch(columns, tuple(arrays))
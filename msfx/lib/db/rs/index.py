@@ -0,0 +1,165 @@
+#  Copyright (c) 2025 Miquel Sas.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+In-memory index of records, the runtime counterpart of an Index definition. Records are kept
+sorted by the native sort key of the index segments, searched by bisection, and unique
+indexes also map the key to the record.
+"""
+from bisect import bisect_left, bisect_right
+from typing import Optional, Iterable, Iterator, List, Sequence, Union
+
+from msfx.lib.db import Key, get_sort_key
+from msfx.lib.db.md import ColumnList, Index
+from msfx.lib.db.rs import Record
+
+class _Max:
+    """ Item greater than any other, to bound the keys that start with a prefix. """
+    def __lt__(self, other) -> bool: return False
+    def __gt__(self, other) -> bool: return True
+    """ End class _Max """
+_MAX = _Max()
+
+class RecordIndex:
+    """
+    Sorted index of records on the segments of an Index. Keys can be passed as a Key or a
+    sequence of values, raw or Value, one per segment or a prefix of the segments for range
+    queries, and ranges follow the order of the index, descending segments included. The keys
+    are taken when the records are indexed, build the index again after changing their values.
+    """
+    def __init__(self,
+                 index: Index,
+                 columns: ColumnList,
+                 records: Optional[Iterable[Record]] = None):
+        """
+        :param index: The index definition.
+        :param columns: The columns of the records, that include the columns of the index.
+        :param records: Optional records to build the index in bulk.
+        """
+        if not isinstance(index, Index): raise TypeError("Invalid index")
+        if not isinstance(columns, ColumnList): raise TypeError("Invalid columns")
+        if len(index) == 0: raise ValueError("Index has no segments")
+        segments = []
+        for column, asc in index:
+            position = columns.index_of(column.get_alias())
+            if position < 0: raise ValueError(f"Index column {column.get_alias()} not in columns")
+            segments.append((position, asc))
+        self.__segments: tuple = tuple(segments)
+        self.__ascending: tuple = tuple(asc for _, asc in segments)
+        self.__unique: bool = index.is_unique()
+        self.__keys: list = []
+        self.__records: List[Record] = []
+        self.__map: Optional[dict] = {} if self.__unique else None
+        if records is not None: self.build(records)
+
+    def is_unique(self) -> bool:
+        return self.__unique
+
+    def get_key(self, record: Record) -> tuple:
+        """ Returns the sort key of a record. """
+        values = record.values
+        return get_sort_key([(values[position], asc) for position, asc in self.__segments])
+
+    def __get_search_key__(self, key: Union[Key, Sequence]) -> tuple:
+        if len(key) > len(self.__segments):
+            raise ValueError(f"Key has {len(key)} segments, the index {len(self.__segments)}")
+        return get_sort_key(zip(key, self.__ascending))
+
+    def build(self, records: Iterable[Record]):
+        """
+        Build the index in bulk with the records, replacing the current ones. Records with
+        equal keys keep their order.
+        :param records: The records.
+        """
+        records = list(records)
+        keys = [self.get_key(record) for record in records]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        keys = [keys[i] for i in order]
+        records = [records[i] for i in order]
+        if self.__unique:
+            for i in range(1, len(keys)):
+                if keys[i] == keys[i - 1]: raise ValueError(f"Duplicate key {records[i]}")
+            self.__map = dict(zip(keys, records))
+        self.__keys = keys
+        self.__records = records
+
+    def insert(self, record: Record):
+        """
+        Insert a record after the records with an equal key.
+        :param record: The record.
+        """
+        key = self.get_key(record)
+        if self.__unique:
+            if key in self.__map: raise ValueError(f"Duplicate key {record}")
+            self.__map[key] = record
+        keys = self.__keys
+        if not keys or keys[-1] <= key:
+            # Appends in index order, the usual case of bars loaded in time order.
+            keys.append(key)
+            self.__records.append(record)
+        else:
+            position = bisect_right(keys, key)
+            keys.insert(position, key)
+            self.__records.insert(position, record)
+
+    def get(self, key: Union[Key, Sequence]) -> Optional[Record]:
+        """
+        Returns the first record with the key, or None.
+        :param key: The key, with a value per segment.
+        :return: The record or None.
+        """
+        search_key = self.__get_search_key__(key)
+        if self.__unique and len(key) == len(self.__segments):
+            return self.__map.get(search_key)
+        position = bisect_left(self.__keys, search_key)
+        if position < len(self.__keys) and self.__keys[position][:len(search_key)] == search_key:
+            return self.__records[position]
+        return None
+
+    def get_all(self, key: Union[Key, Sequence]) -> List[Record]:
+        """ Returns the records with the key or that start with the key prefix. """
+        return self.get_range(key, key, True)
+
+    def index_of(self, key: Union[Key, Sequence], side: str = "left") -> int:
+        """
+        Returns the position where the key would be inserted, before the records with an equal
+        key or prefix if the side is left, after them if right.
+        """
+        search_key = self.__get_search_key__(key)
+        if side == "left": return bisect_left(self.__keys, search_key)
+        if side == "right": return bisect_right(self.__keys, search_key + (_MAX,))
+        raise ValueError(f"Invalid side {side}")
+
+    def get_range(self,
+                  start: Optional[Union[Key, Sequence]] = None,
+                  end: Optional[Union[Key, Sequence]] = None,
+                  include_end: bool = False) -> List[Record]:
+        """
+        Returns the records from the start key to the end key in the order of the index.
+        :param start: The start key or prefix, included, None from the first record.
+        :param end: The end key or prefix, None to the last record.
+        :param include_end: If True the records with the end key or prefix are included.
+        :return: The list of records.
+        """
+        first = 0 if start is None else self.index_of(start, "left")
+        last = len(self.__keys) if end is None else self.index_of(end, "right" if include_end else "left")
+        return self.__records[first:max(first, last)]
+
+    def __iter__(self) -> Iterator[Record]:
+        return self.__records.__iter__()
+    def __len__(self) -> int:
+        return len(self.__records)
+    def __getitem__(self, index: int) -> Record:
+        return self.__records[index]
+    """ End class RecordIndex """
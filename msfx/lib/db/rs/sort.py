@@ -0,0 +1,330 @@
+#  Copyright (c) 2025 Miquel Sas.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+External merge sort of records. Records are buffered up to a memory budget, sorted by the
+memcmp-able encoding of their order key and spilled to temporary files as runs. Runs are
+merged with a heap, in several passes if there are more runs than buffers fit in the budget,
+and the output is streamed. Each entry of a run is the length of the key and of the row,
+the key, and the row encoded by the column types: a null bitmap, the fixed width values
+packed, and the lengths and bytes of the variable width ones.
+"""
+import heapq
+import os
+import pickle
+import struct
+import tempfile
+import weakref
+from datetime import date
+from decimal import Decimal
+from operator import itemgetter
+from typing import Optional, Union, Iterable, Iterator, List
+
+from msfx.lib.db import Types, get_sort_bytes, get_micros, get_datetime_from_micros, get_time_micros, get_time_from_micros
+from msfx.lib.db.cn import AdaptiveFetch
+from msfx.lib.db.md import ColumnList, Index, Order, get_converters
+from msfx.lib.db.rs import Record
+
+# Size of the buffer of a run read in the merge.
+BUFFER_SIZE = 64 * 1024
+# Maximum number of runs merged at once, each an open file.
+MAX_FAN_IN = 64
+
+_ENTRY = struct.Struct("<II")
+
+def _get_fan_in(max_bytes: int) -> int:
+    """ Returns the number of runs merged at once, bounded by the budget and the open files limit. """
+    fan_in = min(max_bytes // BUFFER_SIZE, MAX_FAN_IN)
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft != resource.RLIM_INFINITY:
+            # Leave room for the files open by the rest of the process.
+            fan_in = min(fan_in, soft // 4)
+    except (ImportError, ValueError, OSError):
+        pass
+    return max(fan_in, 2)
+def _remove_files(paths: set):
+    for path in list(paths):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        paths.discard(path)
+
+# Fixed width types: struct format, encoder to the packed items, decoder from them.
+_FIXED_CODECS = {
+    Types.BOOLEAN: ("?", lambda value: (value,), lambda items: items[0]),
+    Types.INTEGER: ("q", lambda value: (value,), lambda items: items[0]),
+    Types.FLOAT: ("d", lambda value: (value,), lambda items: items[0]),
+    Types.COMPLEX: ("dd", lambda value: (value.real, value.imag), lambda items: complex(*items)),
+    Types.DATE: ("i", lambda value: (value.toordinal(),), lambda items: date.fromordinal(items[0])),
+    Types.TIME: ("q", lambda value: (get_time_micros(value),), lambda items: get_time_from_micros(items[0])),
+    Types.DATETIME: ("q", lambda value: (get_micros(value),), lambda items: get_datetime_from_micros(items[0])),
+}
+# Variable width types: encoder to bytes, decoder from bytes.
+_VARIABLE_CODECS = {
+    Types.DECIMAL: (lambda value: str(value).encode("ascii"), lambda data: Decimal(data.decode("ascii"))),
+    Types.BINARY: (bytes, bytes),
+    Types.STRING: (lambda value: value.encode("utf-8"), lambda data: data.decode("utf-8")),
+    Types.LIST: (pickle.dumps, pickle.loads),
+    Types.DICT: (pickle.dumps, pickle.loads),
+}
+
+class RowCodec:
+    """
+    Binary encoding of the raw rows of a column list. Integers must fit in 64 bits and
+    date-times are stored as naive UTC microseconds.
+    """
+    def __init__(self, columns: ColumnList):
+        columns = columns.freeze()
+        fixed, variable = [], []
+        fixed_format = ""
+        for position, type in enumerate(columns.types):
+            if type in _FIXED_CODECS:
+                code, encode, decode = _FIXED_CODECS[type]
+                fixed.append((position, len(code), encode, decode))
+                fixed_format += code
+            elif type in _VARIABLE_CODECS:
+                variable.append((position,) + _VARIABLE_CODECS[type])
+            else:
+                raise TypeError(f"Not supported type {type}")
+        self.__size: int = len(columns)
+        self.__bitmap_size: int = (len(columns) + 7) // 8
+        self.__fixed: tuple = tuple(fixed)
+        self.__variable: tuple = tuple(variable)
+        self.__struct = struct.Struct("<" + fixed_format + "I" * len(variable))
+        self.__nulls: tuple = tuple([0] * width for _, width, _, _ in fixed)
+
+    def encode(self, row: tuple) -> bytes:
+        """ Returns the encoding of a row of raw values. """
+        bitmap = 0
+        items = []
+        for (position, _, encode, _), nulls in zip(self.__fixed, self.__nulls):
+            value = row[position]
+            if value is None:
+                bitmap |= 1 << position
+                items += nulls
+            else:
+                items += encode(value)
+        payloads = []
+        for position, encode, _ in self.__variable:
+            value = row[position]
+            if value is None:
+                bitmap |= 1 << position
+                payload = b""
+            else:
+                payload = encode(value)
+            items.append(len(payload))
+            payloads.append(payload)
+        return b"".join([bitmap.to_bytes(self.__bitmap_size, "little"), self.__struct.pack(*items)] + payloads)
+
+    def decode(self, data: bytes) -> tuple:
+        """ Returns the row of raw values of an encoding. """
+        bitmap = int.from_bytes(data[:self.__bitmap_size], "little")
+        items = self.__struct.unpack_from(data, self.__bitmap_size)
+        row = [None] * self.__size
+        index = 0
+        for position, width, _, decode in self.__fixed:
+            if not bitmap & (1 << position):
+                row[position] = decode(items[index:index + width])
+            index += width
+        offset = self.__bitmap_size + self.__struct.size
+        for position, _, decode in self.__variable:
+            length = items[index]
+            index += 1
+            if not bitmap & (1 << position):
+                row[position] = decode(data[offset:offset + length])
+            offset += length
+        return tuple(row)
+    """ End class RowCodec """
+class ExternalSorter:
+    """
+    Sorter of records by the segments of an Order or Index, that spills sorted runs to
+    temporary files when the buffered records exceed the memory budget. Records with equal
+    keys keep their order. Add the records, then iterate sort() once. The run files are
+    removed when the iteration ends, on close, as a context manager, or when the sorter is
+    garbage collected.
+    """
+    def __init__(self,
+                 order: Union[Order, Index],
+                 columns: ColumnList,
+                 max_bytes: int = 64 * 1024 * 1024,
+                 temp_dir: Optional[str] = None):
+        """
+        :param order: The Order or Index that defines the order.
+        :param columns: The columns of the records, that include the columns of the order.
+        :param max_bytes: The estimated memory budget of the buffered records and the merge buffers.
+        :param temp_dir: The directory of the run files, by default the system temporary directory.
+        """
+        if not isinstance(order, (Order, Index)): raise TypeError("Order must be an Index or an Order")
+        if not isinstance(columns, ColumnList): raise TypeError("Invalid columns")
+        if len(order) == 0: raise ValueError("Order has no segments")
+        if not isinstance(max_bytes, int) or max_bytes < 2 * BUFFER_SIZE:
+            raise ValueError(f"Max bytes {max_bytes} must be an integer of at least {2 * BUFFER_SIZE}")
+        columns = columns.freeze()
+        segments = []
+        for column, asc in order:
+            position = columns.index_of(column.get_alias())
+            if position < 0: raise ValueError(f"Order column {column.get_alias()} not in columns")
+            segments.append((position, asc))
+        self.__columns: ColumnList = columns
+        self.__segments: tuple = tuple(segments)
+        self.__codec = RowCodec(columns)
+        self.__converters = get_converters(columns)
+        self.__max_bytes: int = max_bytes
+        self.__temp_dir: Optional[str] = temp_dir
+        self.__buffer: list = []
+        self.__bytes: int = 0
+        self.__runs: List[str] = []
+        self.__files: set = set()
+        weakref.finalize(self, _remove_files, self.__files)
+        self.__spilled: int = 0
+        self.__merge_passes: int = 0
+
+    @property
+    def runs(self) -> int:
+        """ The number of runs spilled. """
+        return self.__spilled
+    @property
+    def merge_passes(self) -> int:
+        """ The number of intermediate merge passes. """
+        return self.__merge_passes
+
+    def add(self, record: Record):
+        """ Add a record, spilling a run if the buffer exceeds the memory budget. """
+        row = tuple([value.value() for value in record.values])
+        key = get_sort_bytes([(row[position], asc) for position, asc in self.__segments])
+        self.__buffer.append((key, row))
+        # The row, the key and the entry tuple.
+        self.__bytes += AdaptiveFetch.get_row_bytes(row) + len(key) + 72
+        if self.__bytes > self.__max_bytes:
+            self.__spill__()
+    def add_all(self, records: Iterable[Record]):
+        for record in records:
+            self.add(record)
+
+    def __spill__(self):
+        self.__buffer.sort(key=itemgetter(0))
+        encode = self.__codec.encode
+        self.__runs.append(self.__write__((key, encode(row)) for key, row in self.__buffer))
+        self.__spilled += 1
+        self.__buffer = []
+        self.__bytes = 0
+
+    def __write__(self, entries: Iterable[tuple]) -> str:
+        descriptor, path = tempfile.mkstemp(prefix="msfx_sort_", suffix=".run", dir=self.__temp_dir)
+        self.__files.add(path)
+        try:
+            with os.fdopen(descriptor, "wb", buffering=BUFFER_SIZE) as file:
+                pack = _ENTRY.pack
+                for key, data in entries:
+                    file.write(pack(len(key), len(data)))
+                    file.write(key)
+                    file.write(data)
+        except BaseException:
+            self.__remove__([path])
+            raise
+        return path
+
+    @staticmethod
+    def __read__(path: str, buffer_size: int) -> Iterator[tuple]:
+        with open(path, "rb", buffering=buffer_size) as file:
+            read = file.read
+            unpack = _ENTRY.unpack
+            size = _ENTRY.size
+            while True:
+                header = read(size)
+                if not header: break
+                key_length, data_length = unpack(header)
+                entry = read(key_length + data_length)
+                yield entry[:key_length], entry[key_length:]
+
+    def __merge__(self, paths: List[str]) -> Iterator[tuple]:
+        buffer_size = max(self.__max_bytes // max(len(paths), 1), BUFFER_SIZE)
+        return heapq.merge(*[self.__read__(path, buffer_size) for path in paths], key=itemgetter(0))
+
+    def sort(self) -> Iterator[Record]:
+        """
+        Generate the records in order. The run files are removed when the iteration ends or
+        the generator is closed.
+        """
+        columns = self.__columns
+        converters = self.__converters
+        try:
+            if not self.__runs:
+                self.__buffer.sort(key=itemgetter(0))
+                buffer, self.__buffer = self.__buffer, []
+                for _, row in buffer:
+                    yield Record(columns, tuple([convert(raw) for convert, raw in zip(converters, row)]))
+                return
+
+            if self.__buffer: self.__spill__()
+            # Merge consecutive groups of runs, keeping their order for stability, until the
+            # buffers of the remaining runs fit in the budget.
+            fan_in = _get_fan_in(self.__max_bytes)
+            while len(self.__runs) > fan_in:
+                runs = []
+                for i in range(0, len(self.__runs), fan_in):
+                    paths = self.__runs[i:i + fan_in]
+                    runs.append(self.__write__(self.__merge__(paths)) if len(paths) > 1 else paths[0])
+                    if len(paths) > 1: self.__remove__(paths)
+                self.__runs = runs
+                self.__merge_passes += 1
+
+            decode = self.__codec.decode
+            for _, data in self.__merge__(self.__runs):
+                row = decode(data)
+                yield Record(columns, tuple([convert(raw) for convert, raw in zip(converters, row)]))
+        finally:
+            self.close()
+
+    def __remove__(self, paths: List[str]):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self.__files.discard(path)
+
+    def close(self):
+        """ Remove the run files, including those of an interrupted merge, and the buffered records. """
+        _remove_files(self.__files)
+        self.__runs = []
+        self.__buffer = []
+        self.__bytes = 0
+
+    def __enter__(self):
+        return self
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    """ End class ExternalSorter """
+
+def external_sort(records: Iterable[Record],
+                  order: Union[Order, Index],
+                  columns: ColumnList,
+                  max_bytes: int = 64 * 1024 * 1024,
+                  temp_dir: Optional[str] = None) -> Iterator[Record]:
+    """
+    Sort records that may not fit in memory.
+    :param records: The records.
+    :param order: The Order or Index that defines the order.
+    :param columns: The columns of the records.
+    :param max_bytes: The estimated memory budget.
+    :param temp_dir: The directory of the run files.
+    :return: The iterator of the records in order.
+    """
+    sorter = ExternalSorter(order, columns, max_bytes, temp_dir)
+    sorter.add_all(records)
+    return sorter.sort()
@@ -12,3 +12,262 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+
+"""
+SQL builder that renders SELECT, INSERT, UPDATE and DELETE statements from the Table, Index
+and Order metadata, with the "?" parameter marker. Rendered statements are kept in an LRU cache
+per kind of statement, keyed by the version of the Table, the adapter, the frozen snapshot of
+the selected columns and the Index and Order instances, so that a repeated statement is a
+dictionary lookup and a change of the table renders it again.
+"""
+from collections import OrderedDict, namedtuple
+from threading import Lock
+from typing import Optional, Tuple, Iterable, Callable
+
+from msfx.lib.db import OrderKey
+from msfx.lib.db.md import Column, ColumnList, Index, Order, Table
+from msfx.lib.db.rs import Record
+
+# Maximum number of statements kept per kind of statement.
+CACHE_SIZE = 1024
+
+def get_names(columns: Iterable[Column]) -> Tuple[str, ...]:
+    """ Returns the tuple of names of the columns. """
+    return tuple([column.get_name() for column in columns])
+
+def get_segment_names(segments) -> Tuple[Tuple[str, bool], ...]:
+    """ Returns the tuple of (name, ascending) of the segments of an Index or an Order. """
+    return tuple([(column.get_name(), asc) for column, asc in segments])
+
+def get_where(table: Table, where: Optional[Index]) -> Index:
+    """ Returns the index of the WHERE clause, the primary key if none is given. """
+    if where is None: where = table.get_primary_key()
+    if not isinstance(where, Index) or len(where) == 0:
+        raise ValueError(f"A WHERE index or a primary key is required on table {table.get_name()}")
+    return where
+
+def get_segments_key(segments) -> tuple:
+    """
+    Returns the part of a statement key for an Index or an Order, the instance and its number
+    of segments, as segments are only appended. A tuple of (column, ascending) is its own key,
+    other sequences are keyed by their names.
+    """
+    if segments is None: return None, 0
+    if isinstance(segments, (Index, Order)): return segments, len(segments)
+    if isinstance(segments, tuple): return segments, 0
+    return get_segment_names(segments), 0
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+class StatementCache:
+    """ LRU cache of the statements of a kind, bounded to CACHE_SIZE, with the hits and misses. """
+    def __init__(self):
+        self.__statements: OrderedDict = OrderedDict()
+        self.__lock = Lock()
+        self.__hits: int = 0
+        self.__misses: int = 0
+
+    def get(self, key: tuple, render: Callable[[], str]) -> str:
+        """ Returns the statement of the key, rendered and kept on a miss. """
+        with self.__lock:
+            statement = self.__statements.get(key)
+            if statement is not None:
+                self.__statements.move_to_end(key)
+                self.__hits += 1
+                return statement
+            self.__misses += 1
+        statement = render()
+        with self.__lock:
+            self.__statements[key] = statement
+            if len(self.__statements) > CACHE_SIZE: self.__statements.popitem(last=False)
+        return statement
+
+    def info(self) -> CacheInfo:
+        with self.__lock:
+            return CacheInfo(self.__hits, self.__misses, CACHE_SIZE, len(self.__statements))
+
+    def clear(self):
+        with self.__lock:
+            self.__statements.clear()
+            self.__hits = 0
+            self.__misses = 0
+    """ End class StatementCache """
+
+_CACHES = {kind: StatementCache() for kind in ("select", "insert", "update", "delete", "keyset")}
+
+def _render_select(table_name: str,
+                   names: Tuple[str, ...],
+                   where: Tuple[Tuple[str, bool], ...],
+                   order: Tuple[Tuple[str, bool], ...],
+                   limit: Optional[int]) -> str:
+    select = "SELECT " + ", ".join(names) + " FROM " + table_name
+    if where:
+        select += " WHERE " + " AND ".join([name + " = ?" for name, _ in where])
+    if order:
+        select += " ORDER BY " + ", ".join([name if asc else name + " DESC" for name, asc in order])
+    if limit is not None:
+        select += " LIMIT " + str(limit)
+    return select
+
+def _render_insert(table_name: str, names: Tuple[str, ...]) -> str:
+    return ("INSERT INTO " + table_name + " (" + ", ".join(names) + ")"
+            " VALUES (" + ", ".join(["?"] * len(names)) + ")")
+
+def _render_update(table_name: str, names: Tuple[str, ...], where: Tuple[Tuple[str, bool], ...]) -> str:
+    return ("UPDATE " + table_name + " SET " + ", ".join([name + " = ?" for name in names]) +
+            " WHERE " + " AND ".join([name + " = ?" for name, _ in where]))
+
+def _render_delete(table_name: str, where: Tuple[Tuple[str, bool], ...]) -> str:
+    delete = "DELETE FROM " + table_name
+    if where:
+        delete += " WHERE " + " AND ".join([name + " = ?" for name, _ in where])
+    return delete
+
+def get_select(adapter,
+               table: Table,
+               columns: Optional[ColumnList] = None,
+               where: Optional[Index] = None,
+               order: Optional[Order] = None,
+               limit: Optional[int] = None) -> str:
+    """
+    Returns the SELECT statement.
+    :param adapter: The DBAdapter of the database.
+    :param table: The table.
+    :param columns: The columns to select, by default all the table columns.
+    :param where: The optional index whose segments are compared by equality with parameters.
+    :param order: The optional order.
+    :param limit: The optional maximum number of rows.
+    :return: The statement.
+    """
+    if limit is not None and (not isinstance(limit, int) or limit <= 0):
+        raise ValueError(f"Limit {limit} is not a positive integer")
+    frozen = None if columns is None else columns.get_frozen()
+    key = (table.get_version(), adapter.__class__, frozen, get_segments_key(where), get_segments_key(order), limit)
+    return _CACHES["select"].get(key, lambda: _render_select(
+        adapter.get_table_name(table),
+        (table.columns if frozen is None else frozen).get_frozen().names,
+        () if where is None else get_segment_names(where),
+        () if order is None else get_segment_names(order),
+        limit))
+
+def get_insert(adapter, table: Table) -> str:
+    """ Returns the INSERT statement of all the table columns. """
+    return _CACHES["insert"].get((table.get_version(), adapter.__class__), lambda: _render_insert(
+        adapter.get_table_name(table), table.columns.get_frozen().names))
+
+def get_update(adapter, table: Table, where: Optional[Index] = None) -> str:
+    """
+    Returns the UPDATE statement that sets all the columns not in the WHERE index.
+    :param adapter: The DBAdapter of the database.
+    :param table: The table.
+    :param where: The index of the WHERE clause, by default the primary key.
+    :return: The statement.
+    """
+    where = get_where(table, where)
+    def render() -> str:
+        where_names = get_segment_names(where)
+        keys = [name for name, _ in where_names]
+        names = tuple([name for name in table.columns.get_frozen().names if name not in keys])
+        return _render_update(adapter.get_table_name(table), names, where_names)
+    return _CACHES["update"].get((table.get_version(), adapter.__class__, get_segments_key(where)), render)
+
+def get_delete(adapter, table: Table, where: Optional[Index] = None) -> str:
+    """
+    Returns the DELETE statement.
+    :param adapter: The DBAdapter of the database.
+    :param table: The table.
+    :param where: The index of the WHERE clause, by default the primary key.
+    :return: The statement.
+    """
+    where = get_where(table, where)
+    key = (table.get_version(), adapter.__class__, get_segments_key(where))
+    return _CACHES["delete"].get(key, lambda: _render_delete(
+        adapter.get_table_name(table), get_segment_names(where)))
+
+def _render_keyset(table_name: str,
+                   names: Tuple[str, ...],
+                   segments: Tuple[Tuple[str, bool], ...],
+                   forward: bool,
+                   seek: bool,
+                   limit: int) -> str:
+    select = "SELECT " + ", ".join(names) + " FROM " + table_name
+    if seek:
+        # Rows strictly after the key in the scan direction, expanded as
+        # c1 > ? OR (c1 = ? AND c2 > ?) OR ..., with a leading bound on the first
+        # segment that lets the database seek on the index.
+        first, first_asc = segments[0]
+        select += " WHERE " + first + (" >= ?" if first_asc == forward else " <= ?") + " AND ("
+        terms = []
+        for i, (name, asc) in enumerate(segments):
+            term = [prev + " = ?" for prev, _ in segments[:i]]
+            term.append(name + (" > ?" if asc == forward else " < ?"))
+            terms.append(" AND ".join(term) if len(term) == 1 else "(" + " AND ".join(term) + ")")
+        select += " OR ".join(terms) + ")"
+    order = [name if asc == forward else name + " DESC" for name, asc in segments]
+    select += " ORDER BY " + ", ".join(order) + " LIMIT " + str(limit)
+    return select
+
+def get_keyset_select(adapter,
+                      table: Table,
+                      columns: ColumnList,
+                      segments,
+                      forward: bool,
+                      seek: bool,
+                      limit: int) -> str:
+    """
+    Returns the SELECT of a keyset page, the rows that follow a key in the order of the segments.
+    :param adapter: The DBAdapter of the database.
+    :param table: The table.
+    :param columns: The columns to select.
+    :param segments: The Index, Order or sequence of (column, ascending) that defines the order.
+    :param forward: If True the rows after the key in the order, if False the rows before the
+    key, in reverse order.
+    :param seek: If False, no key is given and the first (or last) page is selected.
+    :param limit: The page size.
+    :return: The statement, its parameters are returned by get_keyset_params.
+    """
+    frozen = columns.get_frozen()
+    key = (table.get_version(), adapter.__class__, frozen, get_segments_key(segments), forward, seek, limit)
+    return _CACHES["keyset"].get(key, lambda: _render_keyset(
+        adapter.get_table_name(table), frozen.names, get_segment_names(segments), forward, seek, limit))
+
+def get_keyset_params(adapter, key: OrderKey) -> tuple:
+    """ Returns the parameters of the keyset SELECT that seeks after the key. """
+    values = [adapter.to_param(value) for value, _ in key]
+    params = [values[0]]
+    for i in range(len(values)):
+        params.extend(values[:i + 1])
+    return tuple(params)
+
+def get_create_table(adapter, table: Table) -> str:
+    """ Returns the CREATE TABLE IF NOT EXISTS statement, with the columns and the primary key. """
+    create = "CREATE TABLE IF NOT EXISTS " + adapter.get_table_name(table) + " ("
+    create += ", ".join([adapter.get_column_db_def(column) for column in table.columns])
+    primary_key = table.get_primary_key()
+    if primary_key is not None and len(primary_key) > 0:
+        create += ", PRIMARY KEY (" + ", ".join([column.get_name() for column, _ in primary_key]) + ")"
+    return create + ")"
+
+def get_key_params(adapter, index: Index, record: Record) -> tuple:
+    """ Returns the parameters of a WHERE clause on the index, from the record values. """
+    return tuple([adapter.to_param(record.get_value_by_alias(column.get_alias())) for column, _ in index])
+
+def get_record_params(adapter, record: Record) -> tuple:
+    """ Returns the parameters of an INSERT, from all the record values. """
+    return tuple([adapter.to_param(value) for value in record.values])
+
+def get_update_params(adapter, table: Table, record: Record, where: Optional[Index] = None) -> tuple:
+    """ Returns the parameters of the UPDATE of the table, from the record values. """
+    where = get_where(table, where)
+    where_aliases = [column.get_alias() for column, _ in where]
+    params = [adapter.to_param(record.get_value_by_alias(column.get_alias()))
+              for column in table.columns if column.get_alias() not in where_aliases]
+    return tuple(params) + get_key_params(adapter, where, record)
+
+def cache_info() -> dict:
+    """ Returns the statistics of the statement caches by kind of statement. """
+    return {kind: cache.info() for kind, cache in _CACHES.items()}
+
+def cache_clear():
+    """ Clear the statement caches and their statistics. """
+    for cache in _CACHES.values(): cache.clear()
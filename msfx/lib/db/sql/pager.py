@@ -0,0 +1,158 @@
+#  Copyright (c) 2025 Miquel Sas.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Keyset pagination. Pages are selected with a seek predicate on the order key of the first or
+last row of the current page instead of an OFFSET, so that the cost of a page does not grow
+with its depth when the order is backed by an index.
+"""
+from typing import Optional, Union, List, Iterator
+
+from msfx.lib.db import OrderKey
+from msfx.lib.db.cn import DB
+from msfx.lib.db.md import ColumnList, Index, Order, Table, get_converters
+from msfx.lib.db.rs import Record
+from msfx.lib.db.sql import get_keyset_select, get_keyset_params
+
+class KeysetPager:
+    """
+    Pager over a table in the order of an Index or an Order. If the order is not unique, the
+    segments of the primary key not already in it are appended, to make it a total order.
+    Order columns are expected to be not null.
+    """
+    def __init__(self,
+                 db: DB,
+                 table: Table,
+                 order: Union[Index, Order],
+                 page_size: int = 1000,
+                 columns: Optional[ColumnList] = None):
+        """
+        :param db: The database, a connection is taken from the pool per page.
+        :param table: The table.
+        :param order: The Index or Order that defines the order of the pages.
+        :param page_size: The number of records per page.
+        :param columns: The columns to select, by default the table columns. They must
+        include the columns of the order.
+        """
+        if not isinstance(db, DB): raise TypeError("Invalid db")
+        if not isinstance(table, Table): raise TypeError("Invalid table")
+        if not isinstance(order, (Index, Order)): raise TypeError("Order must be an Index or an Order")
+        if len(order) == 0: raise ValueError("Order has no segments")
+        if not isinstance(page_size, int) or page_size <= 0:
+            raise ValueError(f"Page size {page_size} is not a positive integer")
+
+        segments = list(order)
+        unique = isinstance(order, Index) and order.is_unique()
+        primary_key = table.get_primary_key()
+        if not unique and primary_key is not None:
+            aliases = [column.get_alias() for column, _ in segments]
+            segments += [(column, asc) for column, asc in primary_key if column.get_alias() not in aliases]
+
+        columns = (table.columns if columns is None else columns).freeze()
+        key_indexes = []
+        for column, _ in segments:
+            index = columns.index_of(column.get_alias())
+            if index < 0: raise ValueError(f"Order column {column.get_alias()} is not selected")
+            key_indexes.append(index)
+
+        self.__db: DB = db
+        self.__table: Table = table
+        self.__columns: ColumnList = columns
+        self.__segments: tuple = tuple(segments)
+        self.__key_indexes: tuple = tuple(key_indexes)
+        self.__converters = get_converters(columns)
+        self.__page_size: int = page_size
+        self.__first_key: Optional[OrderKey] = None
+        self.__last_key: Optional[OrderKey] = None
+
+    @property
+    def page_size(self) -> int: return self.__page_size
+    @property
+    def first_key(self) -> Optional[OrderKey]:
+        """ The order key of the first record of the current page. """
+        return self.__first_key
+    @property
+    def last_key(self) -> Optional[OrderKey]:
+        """ The order key of the last record of the current page. """
+        return self.__last_key
+
+    def get_key(self, record: Record) -> OrderKey:
+        """ Returns the order key of a record. """
+        key = OrderKey()
+        for index, (_, asc) in zip(self.__key_indexes, self.__segments):
+            key.append(record.get_value_by_index(index), asc)
+        return key
+
+    def __fetch__(self, key: Optional[OrderKey], forward: bool) -> List[Record]:
+        adapter = self.__db.get_adapter()
+        select = get_keyset_select(adapter, self.__table, self.__columns, self.__segments,
+                                   forward, key is not None, self.__page_size)
+        params = () if key is None else get_keyset_params(adapter, key)
+        with self.__db.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(select, data=params)
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        if not forward: rows.reverse()
+
+        columns = self.__columns
+        converters = self.__converters
+        records = [Record(columns, tuple([convert(raw) for convert, raw in zip(converters, row)])) for row in rows]
+        if records:
+            self.__first_key = self.get_key(records[0])
+            self.__last_key = self.get_key(records[-1])
+        return records
+
+    def first_page(self) -> List[Record]:
+        """ Returns the first page. """
+        return self.__fetch__(None, True)
+    def last_page(self) -> List[Record]:
+        """ Returns the last page, ending with the last record. """
+        return self.__fetch__(None, False)
+    def next_page(self) -> List[Record]:
+        """
+        Returns the page after the current one, or the first page if there is no current page.
+        At the end an empty list is returned and the current page is kept.
+        """
+        return self.__fetch__(self.__last_key, True)
+    def previous_page(self) -> List[Record]:
+        """
+        Returns the page before the current one, or the last page if there is no current page.
+        At the start an empty list is returned and the current page is kept.
+        """
+        return self.__fetch__(self.__first_key, False)
+    def seek(self, key: OrderKey, forward: bool = True) -> List[Record]:
+        """
+        Returns the page that follows the key, or that precedes it if not forward.
+        :param key: The order key, with a segment per segment of the order.
+        :param forward: The direction.
+        :return: The list of records.
+        """
+        if not isinstance(key, OrderKey): raise TypeError("Invalid key")
+        if len(key) != len(self.__segments):
+            raise ValueError(f"Key has {len(key)} segments, expected {len(self.__segments)}")
+        return self.__fetch__(key, forward)
+
+    def pages(self, forward: bool = True) -> Iterator[List[Record]]:
+        """ Generate all the pages from the start, or from the end if not forward. """
+        self.__first_key = None
+        self.__last_key = None
+        while True:
+            page = self.next_page() if forward else self.previous_page()
+            if not page: break
+            yield page
+            if len(page) < self.__page_size: break
+    """ End class KeysetPager """
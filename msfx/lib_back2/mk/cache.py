@@ -0,0 +1,243 @@
+#  Copyright (c) 2025 Miquel Sas.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Local on-disk cache of bar series (time, open, high, low, close, volume), one memory-mapped
+file per ticker and time frame.
+
+The file is a 64 bytes header followed by the six columns, each a fixed-width block of
+capacity values: time as int64 microseconds since the epoch, and the prices and volume as
+float64. Bars are appended to the tail in ascending time, the count in the header is updated
+after the values are written, and when the capacity is exhausted the file is rewritten with
+twice the capacity. The sorted time column is the index, searched by bisection, and range
+reads return NumPy views of the mapped columns, without copies.
+"""
+import os
+from datetime import datetime
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from msfx.lib_back2.mk.data import MkData, Bars
+
+MAGIC = b"MSFXBAR1"
+HEADER_DTYPE = np.dtype([("magic", "S8"), ("count", "<i8"), ("capacity", "<i8"), ("reserved", "S40")])
+HEADER_SIZE = HEADER_DTYPE.itemsize
+COLUMNS = ("time", "open", "high", "low", "close", "volume")
+COLUMN_DTYPES = (np.dtype("<i8"), np.dtype("<f8"), np.dtype("<f8"), np.dtype("<f8"), np.dtype("<f8"), np.dtype("<f8"))
+INITIAL_CAPACITY = 1024
+
+def get_file_name(ticker_info: tuple) -> str:
+    """ Returns the file name of a series given the ticker info tuple, i.e. FX_EUR_USD_MIN_1.bars """
+    if not isinstance(ticker_info, tuple) or len(ticker_info) != 5:
+        raise ValueError(f"Invalid ticker info {ticker_info}")
+    return "_".join(str(token) for token in ticker_info) + ".bars"
+
+def to_micros(time: Union[datetime, np.datetime64]) -> int:
+    """ Returns the microseconds since the epoch of a naive datetime or a datetime64. """
+    return int(np.datetime64(time, "us").astype(np.int64))
+
+class BarFile:
+    """ A series of bars in a memory-mapped columnar file. """
+    def __init__(self, path: str, read_only: bool = False):
+        """
+        :param path: The path of the file, created if it does not exist and not read only.
+        :param read_only: If True, the file is mapped read only and appends are not allowed.
+        """
+        self.__path: str = path
+        self.__read_only: bool = read_only
+        self.__mmap: Optional[np.memmap] = None
+        self.__header = None
+        self.__columns: Tuple[np.ndarray, ...] = ()
+        if not os.path.exists(path):
+            if read_only: raise FileNotFoundError(path)
+            self.__create__(path, INITIAL_CAPACITY, ())
+        self.__map__()
+
+    @staticmethod
+    def __create__(path: str, capacity: int, columns: Sequence[np.ndarray]):
+        # Write a new file with the capacity and the columns, to a temporary file that is moved.
+        temp_path = path + ".tmp"
+        count = len(columns[0]) if columns else 0
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header["magic"] = MAGIC
+        header["count"] = count
+        header["capacity"] = capacity
+        with open(temp_path, "wb") as file:
+            file.write(header.tobytes())
+            for i, dtype in enumerate(COLUMN_DTYPES):
+                block = np.zeros(capacity, dtype=dtype)
+                if columns: block[:count] = columns[i]
+                file.write(block.tobytes())
+        os.replace(temp_path, path)
+
+    def __map__(self):
+        mmap = np.memmap(self.__path, dtype=np.uint8, mode="r" if self.__read_only else "r+")
+        header = mmap[:HEADER_SIZE].view(HEADER_DTYPE)
+        if header["magic"][0] != MAGIC:
+            raise ValueError(f"Invalid bar file {self.__path}")
+        capacity = int(header["capacity"][0])
+        if len(mmap) != HEADER_SIZE + capacity * 8 * len(COLUMNS):
+            raise ValueError(f"Invalid size of bar file {self.__path}")
+        columns = []
+        offset = HEADER_SIZE
+        for dtype in COLUMN_DTYPES:
+            columns.append(mmap[offset:offset + capacity * dtype.itemsize].view(dtype))
+            offset += capacity * dtype.itemsize
+        self.__mmap = mmap
+        self.__header = header
+        self.__columns = tuple(columns)
+
+    @property
+    def path(self) -> str: return self.__path
+    @property
+    def capacity(self) -> int: return int(self.__header["capacity"][0])
+    def size(self) -> int:
+        return int(self.__header["count"][0])
+    def __len__(self) -> int: return self.size()
+
+    def refresh(self):
+        """ Map the file again, to see the bars appended by a writer, if it has grown. """
+        self.__map__()
+
+    def get_bars(self, start: int = 0, end: Optional[int] = None) -> Bars:
+        """ Returns the views of the bars between the start and end positions. """
+        count = self.size()
+        end = count if end is None else min(end, count)
+        time, *values = [column[start:end] for column in self.__columns]
+        return Bars(time.view("datetime64[us]"), *values)
+
+    def get_first_time(self) -> Optional[np.datetime64]:
+        return self.__columns[0][:1].view("datetime64[us]")[0] if self.size() > 0 else None
+    def get_last_time(self) -> Optional[np.datetime64]:
+        count = self.size()
+        return self.__columns[0][count - 1:count].view("datetime64[us]")[0] if count > 0 else None
+
+    def index_of(self, time: Union[datetime, np.datetime64], side: str = "left") -> int:
+        """ Returns the position where the time would be inserted, as numpy.searchsorted. """
+        return int(np.searchsorted(self.__columns[0][:self.size()], to_micros(time), side=side))
+
+    def get_range(self, start: Optional[Union[datetime, np.datetime64]] = None,
+                  end: Optional[Union[datetime, np.datetime64]] = None) -> Bars:
+        """
+        Returns the views of the bars with start <= time < end.
+        :param start: The start time, None from the first bar.
+        :param end: The end time, excluded, None to the last bar.
+        :return: The Bars of views.
+        """
+        start_index = 0 if start is None else self.index_of(start)
+        end_index = self.size() if end is None else self.index_of(end)
+        return self.get_bars(start_index, max(start_index, end_index))
+
+    def append(self, time: np.ndarray, open: np.ndarray, high: np.ndarray,
+               low: np.ndarray, close: np.ndarray, volume: np.ndarray) -> int:
+        """
+        Append bars to the tail. Times must be ascending, bars before or at the last time are
+        skipped, except a bar at the last time that replaces it, for the bar still open.
+        :return: The number of bars appended, not counting a replaced last bar.
+        """
+        if self.__read_only: raise PermissionError("Read-only status")
+        time = np.asarray(time, dtype="datetime64[us]").astype(np.int64)
+        values = [np.asarray(column, dtype=np.float64) for column in (open, high, low, close, volume)]
+        if any(len(column) != len(time) for column in values):
+            raise ValueError("Columns must have the same length")
+        if len(time) > 1 and np.any(time[1:] <= time[:-1]):
+            raise ValueError("Times must be strictly ascending")
+
+        count = self.size()
+        columns = self.__columns
+        if count > 0 and len(time) > 0:
+            last = columns[0][count - 1]
+            first = int(np.searchsorted(time, last, side="left"))
+            if first < len(time) and time[first] == last:
+                for column, new in zip(columns[1:], values):
+                    column[count - 1] = new[first]
+                first += 1
+            time = time[first:]
+            values = [column[first:] for column in values]
+        if len(time) == 0:
+            self.__mmap.flush()
+            return 0
+
+        if count + len(time) > self.capacity:
+            capacity = self.capacity
+            while capacity < count + len(time): capacity *= 2
+            current = [column[:count].copy() for column in columns]
+            self.__mmap.flush()
+            self.__mmap = None
+            self.__create__(self.__path, capacity, current)
+            self.__map__()
+            columns = self.__columns
+
+        # Write the values and then the count, so that a reader never sees a partial bar.
+        end = count + len(time)
+        columns[0][count:end] = time
+        for column, new in zip(columns[1:], values):
+            column[count:end] = new
+        self.__mmap.flush()
+        self.__header["count"] = end
+        self.__mmap.flush()
+        return len(time)
+
+    def append_bars(self, bars: Sequence[tuple]) -> int:
+        """ Append a list of (time, open, high, low, close, volume) tuples as returned by MkData. """
+        if len(bars) == 0: return 0
+        time, open, high, low, close, volume = zip(*bars)
+        return self.append(np.array(time, dtype="datetime64[us]"), open, high, low, close, volume)
+
+    def close(self):
+        if self.__mmap is not None and not self.__read_only:
+            self.__mmap.flush()
+        self.__mmap = None
+        self.__header = None
+        self.__columns = ()
+    """ End class BarFile """
+class BarCache:
+    """ Directory of bar files, one per ticker and time frame. """
+    def __init__(self, path: str):
+        """
+        :param path: The directory of the cache, created if it does not exist.
+        """
+        os.makedirs(path, exist_ok=True)
+        self.__path: str = path
+
+    def get_path(self, ticker_info: tuple) -> str:
+        return os.path.join(self.__path, get_file_name(ticker_info))
+    def exists(self, ticker_info: tuple) -> bool:
+        return os.path.exists(self.get_path(ticker_info))
+
+    def open(self, ticker_info: tuple, read_only: bool = False) -> BarFile:
+        """
+        Open the bar file of the ticker info, created if it does not exist and not read only.
+        :param ticker_info: The ticker info tuple as returned by MkData.get_ticker_info.
+        :param read_only: If True, the file is opened read only.
+        :return: The bar file.
+        """
+        return BarFile(self.get_path(ticker_info), read_only)
+
+    def load(self, mk_data: MkData, **kwargs) -> BarFile:
+        """
+        Append to the bar file of the ticker the data of the source that is not yet cached.
+        :param mk_data: The market data source.
+        :param kwargs: The parameters of get_ticker_info and get_ticker_data.
+        :return: The bar file.
+        """
+        bar_file = self.open(mk_data.get_ticker_info(**kwargs))
+        data = mk_data.get_ticker_data(**kwargs)
+        if isinstance(data, Bars):
+            bar_file.append(*data)
+        else:
+            bar_file.append_bars(data)
+        return bar_file
+    """ End class BarCache """
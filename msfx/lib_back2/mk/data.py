@@ -14,8 +14,30 @@
 
 from abc import ABC, abstractmethod
 from datetime import datetime
+from io import BytesIO
+from typing import NamedTuple, Iterator, Union, Optional, Tuple
 import os
 
+import numpy as np
+
+class Bars(NamedTuple):
+    """ Columnar bundle of bars, the time is datetime64[us] and the rest float64 arrays. """
+    time: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+def get_empty_bars() -> Bars:
+    return Bars(np.empty(0, dtype="datetime64[us]"), *[np.empty(0, dtype=np.float64) for _ in range(5)])
+
+def concatenate_bars(chunks: list) -> Bars:
+    """ Returns the bars of a list of chunks of bars concatenated. """
+    if len(chunks) == 0: return get_empty_bars()
+    if len(chunks) == 1: return chunks[0]
+    return Bars(*[np.concatenate([chunk[i] for chunk in chunks]) for i in range(len(Bars._fields))])
+
 class MkData(ABC):
     """
     MkData abstract class defines the interface for classes that provide market data,
@@ -49,11 +71,12 @@ class MkData(ABC):
         """
         pass
     @abstractmethod
-    def get_ticker_data(self, **kwargs) -> list[tuple[datetime, float, float, float, float, float]]:
+    def get_ticker_data(self, **kwargs) -> Union[list[tuple[datetime, float, float, float, float, float]], Bars]:
         """
-        Return a list of tuples that conform the data from the source that offers market data.
+        Return the data from the source that offers market data, either a list of tuples or,
+        for large sources, a columnar Bars bundle.
         :param kwargs: Necessary parameters to retrieve the data.
-        :return: A list of tuples: time, open, high, low, close, volume
+        :return: A list of tuples: time, open, high, low, close, volume, or the Bars.
         """
         pass
 
@@ -62,7 +85,20 @@ class MkDataVChart(MkData):
     Implements MkData for Visual Chart exported txt files. By convention, VChart files have the
     name formatted with five tokens separated by an underscore, that represent the five items of
     the ticker info tuple.
+
+    The content is the comma separated ASCII export, one bar per line, with an optional header:
+    <TICKER>,<PER>,<DTYYYYMMDD>,<TIME>,<OPEN>,<HIGH>,<LOW>,<CLOSE>,<VOL>[,<OPENINT>]
+    The date is YYYYMMDD and the time HHMMSS or HHMM, the same in the whole file, decided on
+    the first block and HHMMSS times in a HHMM file rejected. Without header the columns are expected
+    in that order. Files are read in large blocks, and each block is parsed by the NumPy text
+    reader into columns, and its dates and times converted at once.
     """
+    # Default bytes read per block.
+    BLOCK_SIZE = 32 * 1024 * 1024
+    # Columns by their names in the header, and default positions.
+    COLUMN_NAMES = (("DATE", "DT"), ("TIME",), ("OPEN",), ("HIGH",), ("LOW",), ("CLOSE",), ("VOL",))
+    COLUMN_INDEXES = (2, 3, 4, 5, 6, 7, 8)
+
     def __init__(self):
         super().__init__()
 
@@ -78,5 +114,90 @@ class MkDataVChart(MkData):
         keys = file_name.split("_")
         return keys[0], keys[1], keys[2], keys[3], int(keys[4])
 
-    def get_ticker_data(self, **kwargs) -> list[tuple[datetime, float, float, float]]:
-        pass
\ No newline at end of file
+    def get_ticker_data(self, **kwargs) -> Bars:
+        """
+        Returns the bars of the file.
+        :param kwargs: The "file_name" and optionally the "block_size" in bytes.
+        :return: The Bars bundle.
+        """
+        return concatenate_bars(list(self.get_ticker_chunks(**kwargs)))
+
+    def get_ticker_chunks(self, **kwargs) -> Iterator[Bars]:
+        """
+        Generate the bars of the file by chunks, one per block read, so that memory is bounded
+        by the block size.
+        :param kwargs: The "file_name" and optionally the "block_size" in bytes.
+        :return: The generator of Bars.
+        """
+        file_name = kwargs["file_name"]
+        block_size = kwargs.get("block_size", MkDataVChart.BLOCK_SIZE)
+        if not isinstance(block_size, int) or block_size <= 0:
+            raise ValueError(f"Block size {block_size} is not a positive integer")
+
+        indexes = None
+        # HHMM or HHMMSS times, decided once per file on the first block.
+        hhmm = None
+        tail = b""
+        with open(file_name, "rb") as file:
+            while True:
+                block = file.read(block_size)
+                last = not block
+                block = tail + block
+                if not last:
+                    # Parse up to the last complete line, the rest goes with the next block.
+                    end = block.rfind(b"\n") + 1
+                    block, tail = block[:end], block[end:]
+                if indexes is None and block.strip():
+                    indexes, block = self.__header__(block)
+                if block.strip():
+                    bars, hhmm = self.__parse__(block, indexes, hhmm)
+                    yield bars
+                if last: break
+
+    def __header__(self, block: bytes) -> tuple:
+        # Returns the column indexes and the block without the header line if any.
+        line = block.lstrip().split(b"\n", 1)[0]
+        fields = line.strip().upper().split(b",")
+        if len(fields) > 2 and fields[2].strip().isdigit():
+            return MkDataVChart.COLUMN_INDEXES, block
+        indexes = []
+        for names in MkDataVChart.COLUMN_NAMES:
+            index = next((i for i, field in enumerate(fields)
+                          if any(field.strip(b"<> ").startswith(name.encode()) for name in names)), -1)
+            if index < 0: raise ValueError(f"Column {names[0]} not found in header {line}")
+            indexes.append(index)
+        block = block.lstrip().split(b"\n", 1)
+        return tuple(indexes), block[1] if len(block) > 1 else b""
+
+    @staticmethod
+    def __is_hhmm__(block: bytes, indexes: tuple, time: np.ndarray) -> bool:
+        # Six digits are HHMMSS and four digits padded with zeros HHMM, unpadded times are
+        # HHMM unless any time of the block exceeds 2359.
+        first_time = block.lstrip().split(b"\n", 1)[0].split(b",")[indexes[1]].strip()
+        if len(first_time) == 6: return False
+        if len(first_time) == 4 and first_time.startswith(b"0"): return True
+        return len(time) == 0 or int(time.max()) <= 2359
+
+    @staticmethod
+    def __parse__(block: bytes, indexes: tuple, hhmm: Optional[bool]) -> Tuple[Bars, bool]:
+        dtype = np.dtype([("date", "i8"), ("time", "i8"), ("open", "f8"), ("high", "f8"),
+                          ("low", "f8"), ("close", "f8"), ("volume", "f8")])
+        # The NumPy text reader requires the columns in ascending order.
+        order = np.argsort(indexes)
+        table = np.loadtxt(BytesIO(block), delimiter=",", usecols=tuple(indexes[i] for i in order),
+                           dtype=np.dtype([dtype.descr[i] for i in order]), ndmin=1)
+
+        date = table["date"]
+        time = table["time"]
+        if hhmm is None: hhmm = MkDataVChart.__is_hhmm__(block, indexes, time)
+        if hhmm:
+            if len(time) > 0 and int(time.max()) > 2359:
+                raise ValueError(f"Mixed HHMM and HHMMSS times, {int(time.max())} in a HHMM file")
+            time = time * 100
+
+        year, month, day = date // 10000, date // 100 % 100, date % 100
+        days = ((year - 1970).astype("datetime64[Y]").astype("datetime64[M]") + (month - 1)).astype("datetime64[D]")
+        days = days + (day - 1)
+        seconds = time // 10000 * 3600 + time // 100 % 100 * 60 + time % 100
+        times = days.astype("datetime64[us]") + seconds.astype("timedelta64[s]")
+        return Bars(times, *[np.ascontiguousarray(table[name]) for name in ("open", "high", "low", "close", "volume")]), hhmm
\ No newline at end of file
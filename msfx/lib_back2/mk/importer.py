@@ -0,0 +1,232 @@
+#  Copyright (c) 2025 Miquel Sas.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Import of Visual Chart exports into one table per ticker. Files are grouped by the ticker
+info encoded in their names, parsed in a process pool, the bars of the files of a ticker
+merged in time order without duplicates, the later file winning, and written to the table
+of the ticker with bulk inserts that update existing bars. Files are submitted ticker after
+ticker within a window of twice the workers and consumed in that order, so that only the
+files in flight and the bars of the current ticker are kept in memory. A checkpoint file records the
+tickers written and the size and modification time of their files, so that a new run after
+a crash skips them.
+"""
+import glob
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from msfx.lib.db import Types
+from msfx.lib.db.cn import DB
+from msfx.lib.db.md import Column, Index, Table
+from msfx.lib.db.sql import get_create_table
+from msfx.lib_back2.mk.data import MkDataVChart, Bars, concatenate_bars
+from msfx.lib_back2.task.monitor import TaskMonitor
+from msfx.lib_back2.task.task import Task
+
+def get_ticker_key(ticker_info: tuple) -> str:
+    """ Returns the key of a ticker, i.e. FX_EUR_USD_MIN_5 """
+    return "_".join(str(token) for token in ticker_info)
+
+def get_bar_table(ticker_info: tuple) -> Table:
+    """ Returns the table of the bars of a ticker, named as the lower case ticker key. """
+    table = Table()
+    table.set_name(get_ticker_key(ticker_info).lower())
+    for name, type in [("time", Types.DATETIME), ("open", Types.FLOAT), ("high", Types.FLOAT),
+                       ("low", Types.FLOAT), ("close", Types.FLOAT), ("volume", Types.FLOAT)]:
+        table.append_column(Column(name=name, type=type, primary_key=(name == "time"), nullable=False))
+    primary_key = Index()
+    primary_key.append(table.columns.get_by_alias("time"))
+    table.set_primary_key(primary_key)
+    return table
+
+def discover(path: str, pattern: str = "*.txt", ignored: Optional[List[str]] = None) -> Dict[tuple, List[str]]:
+    """
+    Returns the files of the directory that match the pattern, grouped by ticker info and
+    sorted by name within each group.
+    :param path: The directory of the files.
+    :param pattern: The pattern of the names of the files.
+    :param ignored: Optional list where the names that do not encode a ticker info are appended.
+    :return: The file names by ticker info.
+    """
+    mk_data = MkDataVChart()
+    groups: Dict[tuple, List[str]] = {}
+    for file_name in sorted(glob.glob(os.path.join(path, pattern))):
+        try:
+            ticker_info = mk_data.get_ticker_info(file_name=file_name)
+        except (IndexError, ValueError):
+            if ignored is not None: ignored.append(file_name)
+            continue
+        groups.setdefault(ticker_info, []).append(file_name)
+    return groups
+
+def parse_file(file_name: str) -> Bars:
+    """ Parse a file, the function run by the processes of the pool. """
+    return MkDataVChart().get_ticker_data(file_name=file_name)
+
+def merge_bars(chunks: List[Bars]) -> Bars:
+    """
+    Merge the bars of several files in ascending time. Bars with the same time are reduced to
+    the last one in the order of the chunks.
+    """
+    bars = concatenate_bars(chunks)
+    order = np.argsort(bars.time, kind="stable")
+    bars = Bars(*[column[order] for column in bars])
+    if len(bars.time) > 1:
+        last = np.append(bars.time[1:] != bars.time[:-1], True)
+        bars = Bars(*[column[last] for column in bars])
+    return bars
+
+def get_file_signature(file_name: str) -> list:
+    stat = os.stat(file_name)
+    return [stat.st_size, stat.st_mtime_ns]
+
+class Checkpoint:
+    """ JSON file with the tickers already imported and the signature of their files. """
+    def __init__(self, file_name: Optional[str]):
+        self.__file_name: Optional[str] = file_name
+        self.__tickers: dict = {}
+        if file_name is not None and os.path.exists(file_name):
+            with open(file_name) as file:
+                self.__tickers = json.load(file).get("tickers", {})
+
+    def is_done(self, ticker_info: tuple, file_names: List[str]) -> bool:
+        entry = self.__tickers.get(get_ticker_key(ticker_info))
+        if entry is None: return False
+        return entry["files"] == {name: get_file_signature(name) for name in file_names}
+
+    def set_done(self, ticker_info: tuple, file_names: List[str], rows: int):
+        self.__tickers[get_ticker_key(ticker_info)] = {
+            "files": {name: get_file_signature(name) for name in file_names},
+            "rows": rows
+        }
+        if self.__file_name is None: return
+        # Write to a temporary file that is moved, so that a crash never leaves it half written.
+        temp_name = self.__file_name + ".tmp"
+        with open(temp_name, "w") as file:
+            json.dump({"tickers": self.__tickers}, file, indent=1)
+        os.replace(temp_name, self.__file_name)
+    """ End class Checkpoint """
+class ImportTask(Task):
+    """
+    Task that imports the Visual Chart files of a directory, one table per ticker. The progress
+    is tracked per file parsed, and cancel and pause requests are checked between files.
+    """
+    def __init__(self,
+                 db: DB,
+                 path: str,
+                 pattern: str = "*.txt",
+                 workers: int = 4,
+                 checkpoint: Optional[str] = None,
+                 batch_size: int = 5000,
+                 monitor: TaskMonitor = None):
+        """
+        :param db: The database to write to.
+        :param path: The directory of the files.
+        :param pattern: The pattern of the names of the files.
+        :param workers: The number of processes parsing files.
+        :param checkpoint: The optional path of the checkpoint file, to resume after a crash.
+        :param batch_size: The number of rows per bulk insert batch.
+        :param monitor: Optional TaskMonitor to track progress.
+        """
+        super().__init__(monitor)
+        if not isinstance(workers, int) or workers <= 0:
+            raise ValueError(f"Workers {workers} is not a positive integer")
+        self.__db: DB = db
+        self.__path: str = path
+        self.__pattern: str = pattern
+        self.__workers: int = workers
+        self.__checkpoint: Optional[str] = checkpoint
+        self.__batch_size: int = batch_size
+        self.__rows: Dict[str, int] = {}
+        self.__skipped: List[str] = []
+        self.__ignored: List[str] = []
+
+    @property
+    def rows(self) -> Dict[str, int]:
+        """ The rows written by ticker key. """
+        return dict(self.__rows)
+    @property
+    def skipped(self) -> List[str]:
+        """ The ticker keys skipped because the checkpoint records them as imported. """
+        return list(self.__skipped)
+    @property
+    def ignored(self) -> List[str]:
+        """ The files that match the pattern but whose names do not encode a ticker info. """
+        return list(self.__ignored)
+
+    def write(self, ticker_info: tuple, bars: Bars) -> int:
+        """ Write the bars to the table of the ticker, creating it if it does not exist. """
+        table = get_bar_table(ticker_info)
+        rows = zip(bars.time.tolist(), *[column.tolist() for column in bars[1:]])
+        with self.__db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(get_create_table(conn.get_adapter(), table))
+            cursor.close()
+            return conn.bulk_insert(table, rows, batch_size=self.__batch_size).rows
+
+    def execute(self):
+        checkpoint = Checkpoint(self.__checkpoint)
+        groups = {}
+        for ticker_info, file_names in discover(self.__path, self.__pattern, self.__ignored).items():
+            if checkpoint.is_done(ticker_info, file_names):
+                self.__skipped.append(get_ticker_key(ticker_info))
+            else:
+                groups[ticker_info] = file_names
+
+        total_work = sum(len(file_names) for file_names in groups.values())
+        work_done = 0
+        self.track_progress(f"{total_work} files of {len(groups)} tickers", work_done, total_work)
+        if total_work == 0: return
+
+        files = iter([(ticker_info, file_name) for ticker_info, file_names in groups.items() for file_name in file_names])
+        window = 2 * self.__workers
+        pending = deque()
+        chunks: List[Bars] = []
+        with ProcessPoolExecutor(max_workers=self.__workers) as executor:
+            while True:
+                # Keep the window full, results are consumed in the order submitted.
+                while len(pending) < window:
+                    ticker_info, file_name = next(files, (None, None))
+                    if file_name is None: break
+                    pending.append((executor.submit(parse_file, file_name), ticker_info, file_name))
+                if not pending: break
+
+                if self.is_cancel_requested():
+                    for future, _, _ in pending: future.cancel()
+                    self.set_cancelled()
+                    self.track_cancelled()
+                    return
+                self.check_paused()
+
+                future, ticker_info, file_name = pending.popleft()
+                chunks.append(future.result())
+                work_done += 1
+                self.track_progress(f"Parsed {os.path.basename(file_name)}", work_done, total_work)
+
+                # The last file of the ticker parsed, merge in name order and write.
+                file_names = groups[ticker_info]
+                if file_name == file_names[-1]:
+                    bars = merge_bars(chunks)
+                    chunks = []
+                    rows = self.write(ticker_info, bars)
+                    self.__rows[get_ticker_key(ticker_info)] = rows
+                    checkpoint.set_done(ticker_info, file_names, rows)
+                    self.track_progress(f"Written {rows} bars of {get_ticker_key(ticker_info)}",
+                                        work_done, total_work)
+    """ End class ImportTask """
@@ -0,0 +1,120 @@
+#  Copyright (c) 2025 Miquel Sas.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Resampling of bar series to higher time frames. The time frame is given by the unit and size
+fields of the ticker info, MIN, HR or DAY and the number of units, and buckets are aligned to
+multiples of the period since the epoch, so that HR 4 buckets start at 00:00, 04:00, etc.
+"""
+from typing import Optional
+
+import numpy as np
+
+from msfx.lib_back2.mk.data import Bars, get_empty_bars, concatenate_bars
+
+PERIOD_UNITS = {"MIN": "m", "HR": "h", "DAY": "D"}
+
+def get_period(unit: str, size: int) -> np.timedelta64:
+    """ Returns the period of a time frame, i.e. ("HR", 4) is 4 hours. """
+    if unit not in PERIOD_UNITS: raise ValueError(f"Invalid time frame unit {unit}")
+    if not isinstance(size, int) or size <= 0: raise ValueError(f"Size {size} is not a positive integer")
+    return np.timedelta64(size, PERIOD_UNITS[unit]).astype("timedelta64[us]")
+
+def get_bucket_times(time: np.ndarray, period: np.timedelta64) -> np.ndarray:
+    """ Returns the start time of the bucket of each time. """
+    micros = time.astype("datetime64[us]").astype(np.int64)
+    step = period.astype(np.int64)
+    return (micros - micros % step).astype("datetime64[us]")
+
+def resample(bars: Bars, unit: str, size: int) -> Bars:
+    """
+    Resample bars in ascending time to the time frame in one vectorized pass.
+    :param bars: The base bars.
+    :param unit: The time frame unit, MIN, HR or DAY.
+    :param size: The number of units.
+    :return: The resampled bars, the time of each one is the start of its bucket.
+    """
+    if len(bars.time) == 0: return get_empty_bars()
+    buckets = get_bucket_times(bars.time, get_period(unit, size))
+    starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+    ends = np.append(starts[1:], len(buckets)) - 1
+    return Bars(buckets[starts],
+                bars.open[starts],
+                np.maximum.reduceat(bars.high, starts),
+                np.minimum.reduceat(bars.low, starts),
+                bars.close[ends],
+                np.add.reduceat(bars.volume, starts))
+
+def slice_bars(bars: Bars, start: int, end: Optional[int] = None) -> Bars:
+    """ Returns the views of the bars between the start and end positions. """
+    return Bars(*[column[start:end] for column in bars])
+
+class Resampler:
+    """
+    Incremental resampler. The base bars of the last bucket, that may still be open, are kept,
+    and an update only resamples the new base bars together with them, instead of the whole
+    history. A new base bar with the time of the last base bar replaces it, as the base bar that
+    was still open.
+    """
+    def __init__(self, unit: str, size: int):
+        self.__unit: str = unit
+        self.__size: int = size
+        get_period(unit, size)
+        self.__closed: list = []
+        self.__closed_bars: Optional[Bars] = None
+        self.__open: Bars = get_empty_bars()
+        self.__open_base: Bars = get_empty_bars()
+
+    @property
+    def bars(self) -> Bars:
+        """ All the resampled bars, the last one is the open bucket. """
+        if self.__closed:
+            self.__closed_bars = concatenate_bars(([] if self.__closed_bars is None else [self.__closed_bars]) + self.__closed)
+            self.__closed = []
+        if self.__closed_bars is None: return self.__open
+        return concatenate_bars([self.__closed_bars, self.__open])
+
+    def update(self, bars: Bars) -> Bars:
+        """
+        Update with new base bars in ascending time. Bars before the last base bar are ignored.
+        :param bars: The new base bars.
+        :return: The resampled bars from the last open bucket before the update on, the first one
+        replaces the previous open bucket if it has the same time.
+        """
+        base = self.__open_base
+        if len(base.time) > 0:
+            last = base.time[-1]
+            bars = slice_bars(bars, int(np.searchsorted(bars.time, last, side="left")))
+            if len(bars.time) > 0 and bars.time[0] == last:
+                base = slice_bars(base, 0, len(base.time) - 1)
+        if len(bars.time) == 0: return self.__open
+
+        resampled = resample(concatenate_bars([base, bars]), self.__unit, self.__size)
+        count = len(resampled.time)
+        if count > 1:
+            # The previous open bucket, if any, and all but the last are closed now.
+            if len(self.__open.time) > 0 and self.__open.time[0] != resampled.time[0]:
+                self.__closed.append(self.__open)
+            self.__closed.append(slice_bars(resampled, 0, count - 1))
+        elif len(self.__open.time) > 0 and self.__open.time[0] != resampled.time[0]:
+            self.__closed.append(self.__open)
+        self.__open = slice_bars(resampled, count - 1)
+
+        # Keep the base bars of the last bucket.
+        bucket = self.__open.time[0]
+        all_base = concatenate_bars([base, bars])
+        first = int(np.searchsorted(all_base.time, bucket, side="left"))
+        self.__open_base = Bars(*[np.array(column) for column in slice_bars(all_base, first)])
+        return resampled
+    """ End class Resampler """
@@ -14,7 +14,7 @@
 from datetime import datetime
 from threading import RLock
 
-from msfx.lib_back2.task.task import TaskState
+from msfx.lib_back2.task.state import TaskState
 
 class TaskProgress:
     """
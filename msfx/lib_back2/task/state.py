@@ -0,0 +1,31 @@
+#  Copyright (c) 2025 Miquel Sas.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+from enum import Enum
+
+class TaskState(Enum):
+    """
+    Enumeration of possible task states.
+    """
+    READY = "READY"
+    """ Task is ready to start execution. """
+    RUNNING = "RUNNING"
+    """ Task is running. """
+    PAUSED = "PAUSED"
+    """ Task is paused. """
+    SUCCEEDED = "SUCCEEDED"
+    """ Task has finishes successfully. """
+    CANCELLED = "CANCELLED"
+    """ Task was cancelled. """
+    FAILED = "FAILED"
+    """ Task failed with an exception. """
@@ -13,27 +13,10 @@
 #  limitations under the License.
 import time
 from abc import ABC, abstractmethod
-from enum import Enum
 
 from msfx.lib_back2.task.monitor import TaskMonitor
 from msfx.lib_back2.task.concurrent import Atomic
-
-class TaskState(Enum):
-    """
-    Enumeration of possible task states.
-    """
-    READY = "READY"
-    """ Task is ready to start execution. """
-    RUNNING = "RUNNING"
-    """ Task is running. """
-    PAUSED = "PAUSED"
-    """ Task is paused. """
-    SUCCEEDED = "SUCCEEDED"
-    """ Task has finishes successfully. """
-    CANCELLED = "CANCELLED"
-    """ Task was cancelled. """
-    FAILED = "FAILED"
-    """ Task failed with an exception. """
+from msfx.lib_back2.task.state import TaskState
 
 class Task(ABC):
     """
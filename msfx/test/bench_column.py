@@ -0,0 +1,42 @@
+"""
+Per cell cost of reading the column type and scale, as the select scan loop does,
+through properties round-trips (previous accessors) and through the cached core
+attributes. The number of cells can be passed as the first argument, defaults
+to 1,000,000.
+"""
+import sys
+from time import perf_counter
+
+from msfx.lib.db import Types
+from msfx.lib.db.md import Column, ColumnProps
+from msfx.lib.props import Properties
+
+cells = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+column = Column(name="CLOSE", type=Types.DECIMAL, length=12, scale=5)
+
+# Properties as the column stored and read them before caching the core attributes.
+props = Properties()
+props.set_string(ColumnProps.NAME, "CLOSE")
+props.set_any(ColumnProps.TYPE, Types.DECIMAL)
+props.set_integer(ColumnProps.LENGTH, 12)
+props.set_integer(ColumnProps.SCALE, 5)
+
+begin = perf_counter()
+for _ in range(cells):
+    type = props.get_any(ColumnProps.TYPE, Types.STRING)
+    scale = props.get_integer(ColumnProps.SCALE, -1)
+    alias = props.get_string(ColumnProps.ALIAS, props.get_string(ColumnProps.NAME))
+before = perf_counter() - begin
+
+begin = perf_counter()
+for _ in range(cells):
+    type = column.get_type()
+    scale = column.get_scale()
+    alias = column.get_alias()
+after = perf_counter() - begin
+
+print(f"Cells:  {cells:,}")
+print(f"Before: {before:.3f} s, {before / cells * 1e9:,.0f} ns per cell")
+print(f"After:  {after:.3f} s, {after / cells * 1e9:,.0f} ns per cell")
+print(f"Speed-up: {before / after:.2f}x")
@@ -0,0 +1,62 @@
+"""
+Cost of building column lists, wide lists of 500 columns and lists derived from a cursor
+description as ad-hoc queries do, with the index rebuilt on every append (previous
+behavior) and maintained incrementally. The number of lists can be passed as the first
+argument, defaults to 2,000.
+"""
+import sys
+from time import perf_counter
+
+from msfx.lib.db import Types
+from msfx.lib.db.md import Column, ColumnList
+from msfx.lib.db.cn.sqlite import SQLiteAdapter
+
+lists = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+def rebuild(columns: list):
+    # The previous setup, all the derived fields rebuilt from scratch.
+    aliases, indexes, pk_columns, default_values = [], {}, [], []
+    for i in range(len(columns)):
+        column = columns[i]
+        aliases.append(column.get_alias())
+        indexes[column.get_alias()] = i
+        if column.is_primary_key():
+            pk_columns.append(column)
+        default_values.append(column.get_default_value())
+
+wide = [Column(name=f"C{i}", type=Types.DECIMAL, scale=2, primary_key=(i == 0)) for i in range(500)]
+
+begin = perf_counter()
+for _ in range(10):
+    columns = []
+    for column in wide:
+        columns.append(column)
+        rebuild(columns)
+before = (perf_counter() - begin) / 10
+
+begin = perf_counter()
+for _ in range(10):
+    columns = ColumnList()
+    for column in wide:
+        columns.append(column)
+after = (perf_counter() - begin) / 10
+
+print("500 columns")
+print(f"Before: {before * 1000:.3f} ms per list")
+print(f"After:  {after * 1000:.3f} ms per list")
+print(f"Speed-up: {before / after:.1f}x")
+
+adapter = SQLiteAdapter()
+description = [(f"COL{i}", type, None, None, None, 2, True)
+               for i, type in enumerate([Types.INTEGER, Types.STRING, Types.DECIMAL, Types.FLOAT,
+                                         Types.DATETIME, Types.DECIMAL, Types.STRING, Types.INTEGER] * 3)]
+
+begin = perf_counter()
+for _ in range(lists):
+    columns = ColumnList()
+    for descr in description:
+        columns.append(adapter.get_column_from_cursor_descr(descr))
+elapsed = perf_counter() - begin
+
+print(f"\n{lists:,} lists of {len(description)} columns from a description")
+print(f"{lists / elapsed:,.0f} lists per second")
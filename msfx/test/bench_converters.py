@@ -0,0 +1,49 @@
+"""
+Compares the per cell get_value path with the compiled per column converters,
+on synthetic rows shaped like the bar tables. The number of rows can be passed
+as the first argument, defaults to 1,000,000.
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from msfx.lib.db import Types, Value, get_value
+from msfx.lib.db.md import Column, ColumnList, get_converters
+
+rows_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+columns = ColumnList()
+columns.append(Column(name="TIME", type=Types.DATETIME))
+columns.append(Column(name="OPEN", type=Types.FLOAT))
+columns.append(Column(name="HIGH", type=Types.FLOAT))
+columns.append(Column(name="LOW", type=Types.FLOAT))
+columns.append(Column(name="CLOSE", type=Types.DECIMAL, scale=5))
+columns.append(Column(name="VOLUME", type=Types.INTEGER))
+
+start = datetime(2010, 1, 1)
+rows = [
+    (start + timedelta(minutes=i), 1.1 + i * 1e-7, 1.2, 1.0, Decimal("1.123456"), i % 1000)
+    for i in range(rows_count)
+]
+
+def value(col: Column, raw) -> Value:
+    type = col.get_type()
+    scale = col.get_scale()
+    return get_value(type, scale, raw)
+
+begin = time.perf_counter()
+for row in rows:
+    values = tuple(value(columns[i], row[i]) for i in range(len(row)))
+get_value_secs = time.perf_counter() - begin
+
+begin = time.perf_counter()
+converters = get_converters(columns)
+for row in rows:
+    values = tuple([convert(raw) for convert, raw in zip(converters, row)])
+converters_secs = time.perf_counter() - begin
+
+print(f"Rows:       {rows_count:,}")
+print(f"get_value:  {get_value_secs:.3f} s, {rows_count / get_value_secs:,.0f} rows/s")
+print(f"converters: {converters_secs:.3f} s, {rows_count / converters_secs:,.0f} rows/s")
+print(f"Speed-up:   {get_value_secs / converters_secs:.2f}x")
@@ -0,0 +1,55 @@
+"""
+Cost of building the column list of a query from the MariaDB cursor description, decoding
+every description tuple, with the decoded tuples cached, and with the column list cached by
+the whole description. The number of queries can be passed as the first argument, defaults
+to 10,000.
+"""
+import sys
+from time import perf_counter
+
+from msfx.lib.db.cn.mariadb import MariaDBAdapter, get_column, get_column_descr
+from msfx.lib.db.md import ColumnList
+
+queries = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+description = (
+    ('col_varchar', 253, 20, 80, 0, 0, True, 0, 'check_types', 'col_varchar', 'check_types'),
+    ('col_text', 252, 65535, 262140, 0, 0, True, 16, 'check_types', 'col_text', 'check_types'),
+    ('col_int', 3, 2, 11, 0, 0, True, 32768, 'check_types', 'col_int', 'check_types'),
+    ('col_bigint', 8, 5, 20, 0, 0, True, 32768, 'check_types', 'col_bigint', 'check_types'),
+    ('col_double', 5, 5, 22, 0, 0, True, 32768, 'check_types', 'col_double', 'check_types'),
+    ('col_decimal', 246, 23, 22, 22, 6, True, 32768, 'check_types', 'col_decimal', 'check_types'),
+    ('col_blob', 252, 16383, 65535, 0, 0, True, 144, 'check_types', 'col_blob', 'check_types'),
+    ('col_date', 10, 2, 10, 0, 0, True, 128, 'check_types', 'col_date', 'check_types'),
+    ('col_datetime', 12, 4, 19, 0, 0, True, 128, 'check_types', 'col_datetime', 'check_types'),
+    ('col_timestamp', 7, 4, 19, 0, 0, True, 160, 'check_types', 'col_timestamp', 'check_types'),
+)
+adapter = MariaDBAdapter()
+decode = get_column_descr.__wrapped__
+
+begin = perf_counter()
+for _ in range(queries):
+    columns = ColumnList()
+    for descr in description:
+        columns.append(get_column(decode(descr)))
+    columns = columns.freeze()
+uncached = perf_counter() - begin
+
+begin = perf_counter()
+for _ in range(queries):
+    columns = ColumnList()
+    for descr in description:
+        columns.append(adapter.get_column_from_cursor_descr(descr))
+    columns = columns.freeze()
+cached = perf_counter() - begin
+
+begin = perf_counter()
+for _ in range(queries):
+    columns = adapter.get_columns_from_cursor_descr(description)
+statement = perf_counter() - begin
+
+print(f"Queries: {queries:,} of {len(description)} columns")
+print(f"Decoded:          {uncached / queries * 1e6:,.1f} us per query")
+print(f"Cached tuples:    {cached / queries * 1e6:,.1f} us per query")
+print(f"Cached statement: {statement / queries * 1e6:,.1f} us per query")
+print(f"Speed-up: {uncached / statement:,.0f}x")
@@ -0,0 +1,58 @@
+"""
+Throughput of the external merge sort of bar records by symbol and descending time, with a
+memory budget that forces spilled runs, against sorting the records in memory by OrderKey.
+The number of records can be passed as the first argument, defaults to 500,000.
+"""
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from msfx.lib.db import Types, Value, OrderKey
+from msfx.lib.db.md import Column, ColumnList, Order
+from msfx.lib.db.rs import Record
+from msfx.lib.db.rs.sort import ExternalSorter
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+
+columns = ColumnList()
+for name, type in [("SYMBOL", Types.STRING), ("TIME", Types.DATETIME), ("OPEN", Types.FLOAT),
+                   ("HIGH", Types.FLOAT), ("LOW", Types.FLOAT), ("CLOSE", Types.FLOAT)]:
+    columns.append(Column(name=name, type=type))
+columns = columns.freeze()
+order = Order()
+order.append(columns.get_by_alias("SYMBOL"), True)
+order.append(columns.get_by_alias("TIME"), False)
+
+random.seed(1)
+start = datetime(2020, 1, 1)
+records = [Record(columns, (Value(random.choice(["EURUSD", "GBPUSD", "USDJPY", "AUDUSD"])),
+                            Value(start + timedelta(minutes=random.randint(0, 10 ** 6))),
+                            Value(1.1), Value(1.2), Value(1.0), Value(1.15)))
+           for _ in range(count)]
+
+def get_key(record: Record) -> OrderKey:
+    key = OrderKey()
+    key.append(record.get_value_by_index(0), True)
+    key.append(record.get_value_by_index(1), False)
+    return key
+
+begin = perf_counter()
+in_memory = sorted(records, key=get_key)
+memory = perf_counter() - begin
+
+with tempfile.TemporaryDirectory() as temp_dir:
+    begin = perf_counter()
+    sorter = ExternalSorter(order, columns, max_bytes=16 * 1024 * 1024, temp_dir=temp_dir)
+    sorter.add_all(records)
+    spilled = perf_counter() - begin
+    output = 0
+    for record in sorter.sort():
+        output += 1
+    external = perf_counter() - begin
+
+print(f"Records: {count:,}")
+print(f"In memory by OrderKey: {memory:.3f} s")
+print(f"External, 16 MB budget: {external:.3f} s ({spilled:.3f} s spilling {sorter.runs} runs), "
+      f"{output / external:,.0f} records per second")
@@ -0,0 +1,67 @@
+"""
+Cost of point and range lookups of bars by time with a RecordIndex, against a linear scan
+of the records. The number of bars can be passed as the first argument, defaults to 200,000.
+"""
+import random
+import sys
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from msfx.lib.db import Types, Value
+from msfx.lib.db.md import Column, ColumnList, Index
+from msfx.lib.db.rs import Record
+from msfx.lib.db.rs.index import RecordIndex
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+columns = ColumnList()
+columns.append(Column(name="TIME", type=Types.DATETIME, primary_key=True))
+columns.append(Column(name="CLOSE", type=Types.FLOAT))
+columns = columns.freeze()
+start = datetime(2024, 1, 1)
+times = [start + timedelta(minutes=i) for i in range(count)]
+records = [Record(columns, (Value(time), Value(1.1))) for time in times]
+
+index = Index()
+index.append(columns.get_by_alias("TIME"))
+index.set_unique(True)
+
+begin = perf_counter()
+record_index = RecordIndex(index, columns, records)
+build = perf_counter() - begin
+
+begin = perf_counter()
+incremental = RecordIndex(index, columns)
+for record in records:
+    incremental.insert(record)
+insert = perf_counter() - begin
+
+random.seed(1)
+lookups = [random.choice(times) for _ in range(10000)]
+begin = perf_counter()
+for time in lookups:
+    record_index.get([time])
+indexed = (perf_counter() - begin) / len(lookups)
+
+scans = 20
+begin = perf_counter()
+for time in lookups[:scans]:
+    next(record for record in records if record.get_value_by_index(0).value() == time)
+scanned = (perf_counter() - begin) / scans
+
+begin = perf_counter()
+for time in lookups:
+    record_index.get_range([time], [time + timedelta(hours=1)])
+indexed_range = (perf_counter() - begin) / len(lookups)
+
+begin = perf_counter()
+for time in lookups[:scans]:
+    end = time + timedelta(hours=1)
+    [record for record in records if time <= record.get_value_by_index(0).value() < end]
+scanned_range = (perf_counter() - begin) / scans
+
+print(f"Bars: {count:,}")
+print(f"Build: bulk {build:.3f} s, incremental {insert:.3f} s")
+print(f"Point lookup: index {indexed * 1e6:,.1f} us, scan {scanned * 1e6:,.0f} us, {scanned / indexed:,.0f}x")
+print(f"Range 1 hour: index {indexed_range * 1e6:,.1f} us, scan {scanned_range * 1e6:,.0f} us, "
+      f"{scanned_range / indexed_range:,.0f}x")
@@ -0,0 +1,44 @@
+"""
+Throughput of the select scan modes on a SQLite bar table: records, lazy records
+reading one column, and column batches. The number of rows can be passed as the
+first argument, defaults to 1,000,000.
+"""
+import sys
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from msfx.lib.db.cn.sqlite import SQLite
+
+rows_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+db = SQLite(database="file:bench_select?mode=memory&cache=shared", uri=True)
+conn = db.get_connection()
+cursor = conn.cursor()
+cursor.execute("CREATE TABLE eurusd_mn001 (time DATETIME PRIMARY KEY, open REAL, high REAL, "
+               "low REAL, close REAL, volume REAL)")
+start = datetime(2010, 1, 1)
+rows = ((start + timedelta(minutes=i), 1.1, 1.2, 1.0, 1.15, 100.0) for i in range(rows_count))
+cursor.executemany("INSERT INTO eurusd_mn001 VALUES (?, ?, ?, ?, ?, ?)", rows)
+conn.commit()
+
+select = "SELECT * FROM eurusd_mn001"
+
+def scan_records():
+    def callback(count, record): return True
+    conn.cursor().executeSelect(select, None, callback)
+def scan_lazy():
+    def callback(count, record): return record.get_value_by_alias("close").get_float() >= 0
+    conn.cursor().executeSelect(select, None, callback, lazy=True)
+def scan_batches():
+    def callback(count, batch): return True
+    conn.cursor().execute_select_columnar(select, None, callback, 50000)
+
+print(f"Rows: {rows_count:,}")
+for name, scan in [("records", scan_records), ("lazy", scan_lazy), ("batches", scan_batches)]:
+    begin = perf_counter()
+    scan()
+    seconds = perf_counter() - begin
+    print(f"{name:8}: {seconds:.3f} s, {rows_count / seconds:,.0f} rows/s")
+
+conn.close()
+db.close()
@@ -0,0 +1,41 @@
+"""
+Cost of sorting order keys of two segments, an ascending integer and a descending string,
+comparing the lists of (Value, asc) segments as before, and with the native sort keys and
+the byte encodings. The number of keys can be passed as the first argument, defaults to
+1,000,000.
+"""
+import random
+import sys
+from time import perf_counter
+
+from msfx.lib.db import Value, get_sort_key, get_sort_bytes
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+random.seed(1)
+segments = [[(Value(random.randint(0, 1000)), True), (Value(f"NAME{random.randint(0, 100000)}"), False)]
+            for _ in range(count)]
+
+begin = perf_counter()
+sorted(segments)
+before = perf_counter() - begin
+
+begin = perf_counter()
+keys = [get_sort_key(key) for key in segments]
+build = perf_counter() - begin
+begin = perf_counter()
+keys.sort()
+native = perf_counter() - begin
+
+begin = perf_counter()
+encoded = [get_sort_bytes(key) for key in segments]
+encode = perf_counter() - begin
+begin = perf_counter()
+encoded.sort()
+memcmp = perf_counter() - begin
+
+print(f"Keys: {count:,}")
+print(f"Segment lists (Value compare, ascending only): {before:.3f} s")
+print(f"Native keys: build {build:.3f} s, sort {native:.3f} s")
+print(f"Byte keys:   build {encode:.3f} s, sort {memcmp:.3f} s")
+print(f"Sort speed-up: {before / native:.1f}x native, {before / memcmp:.1f}x bytes")
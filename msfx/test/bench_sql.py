@@ -0,0 +1,56 @@
+"""
+Cost of getting the statements of a bar table, building the name signature to look up an LRU
+cache of the renderers on every call, against the statement cache keyed by the table version.
+"""
+from functools import lru_cache
+from time import perf_counter
+
+from msfx.lib.db import Types
+from msfx.lib.db.cn.sqlite import SQLiteAdapter
+from msfx.lib.db.md import Column, Index, Table
+from msfx.lib.db.sql import get_names, get_segment_names, get_select, get_insert, get_update, get_where
+from msfx.lib.db.sql import _render_select, _render_insert, _render_update
+
+_render_select = lru_cache(maxsize=1024)(_render_select)
+_render_insert = lru_cache(maxsize=1024)(_render_insert)
+_render_update = lru_cache(maxsize=1024)(_render_update)
+
+calls = 100000
+
+table = Table()
+table.set_name("eurusd_mn001")
+for name, type in [("time", Types.DATETIME), ("open", Types.FLOAT), ("high", Types.FLOAT),
+                   ("low", Types.FLOAT), ("close", Types.FLOAT), ("volume", Types.FLOAT)]:
+    table.append_column(Column(name=name, type=type, primary_key=(name == "time")))
+primary_key = Index()
+primary_key.append(table.columns.get_by_alias("time"))
+table.set_primary_key(primary_key)
+adapter = SQLiteAdapter()
+
+def signature_select():
+    where = get_segment_names(primary_key)
+    return _render_select(adapter.get_table_name(table), get_names(table.columns), where, (), None)
+def signature_insert():
+    return _render_insert(adapter.get_table_name(table), get_names(table.columns))
+def signature_update():
+    where = get_segment_names(get_where(table, None))
+    where_names = [name for name, _ in where]
+    names = tuple([name for name in get_names(table.columns) if name not in where_names])
+    return _render_update(adapter.get_table_name(table), names, where)
+
+def table_select(): return get_select(adapter, table, where=primary_key)
+def table_insert(): return get_insert(adapter, table)
+def table_update(): return get_update(adapter, table)
+
+for kind, signature, table_get in [("select", signature_select, table_select),
+                                ("insert", signature_insert, table_insert),
+                                ("update", signature_update, table_update)]:
+    assert signature() == table_get()
+    times = []
+    for get in (signature, table_get):
+        begin = perf_counter()
+        for _ in range(calls):
+            get()
+        times.append(perf_counter() - begin)
+    print(f"{kind}: signature {times[0] / calls * 1e6:.2f} us, table {times[1] / calls * 1e6:.2f} us, "
+          f"{times[0] / times[1]:.1f}x")
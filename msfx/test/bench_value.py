@@ -0,0 +1,112 @@
+"""
+Memory and throughput of Value against the previous implementation, which
+carried a __dict__ and built the list of type matching lambdas on every set.
+The number of values can be passed as the first argument, defaults to 1,000,000.
+"""
+import sys
+from time import perf_counter
+import tracemalloc
+from datetime import date, time, datetime
+from decimal import Decimal
+from typing import Optional
+
+from msfx.lib import round_num
+from msfx.lib.db import Types, Value
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+class LegacyValue:
+    """ The previous Value, limited to construction and set. """
+    def __init__(self, value):
+        if value is None: raise TypeError(f"Value can not be {None}.")
+        if isinstance(value, Types):
+            if value not in Types.get_types_none():
+                raise TypeError(f"Only types {Types.get_types_none()} accept a None value")
+        self.__value = None
+        self.__type: Optional[Types] = None
+        self.__modified: bool = False
+        if isinstance(value, Types):
+            self.__type = value
+            return
+        self.__type = Types.get_type(value)
+        self.__value = value
+
+    def is_boolean(self) -> bool: return self.__type == Types.BOOLEAN
+    def is_decimal(self) -> bool: return self.__type == Types.DECIMAL
+    def is_integer(self) -> bool: return self.__type == Types.INTEGER
+    def is_float(self) -> bool: return self.__type == Types.FLOAT
+    def is_complex(self) -> bool: return self.__type == Types.COMPLEX
+    def is_numeric(self) -> bool: return self.__type in Types.get_types_numeric()
+    def is_date(self) -> bool: return self.__type == Types.DATE
+    def is_time(self) -> bool: return self.__type == Types.TIME
+    def is_datetime(self) -> bool: return self.__type == Types.DATETIME
+    def is_binary(self) -> bool: return self.__type == Types.BINARY
+    def is_string(self) -> bool: return self.__type == Types.STRING
+    def is_list(self) -> bool: return self.__type == Types.LIST
+    def is_dict(self) -> bool: return self.__type == Types.DICT
+    def get_scale(self) -> int:
+        if self.is_integer(): return 0
+        return abs(int(Decimal(self.__value).as_tuple().exponent))
+
+    def __set__(self, value):
+        if value is None:
+            if self.__type not in (Types.DATE, Types.TIME, Types.DATETIME):
+                raise ValueError("Value can only be None for types DATE, TIME, DATETIME.")
+        exact_matches = [
+            (lambda v: isinstance(v, bool), lambda: self.is_boolean()),
+            (lambda v: isinstance(v, Decimal), lambda: self.is_decimal()),
+            (lambda v: isinstance(v, int), lambda: self.is_integer()),
+            (lambda v: isinstance(v, float), lambda: self.is_float()),
+            (lambda v: isinstance(v, complex), lambda: self.is_complex()),
+            (lambda v: isinstance(v, date), lambda: self.is_date()),
+            (lambda v: isinstance(v, time), lambda: self.is_time()),
+            (lambda v: isinstance(v, datetime), lambda: self.is_datetime()),
+            (lambda v: isinstance(v, (bytes, bytearray)), lambda: self.is_binary()),
+            (lambda v: isinstance(v, str), lambda: self.is_string()),
+            (lambda v: isinstance(v, list), lambda: self.is_list()),
+            (lambda v: isinstance(v, dict), lambda: self.is_dict())
+        ]
+        for value_type, self_type in exact_matches:
+            if value_type(value) and self_type():
+                self.__value = value
+                self.__modified = True
+                return
+        if isinstance(value, (Decimal, int, float, complex)) and self.is_numeric():
+            if isinstance(value, complex): value = value.real
+            if self.is_decimal():
+                self.__value = round_num(value, self.get_scale())
+            else:
+                if self.is_integer(): self.__value = int(value)
+                if self.is_float(): self.__value = float(value)
+                if self.is_complex(): self.__value = complex(value)
+            self.__modified = True
+            return
+        raise TypeError("Argument type does not match this value type")
+
+def measure(clazz):
+    raw = [float(i) for i in range(count)]
+
+    tracemalloc.start()
+    begin = perf_counter()
+    values = [clazz(r) for r in raw]
+    create_secs = perf_counter() - begin
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    begin = perf_counter()
+    for v in values: v.__set__(1.5)
+    for v in values: v.__set__(2)
+    set_secs = perf_counter() - begin
+
+    print(f"{clazz.__name__}:")
+    print(f"  memory: {memory / 1024 / 1024:,.1f} MB, {memory / count:,.0f} bytes per value")
+    print(f"  create: {create_secs:.3f} s, {count / create_secs:,.0f} values/s")
+    print(f"  set:    {set_secs:.3f} s, {2 * count / set_secs:,.0f} sets/s")
+    return memory, create_secs, set_secs
+
+print(f"Values: {count:,}")
+legacy = measure(LegacyValue)
+slotted = measure(Value)
+print(f"Memory ratio: {legacy[0] / slotted[0]:.2f}x")
+print(f"Create speed-up: {legacy[1] / slotted[1]:.2f}x")
+print(f"Set speed-up: {legacy[2] / slotted[2]:.2f}x")
@@ -0,0 +1,52 @@
+""" Parse a synthetic Visual Chart file, the size in MB is the first argument, default 512. """
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+import numpy as np
+
+from msfx.lib_back2.mk.data import MkDataVChart
+
+size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+
+with tempfile.TemporaryDirectory() as path:
+    file_name = os.path.join(path, "FX_EUR_USD_MIN_001.txt")
+    start = np.datetime64("2000-01-01T00:00")
+    lines_per_block = 200000
+    lines = 0
+    with open(file_name, "w") as file:
+        file.write("<TICKER>,<PER>,<DTYYYYMMDD>,<TIME>,<OPEN>,<HIGH>,<LOW>,<CLOSE>,<VOL>,<OPENINT>\n")
+        rng = np.random.default_rng(0)
+        while file.tell() < size_mb * 1024 * 1024:
+            times = start + np.arange(lines, lines + lines_per_block).astype("timedelta64[m]")
+            text = np.datetime_as_string(times, unit="m")
+            prices = 1.1 + rng.random(lines_per_block) / 10
+            file.write("".join(f"EURUSD,1,{t[0:4]}{t[5:7]}{t[8:10]},{t[11:13]}{t[14:16]}00,"
+                               f"{p:.5f},{p + 0.0002:.5f},{p - 0.0002:.5f},{p + 0.0001:.5f},{v},0\n"
+                               for t, p, v in zip(text, prices, range(lines_per_block))))
+            lines += lines_per_block
+    mb = os.path.getsize(file_name) / 1024 / 1024
+
+    mk_data = MkDataVChart()
+    start_time = perf_counter()
+    count = 0
+    for bars in mk_data.get_ticker_chunks(file_name=file_name):
+        count += len(bars.time)
+    seconds = perf_counter() - start_time
+    print(f"{count} lines, {mb:.0f} MB in {seconds:.2f} s, {count / seconds:,.0f} lines/s, {mb / seconds:.1f} MB/s")
+
+    # Reference, line by line parsing with the standard library.
+    from datetime import datetime
+    start_time = perf_counter()
+    count = 0
+    with open(file_name) as file:
+        next(file)
+        for line in file:
+            fields = line.split(",")
+            bar = (datetime.strptime(fields[2] + fields[3], "%Y%m%d%H%M%S"),
+                   float(fields[4]), float(fields[5]), float(fields[6]), float(fields[7]), float(fields[8]))
+            count += 1
+            if count == 1000000: break
+    seconds = perf_counter() - start_time
+    print(f"Line by line: {count / seconds:,.0f} lines/s")
@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+
+from msfx.lib.db import Types, Value
+from msfx.lib.db.cn.sqlite import SQLite
+from msfx.lib.db.md import Column, Table, Index
+
+db = SQLite(database=":memory:")
+conn = db.get_connection()
+cursor = conn.cursor()
+cursor.execute("CREATE TABLE eurusd_hr001 "
+               "(time DATETIME PRIMARY KEY, open REAL, high REAL, low REAL, close REAL, volume REAL)")
+cursor.close()
+
+table = Table()
+table.set_name("eurusd_hr001")
+for name, type in [("time", Types.DATETIME), ("open", Types.FLOAT), ("high", Types.FLOAT),
+                   ("low", Types.FLOAT), ("close", Types.FLOAT), ("volume", Types.FLOAT)]:
+    table.append_column(Column(name=name, type=type, primary_key=(name == "time")))
+
+primary_key = Index()
+primary_key.append(table.columns.get_by_alias("time"))
+table.set_primary_key(primary_key)
+
+print(db.get_adapter().get_bulk_insert(table, "update"))
+
+start = datetime(2020, 1, 1)
+rows = ((start + timedelta(hours=i), 1.1, 1.2, 1.0, 1.15, 100.0) for i in range(100000))
+stats = conn.bulk_insert(table, rows, batch_size=5000)
+print(stats)
+
+# Update on duplicate, with rows of values.
+rows = [(Value(start + timedelta(hours=i)), Value(2.1), Value(2.2), Value(2.0), Value(2.15), Value(200.0))
+        for i in range(10)]
+print(conn.bulk_insert(table, rows, batch_size=4, commit_interval=2))
+
+cursor = conn.cursor()
+cursor.execute("SELECT COUNT(*), SUM(close) FROM eurusd_hr001")
+print(cursor.fetchone())
+cursor.close()
+conn.close()
+db.close()
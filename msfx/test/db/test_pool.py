@@ -0,0 +1,72 @@
+import threading
+import time
+
+from msfx.lib.db.cn.pool import BoundedPool
+
+class FakeConnection:
+    count = 0
+    def __init__(self):
+        FakeConnection.count += 1
+        self.id = FakeConnection.count
+        self.alive = True
+        self.closed = False
+    def ping(self):
+        if not self.alive: raise ConnectionError("Server has gone away")
+    def rollback(self): pass
+    def close(self): self.closed = True
+
+# Prewarm and reuse.
+pool = BoundedPool(FakeConnection, max_size=2, acquire_timeout=0.1, max_waiting=1, prewarm=2,
+                   validate=lambda conn: conn.ping(), reset=lambda conn: conn.rollback())
+print(pool.get_stats())
+with pool.connection() as conn:
+    print("Reused prewarmed", conn.id)
+
+# Timeout when exhausted.
+conn_1 = pool.acquire()
+conn_2 = pool.acquire()
+try:
+    pool.acquire()
+except TimeoutError as e:
+    print("Timeout:", e)
+
+# Rejection when max waiting are already waiting.
+waiter = threading.Thread(target=lambda: pool.release(pool.acquire(timeout=1.0)))
+waiter.start()
+time.sleep(0.05)
+try:
+    pool.acquire()
+except RuntimeError as e:
+    print("Rejected:", e)
+pool.release(conn_1)
+waiter.join()
+
+# Invalid idle connections are evicted and replaced.
+conn_2.alive = False
+pool.release(conn_2)
+conn_3 = pool.acquire()
+conn_4 = pool.acquire()
+print("Evicted", conn_2.closed, "new", conn_3.id, conn_4.id)
+pool.release(conn_3)
+pool.release(conn_4)
+
+stats = pool.get_stats()
+print(stats)
+print("Waited ms histogram", {k: v for k, v in stats.waited_ms.items() if v > 0})
+
+pool.close()
+try:
+    pool.acquire()
+except PermissionError as e:
+    print("Closed:", e)
+
+# Closing a pooled connection twice does not close the raw connection lent to the next borrower.
+from msfx.lib.db.cn.sqlite import SQLite
+db = SQLite(database="file:test_pool_close?mode=memory&cache=shared", uri=True, pool_size=1)
+with db.get_connection() as conn:
+    pass
+conn.close()
+cursor = db.get_connection().cursor()
+cursor.execute("SELECT 1")
+print("Double close", cursor.fetchone())
+db.close()
@@ -0,0 +1,78 @@
+import time
+from datetime import datetime, timedelta
+
+from msfx.lib.db import Types, Value
+from msfx.lib.db.cn.sqlite import SQLite
+from msfx.lib.db.md import Column, Table, Index, Order
+from msfx.lib.db.rs import Record
+from msfx.lib.db import sql
+
+db = SQLite(database=":memory:")
+adapter = db.get_adapter()
+
+table = Table()
+table.set_name("eurusd_mn001")
+for name, type in [("time", Types.DATETIME), ("open", Types.FLOAT), ("high", Types.FLOAT),
+                   ("low", Types.FLOAT), ("close", Types.FLOAT), ("volume", Types.FLOAT)]:
+    table.append_column(Column(name=name, type=type, primary_key=(name == "time")))
+primary_key = Index()
+primary_key.append(table.columns.get_by_alias("time"))
+table.set_primary_key(primary_key)
+
+order = Order()
+order.append(table.columns.get_by_alias("time"), False)
+
+print(sql.get_select(adapter, table, where=primary_key))
+print(sql.get_select(adapter, table, order=order, limit=10))
+print(sql.get_insert(adapter, table))
+print(sql.get_update(adapter, table))
+print(sql.get_delete(adapter, table))
+
+# Render many times, all but the first are cache hits.
+sql.cache_clear()
+start_time = time.perf_counter()
+for _ in range(10000): sql.get_select(adapter, table, where=primary_key)
+info = sql.cache_info()["select"]
+assert (info.hits, info.misses) == (9999, 1), info
+print(f"10000 selects in {time.perf_counter() - start_time:.3f} s", info)
+
+# A change of the table renders the statement again.
+table.set_schema("main")
+print(sql.get_select(adapter, table, where=primary_key), sql.cache_info()["select"].misses)
+table.set_schema("")
+
+conn = db.get_connection()
+cursor = conn.cursor()
+cursor.execute("CREATE TABLE eurusd_mn001 (time DATETIME PRIMARY KEY, open REAL, high REAL, "
+               "low REAL, close REAL, volume REAL)")
+cursor.close()
+start = datetime(2024, 1, 1)
+conn.bulk_insert(table, ((start + timedelta(minutes=i), 1.1, 1.2, 1.0, 1.15, float(i)) for i in range(10000)))
+
+# Repeated parameterized lookups on the prepared cursor.
+columns = table.columns
+lookup = sql.get_select(adapter, table, where=primary_key)
+start_time = time.perf_counter()
+for i in range(10000):
+    record = Record(columns, tuple([Value(start + timedelta(minutes=i))] + [Value(0.0)] * 5))
+    cursor = conn.prepared(lookup)
+    cursor.execute(lookup, data=sql.get_key_params(adapter, primary_key, record))
+    row = cursor.fetchone()
+    assert row[5] == float(i)
+print(f"10000 lookups in {time.perf_counter() - start_time:.3f} s, same cursor {conn.prepared(lookup) is cursor}")
+
+# Update and delete by primary key.
+record = Record(columns, (Value(start), Value(2.1), Value(2.2), Value(2.0), Value(2.15), Value(-1.0)))
+update = sql.get_update(adapter, table)
+conn.prepared(update).execute(update, data=sql.get_update_params(adapter, table, record))
+delete = sql.get_delete(adapter, table)
+conn.prepared(delete).execute(delete, data=sql.get_key_params(adapter, primary_key,
+                              Record(columns, (Value(start + timedelta(minutes=1)),) + (Value(0.0),) * 5)))
+conn.commit()
+cursor = conn.prepared(lookup)
+cursor.execute(lookup, data=(start,))
+print(cursor.fetchone())
+cursor.execute(lookup, data=(start + timedelta(minutes=1),))
+print(cursor.fetchone())
+conn.close()
+db.close()
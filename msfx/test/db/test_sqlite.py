@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from msfx.lib.db import Types
+from msfx.lib.db.cn.sqlite import SQLite
+from msfx.lib.db.md import Column, ColumnList
+from msfx.lib.db.rs import Record
+from msfx.lib.db.rs.batch import ColumnBatch
+
+db = SQLite(database="file:test_sqlite?mode=memory&cache=shared", uri=True, pool_size=2)
+
+conn = db.get_connection()
+cursor = conn.cursor()
+cursor.execute("CREATE TABLE eurusd_hr001 (time DATETIME PRIMARY KEY, open REAL, high REAL, "
+               "low REAL, close REAL, volume INTEGER, spread DECIMAL(6,2), symbol TEXT)")
+start = datetime(2024, 1, 1)
+rows = [(start + timedelta(hours=i), 1.1, 1.2, 1.0, 1.15, i, Decimal("0.25"), "EURUSD") for i in range(1000)]
+cursor.executemany("INSERT INTO eurusd_hr001 VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+conn.commit()
+conn.close()
+
+# Columns from the cursor description.
+conn = db.get_connection()
+cursor = conn.cursor()
+def callback(count: int, rec: Record) -> bool:
+    if count <= 3: print("#{}, {}".format(count, rec))
+    return True
+cursor.executeSelect("SELECT * FROM eurusd_hr001", None, callback)
+
+cursor = conn.cursor()
+cursor.execute("SELECT * FROM eurusd_hr001")
+for descr in cursor.description:
+    print(descr, db.get_adapter().get_column_from_cursor_descr(descr))
+cursor.close()
+
+# Lazy records.
+closes = []
+def lazy_callback(count: int, rec: Record) -> bool:
+    closes.append(rec.get_value_by_alias("close").get_float())
+    return True
+cursor = conn.cursor()
+cursor.executeSelect("SELECT * FROM eurusd_hr001", None, lazy_callback, lazy=True)
+print(len(closes), sum(closes))
+
+# Column batches with explicit columns.
+columns = ColumnList()
+columns.append(Column(name="TIME", type=Types.DATETIME))
+columns.append(Column(name="CLOSE", type=Types.FLOAT))
+def batch_callback(count: int, batch: ColumnBatch) -> bool:
+    print("#{}, {}, {}".format(count, batch.size(), batch.get_array_by_alias("TIME")[-1]))
+    return True
+cursor = conn.cursor()
+cursor.execute_select_columnar("SELECT time, close FROM eurusd_hr001", columns, batch_callback, 300)
+
+# Nulls in the first row, columns typed by the first non-null values.
+cursor = conn.cursor()
+cursor.execute("CREATE TABLE nulls (a INTEGER, b DATETIME)")
+cursor.executemany("INSERT INTO nulls VALUES (?, ?)", [(None, None)] + [(i, start + timedelta(hours=i)) for i in range(1, 4)])
+conn.commit()
+cursor.close()
+cursor = conn.cursor()
+cursor.executeSelect("SELECT a, b FROM nulls", None, callback)
+for rec in conn.cursor().stream("SELECT a, b FROM nulls"):
+    print(rec)
+
+# ISO looking text in a TEXT column stays text.
+cursor = conn.cursor()
+cursor.execute("CREATE TABLE codes (code TEXT)")
+cursor.executemany("INSERT INTO codes VALUES (?)", [("2024-01-01",), ("N/A",)])
+conn.commit()
+cursor.close()
+cursor = conn.cursor()
+cursor.executeSelect("SELECT code FROM codes", None, callback)
+
+conn.close()
+db.close()
@@ -0,0 +1,84 @@
+import asyncio
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from msfx.lib.db.cn.aio import AsyncDB
+from msfx.lib.db.cn.sqlite import SQLite
+
+async def main():
+    adb = AsyncDB(SQLite(database="file:test_sqlite_async?mode=memory&cache=shared", uri=True, pool_size=4),
+                  max_workers=4)
+
+    async with adb.connection() as conn:
+        cursor = conn.cursor()
+        await cursor.execute("CREATE TABLE eurusd_mn001 (time DATETIME PRIMARY KEY, open REAL, high REAL, "
+                             "low REAL, close REAL, volume REAL)")
+        start = datetime(2024, 1, 1)
+        await cursor.executemany("INSERT INTO eurusd_mn001 VALUES (?, ?, ?, ?, ?, ?)",
+                                 [(start + timedelta(minutes=i), 1.1, 1.2, 1.0, 1.15, 100.0)
+                                  for i in range(100000)])
+        await conn.commit()
+
+    # Concurrent streams, each on its own pooled connection.
+    async def count(month: int) -> int:
+        select = (f"SELECT * FROM eurusd_mn001 WHERE time >= '2024-{month:02d}-01' "
+                  f"AND time < '2024-{month + 1:02d}-01'")
+        rows = 0
+        async with adb.connection() as conn:
+            async for record in conn.cursor().stream(select, chunk_size=5000):
+                rows += 1
+        return rows
+    start_time = time.perf_counter()
+    counts = await asyncio.gather(*[count(month) for month in (1, 2, 3)])
+    print("Counts", counts, f"{time.perf_counter() - start_time:.3f} s")
+
+    # The event loop keeps running while streaming.
+    ticks = 0
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+    task = asyncio.create_task(ticker())
+    async with adb.connection() as conn:
+        batches = [batch async for batch in conn.cursor().stream("SELECT * FROM eurusd_mn001", columnar=True)]
+    task.cancel()
+    print("Batches", len(batches), "ticks while streaming", ticks > 0)
+
+    # Cancellation closes the cursor.
+    async with adb.connection() as conn:
+        cursor = conn.cursor()
+        async def consume():
+            async with cursor.stream("SELECT * FROM eurusd_mn001", chunk_size=100) as records:
+                async for _ in records:
+                    await asyncio.sleep(0.01)
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            print("Cancelled, fetched", cursor.fetch_stats.total_rows)
+        try:
+            await cursor.fetchone()
+        except sqlite3.ProgrammingError as e:
+            print("Cursor closed:", e)
+
+    await adb.close()
+
+    # More callers than connections and workers, those waiting do not hold the query threads.
+    small = AsyncDB(SQLite(database="file:test_sqlite_async_small?mode=memory&cache=shared", uri=True,
+                           pool_size=2, acquire_timeout=3), max_workers=2)
+    async def job():
+        async with small.connection() as conn:
+            cursor = conn.cursor()
+            await cursor.execute("SELECT 1")
+            await asyncio.sleep(0.2)
+            await cursor.close()
+    start = time.perf_counter()
+    await asyncio.gather(*[job() for _ in range(4)])
+    print("Waiting callers done before the timeout", time.perf_counter() - start < 3)
+    await small.close()
+
+asyncio.run(main())
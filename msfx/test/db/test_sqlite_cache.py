@@ -0,0 +1,74 @@
+import time
+from datetime import datetime, timedelta
+
+from msfx.lib.db import Types
+from msfx.lib.db.cn.cache import ResultCache, get_tables
+from msfx.lib.db.cn.sqlite import SQLite
+from msfx.lib.db.md import Column, Table
+
+db = SQLite(database=":memory:")
+
+table = Table()
+table.set_name("eurusd_mn001")
+for name, type in [("time", Types.DATETIME), ("open", Types.FLOAT), ("high", Types.FLOAT),
+                   ("low", Types.FLOAT), ("close", Types.FLOAT), ("volume", Types.FLOAT)]:
+    table.append_column(Column(name=name, type=type, primary_key=(name == "time")))
+
+conn = db.get_connection()
+cursor = conn.cursor()
+cursor.execute("CREATE TABLE eurusd_mn001 (time DATETIME PRIMARY KEY, open REAL, high REAL, "
+               "low REAL, close REAL, volume REAL)")
+cursor.close()
+start = datetime(2024, 1, 1)
+conn.bulk_insert(table, ((start + timedelta(minutes=i), 1.1, 1.2, 1.0, 1.15, float(i)) for i in range(50000)))
+
+now = [0.0]
+cache = ResultCache(max_bytes=32 * 1024 * 1024, clock=lambda: now[0])
+cache.set_ttl("eurusd_mn001", 60)
+
+select = "SELECT * FROM eurusd_mn001 WHERE time < '2024-01-20'"
+def scan(select: str, columns=None) -> tuple:
+    result = [0, 0.0]
+    def callback(count, record):
+        result[0] = count
+        result[1] += record.get_value_by_alias("volume").value()
+        return True
+    start_time = time.perf_counter()
+    conn.cursor().executeSelect(select, columns, callback, cache=cache)
+    return result[0], result[1], f"{time.perf_counter() - start_time:.3f} s"
+
+print("Miss", scan(select))
+print("Hit ", scan(select))
+print("With columns, another key", scan(select, table.columns))
+print(cache.get_stats())
+
+# Expired by the table TTL.
+now[0] = 61
+print("Expired", scan(select), cache.get_stats().expirations)
+
+# A stopped scan is not cached.
+conn.cursor().executeSelect("SELECT * FROM eurusd_mn001", None, lambda count, record: count < 10, cache=cache)
+print("Entries after partial scan", cache.get_stats().entries)
+
+# The bulk writer invalidates the results of the table.
+conn.bulk_insert(table, [(start + timedelta(minutes=100000), 1.1, 1.2, 1.0, 1.15, 1.0)], cache=cache)
+print("After write", cache.get_stats())
+
+# Rows read before a write of their table are not cached.
+generation = cache.get_generation()
+cache.invalidate("eurusd_mn001")
+print("Stale put", cache.put("SELECT 1 FROM eurusd_mn001", None, table.columns, [(1,)], generation=generation),
+      cache.get_stats().stale)
+
+# Tables of comma separated lists and joins.
+print(get_tables("SELECT * FROM a, db.b AS x, `c` y WHERE a.id = x.id"))
+print(get_tables("SELECT * FROM a JOIN b ON a.id = b.id, (SELECT * FROM c) s LEFT JOIN d USING (id)"))
+
+# Size bounded, least recently used evicted.
+small = ResultCache(max_bytes=100 * 1024, max_entry_bytes=64 * 1024)
+for hour in range(1, 6):
+    conn.cursor().executeSelect(f"SELECT * FROM eurusd_mn001 WHERE time < '2024-01-01 {hour:02d}:00:00'",
+                                None, lambda count, record: True, cache=small)
+print("Small", small.get_stats())
+conn.close()
+db.close()
@@ -0,0 +1,40 @@
+import time
+from datetime import datetime, timedelta
+
+from msfx.lib.db.cn import AdaptiveFetch
+from msfx.lib.db.cn.sqlite import SQLite
+
+db = SQLite(database="file:test_sqlite_fetch?mode=memory&cache=shared", uri=True)
+
+conn = db.get_connection()
+cursor = conn.cursor()
+cursor.execute("CREATE TABLE eurusd_mn001 (time DATETIME PRIMARY KEY, open REAL, high REAL, "
+               "low REAL, close REAL, volume REAL)")
+start = datetime(2024, 1, 1)
+cursor.executemany("INSERT INTO eurusd_mn001 VALUES (?, ?, ?, ?, ?, ?)",
+                   [(start + timedelta(minutes=i), 1.1, 1.2, 1.0, 1.15, 100.0) for i in range(200000)])
+conn.commit()
+
+# fetchmany honors the size.
+cursor = conn.cursor()
+cursor.execute("SELECT * FROM eurusd_mn001")
+print(len(cursor.fetchmany(7)), len(cursor.fetchmany(250)))
+cursor.close()
+
+# Adaptive sizes grow towards the target bytes per round trip.
+cursor = conn.cursor()
+adaptive = AdaptiveFetch(target_bytes=2 * 1024 * 1024, initial_size=100)
+def callback(count, batch): return True
+cursor.execute_select_columnar("SELECT * FROM eurusd_mn001", None, callback, adaptive)
+print(cursor.fetch_stats)
+
+# A slow consumer shrinks the chunks.
+cursor = conn.cursor()
+adaptive = AdaptiveFetch(initial_size=4000, max_latency=0.01)
+for batch in cursor.stream("SELECT * FROM eurusd_mn001", chunk_size=adaptive, columnar=True):
+    time.sleep(0.02)
+    if cursor.fetch_stats.round_trips >= 6: break
+print(cursor.fetch_stats.chunk_sizes)
+
+conn.close()
+db.close()
@@ -0,0 +1,71 @@
+import time
+from datetime import datetime, timedelta
+
+from msfx.lib.db import Types, Value, OrderKey
+from msfx.lib.db.cn.sqlite import SQLite
+from msfx.lib.db.md import Column, Table, Index, Order
+from msfx.lib.db.sql import get_keyset_select
+from msfx.lib.db.sql.pager import KeysetPager
+
+db = SQLite(database="file:test_sqlite_pager?mode=memory&cache=shared", uri=True)
+
+table = Table()
+table.set_name("eurusd_mn001")
+for name, type in [("time", Types.DATETIME), ("open", Types.FLOAT), ("high", Types.FLOAT),
+                   ("low", Types.FLOAT), ("close", Types.FLOAT), ("volume", Types.INTEGER)]:
+    table.append_column(Column(name=name, type=type, primary_key=(name == "time")))
+primary_key = Index()
+primary_key.append(table.columns.get_by_alias("time"))
+table.set_primary_key(primary_key)
+
+conn = db.get_connection()
+cursor = conn.cursor()
+cursor.execute("CREATE TABLE eurusd_mn001 (time DATETIME PRIMARY KEY, open REAL, high REAL, "
+               "low REAL, close REAL, volume INTEGER)")
+cursor.execute("CREATE INDEX eurusd_mn001_volume ON eurusd_mn001 (volume DESC, time)")
+cursor.close()
+start = datetime(2024, 1, 1)
+conn.bulk_insert(table, ((start + timedelta(minutes=i), 1.1, 1.2, 1.0, 1.15, i % 100) for i in range(200000)),
+                 batch_size=10000)
+conn.close()
+
+# Volume descending, not unique, the primary key is appended.
+order = Order()
+order.append(table.columns.get_by_alias("volume"), False)
+print(get_keyset_select(db.get_adapter(), table, table.columns,
+                        [(table.columns.get_by_alias("volume"), False), (table.columns.get_by_alias("time"), True)],
+                        True, True, 100))
+
+pager = KeysetPager(db, table, order, page_size=1000)
+count = 0
+last = None
+in_order = True
+start_time = time.perf_counter()
+for page in pager.pages():
+    for record in page:
+        key = (-record.get_value_by_index(5).value(), record.get_value_by_index(0).value())
+        if last is not None and key <= last: in_order = False
+        last = key
+        count += 1
+print(f"Forward {count} records in order {in_order}, {time.perf_counter() - start_time:.3f} s")
+
+# Deep page cost does not grow, seek to the end and step backward.
+pager = KeysetPager(db, table, primary_key, page_size=500)
+first = pager.first_page()
+start_time = time.perf_counter()
+last_page = pager.last_page()
+print("Last page", last_page[-1].get_value_by_index(0), f"{time.perf_counter() - start_time:.4f} s")
+previous = pager.previous_page()
+print("Previous", previous[0].get_value_by_index(0), previous[-1].get_value_by_index(0))
+following = pager.next_page()
+print("Next equals last", following[0].get_value_by_index(0) == last_page[0].get_value_by_index(0))
+print("After last", pager.next_page(), pager.last_key[0][0])
+
+# Seek to a key.
+key = OrderKey()
+key.append(Value(start + timedelta(days=30)), True)
+page = pager.seek(key)
+print("Seek", page[0].get_value_by_index(0))
+backward = sum(len(page) for page in pager.pages(forward=False))
+print("Backward", backward)
+db.close()
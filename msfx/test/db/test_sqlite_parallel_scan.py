@@ -0,0 +1,65 @@
+import time
+from datetime import datetime, timedelta
+
+from msfx.lib.db import Types
+from msfx.lib.db.cn.scan import parallel_scan, get_ranges
+from msfx.lib.db.cn.sqlite import SQLite
+from msfx.lib.db.md import Column, Table
+
+db = SQLite(database="file:test_sqlite_parallel_scan?mode=memory&cache=shared", uri=True, pool_size=5)
+
+table = Table()
+table.set_name("eurusd_mn001")
+for name, type in [("time", Types.DATETIME), ("open", Types.FLOAT), ("high", Types.FLOAT),
+                   ("low", Types.FLOAT), ("close", Types.FLOAT), ("volume", Types.FLOAT)]:
+    table.append_column(Column(name=name, type=type, primary_key=(name == "time")))
+
+conn = db.get_connection()
+cursor = conn.cursor()
+cursor.execute("CREATE TABLE eurusd_mn001 (time DATETIME PRIMARY KEY, open REAL, high REAL, "
+               "low REAL, close REAL, volume REAL)")
+cursor.close()
+start = datetime(2024, 1, 1)
+conn.bulk_insert(table, ((start + timedelta(minutes=i), 1.1, 1.2, 1.0, 1.15, float(i)) for i in range(200000)),
+                 batch_size=10000)
+conn.close()
+
+print(get_ranges(0, 9, 4))
+print(get_ranges(start, start + timedelta(days=3), 3))
+
+# Ordered merge, records in order of time.
+last = None
+ordered = True
+def callback(count, record):
+    global last, ordered
+    time = record.get_value_by_alias("time").value()
+    if last is not None and time <= last: ordered = False
+    last = time
+    return True
+for workers in (1, 4):
+    start_time = time.perf_counter()
+    count = parallel_scan(db, table, "time", 8, callback, workers=workers, chunk_size=5000)
+    print(f"Ordered, workers {workers}, {count} records, in order {ordered}, "
+          f"{time.perf_counter() - start_time:.3f} s")
+    last = None
+
+# Unordered, all records once.
+volumes = set()
+def collect(count, record):
+    volumes.add(record.get_value_by_alias("volume").value())
+    return True
+count = parallel_scan(db, table, "time", 8, collect, workers=4, ordered=False)
+print("Unordered", count, len(volumes) == 200000)
+
+# Explicit ranges and early stop.
+ranges = [(start, start + timedelta(days=1)), (start + timedelta(days=10), start + timedelta(days=11))]
+count = parallel_scan(db, table, "time", ranges, lambda count, record: True, workers=2)
+print("Ranges", count)
+count = parallel_scan(db, table, "time", 8, lambda count, record: count < 100, workers=4)
+print("Stopped at", count)
+
+try:
+    parallel_scan(db, table, "time", [(1, 5), (4, 8)], callback)
+except ValueError as e:
+    print(e)
+db.close()
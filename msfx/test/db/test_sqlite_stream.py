@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+from itertools import islice
+
+from msfx.lib.db.cn.sqlite import SQLite
+
+db = SQLite(database="file:test_sqlite_stream?mode=memory&cache=shared", uri=True)
+
+conn = db.get_connection()
+cursor = conn.cursor()
+cursor.execute("CREATE TABLE eurusd_hr004 (time DATETIME PRIMARY KEY, close REAL)")
+start = datetime(2024, 1, 1)
+cursor.executemany("INSERT INTO eurusd_hr004 VALUES (?, ?)",
+                   [(start + timedelta(hours=4 * i), 1.1 + i * 0.0001) for i in range(10000)])
+conn.commit()
+
+# Compose with itertools, closing the generator early releases the cursor.
+cursor = conn.cursor()
+records = cursor.stream("SELECT * FROM eurusd_hr004", chunk_size=500)
+for record in islice(records, 3):
+    print(record)
+records.close()
+try:
+    cursor.fetchone()
+except Exception as e:
+    print("Cursor closed:", e)
+
+# Filter lazily.
+cursor = conn.cursor()
+records = cursor.stream("SELECT * FROM eurusd_hr004", chunk_size=500, lazy=True)
+print(sum(1 for r in records if r.get_value_by_alias("close").get_float() > 1.5))
+
+# Column batches.
+cursor = conn.cursor()
+for batch in cursor.stream("SELECT * FROM eurusd_hr004", chunk_size=4000, columnar=True):
+    print(batch.size(), batch.get_array_by_alias("close").max())
+
+conn.close()
+db.close()
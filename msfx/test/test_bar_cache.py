@@ -0,0 +1,49 @@
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from msfx.lib_back2.mk.cache import BarCache
+from msfx.lib_back2.mk.data import MkData
+
+class MkDataTest(MkData):
+    def get_ticker_info(self, **kwargs) -> tuple[str, str, str, str, int]:
+        return "FX", "EUR", "USD", "MIN", 1
+    def get_ticker_data(self, **kwargs) -> list[tuple[datetime, float, float, float, float, float]]:
+        start = kwargs["start"]
+        return [(start + timedelta(minutes=i), 1.1, 1.2, 1.0, 1.15, float(i)) for i in range(kwargs["count"])]
+
+with tempfile.TemporaryDirectory() as path:
+    cache = BarCache(path)
+    start = datetime(2024, 1, 1)
+    mk_data = MkDataTest()
+
+    start_time = time.perf_counter()
+    bar_file = cache.load(mk_data, start=start, count=500000)
+    print(f"Loaded {len(bar_file)} bars, capacity {bar_file.capacity}, {time.perf_counter() - start_time:.3f} s")
+
+    # Reload, only the new bars are appended, the last bar is replaced.
+    bar_file.close()
+    bar_file = cache.load(mk_data, start=start + timedelta(minutes=499999), count=10)
+    print("After reload", len(bar_file), bar_file.get_last_time())
+
+    # Range reads are views of the mapped file.
+    reader = cache.open(mk_data.get_ticker_info(), read_only=True)
+    start_time = time.perf_counter()
+    for _ in range(10000):
+        bars = reader.get_range(datetime(2024, 2, 1), datetime(2024, 2, 2))
+    print(f"10000 range reads in {time.perf_counter() - start_time:.3f} s")
+    print(len(bars.time), bars.time[0], bars.time[-1], bars.volume[:3], "view", not bars.close.flags.owndata)
+    try:
+        reader.append_bars(mk_data.get_ticker_data(start=datetime(2030, 1, 1), count=1))
+    except PermissionError as e:
+        print(e)
+
+    # The reader sees the appends of the writer after a refresh.
+    bar_file.append_bars(mk_data.get_ticker_data(start=datetime(2030, 1, 1), count=1))
+    reader.refresh()
+    print("Reader", len(reader), reader.get_last_time())
+    print("Close mean", float(np.mean(reader.get_range().close)))
+    reader.close()
+    bar_file.close()
@@ -0,0 +1,32 @@
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+
+from msfx.lib.db import Types
+from msfx.lib.db.md import Column, ColumnList
+from msfx.lib.db.rs.batch import get_batch
+
+columns = ColumnList()
+columns.append(Column(name="TIME", type=Types.DATETIME))
+columns.append(Column(name="CLOSE", type=Types.FLOAT))
+columns.append(Column(name="VOLUME", type=Types.INTEGER))
+columns.append(Column(name="PRICE", type=Types.DECIMAL, scale=2))
+columns.append(Column(name="NAME", type=Types.STRING))
+
+rows = [
+    (datetime(2024, 1, 2, 10), 1.1045, 120, Decimal("1.105"), "EURUSD"),
+    (datetime(2024, 1, 2, 11), 1.1051, None, Decimal("1.106"), None),
+    (None, None, 98, 1.2, "EURUSD"),
+]
+
+batch = get_batch(columns, rows)
+print(batch.size())
+for array in batch.arrays:
+    print(array.dtype, array)
+
+print(np.nanmean(batch.get_array_by_alias("CLOSE")))
+print(get_batch(columns, []).size())
+
+# Nulls, NaN for floats and masked for integers.
+print(batch.get_array_by_alias("CLOSE"), batch.get_array_by_alias("VOLUME").mask, batch.get_array_by_alias("VOLUME").sum())
@@ -27,3 +27,15 @@ print(cols_ro[0])
 # cols_ro.append(carticle)
 
 print(len(cols))
+
+# Removal keeps the indexes, primary key columns and default values in line.
+cols.append(Column(name="CSTORE", type=Types.STRING, primary_key=True))
+cols.append(Column(name="QPRICE", type=Types.DECIMAL, scale=4))
+print(cols.default_values)
+cols.remove("QSALES")
+print(cols.aliases, [cols.index_of(alias) for alias in cols.aliases], cols.index_of("QSALES"))
+print([column.get_alias() for column in cols.pk_columns], cols.default_values)
+cols.remove(1)
+print(cols.aliases, cols.index_of("QPRICE"), cols.pk_columns)
+cols.clear()
+print(len(cols), cols.aliases, cols.default_values)
@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta, date, time
+from decimal import Decimal
+
+from msfx.lib.db import Types, get_value, get_converter
+
+checks = [
+    (Types.DECIMAL, 2, Decimal("1.645")),
+    (Types.DECIMAL, 2, 1.645),
+    (Types.DECIMAL, 2, None),
+    (Types.INTEGER, 0, 10),
+    (Types.INTEGER, 0, 10.7),
+    (Types.FLOAT, 0, 3.5),
+    (Types.FLOAT, 0, Decimal("3.5")),
+    (Types.STRING, 0, "EURUSD"),
+    (Types.DATE, 0, date.today()),
+    (Types.TIME, 0, timedelta(hours=5, minutes=30)),
+    (Types.TIME, 0, time(5, 30)),
+    (Types.DATETIME, 0, datetime(2024, 1, 2, 10, 30)),
+    (Types.DATETIME, 0, 1704191400000),
+    (Types.DATETIME, 0, None),
+]
+
+for type, scale, raw in checks:
+    expected = get_value(type, scale, raw)
+    converted = get_converter(type, scale)(raw)
+    print(type.name, repr(raw), repr(converted), expected.value() == converted.value())
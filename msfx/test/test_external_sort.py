@@ -0,0 +1,79 @@
+import os
+import random
+import tempfile
+from datetime import datetime, date, time, timedelta
+from decimal import Decimal
+
+from msfx.lib.db import Types, Value
+from msfx.lib.db.md import Column, ColumnList, Order
+from msfx.lib.db.rs import Record
+from msfx.lib.db.rs.sort import ExternalSorter, RowCodec, external_sort
+
+random.seed(5)
+columns = ColumnList()
+columns.append(Column(name="SYMBOL", type=Types.STRING))
+columns.append(Column(name="TIME", type=Types.DATETIME))
+columns.append(Column(name="SEQ", type=Types.INTEGER))
+columns.append(Column(name="PRICE", type=Types.DECIMAL, scale=5))
+columns.append(Column(name="SIZE", type=Types.FLOAT))
+columns = columns.freeze()
+
+# The codec round trips all the fixed and variable types and nulls.
+codec_columns = ColumnList()
+for i, type in enumerate([Types.BOOLEAN, Types.INTEGER, Types.FLOAT, Types.COMPLEX, Types.DATE, Types.TIME,
+                          Types.DATETIME, Types.DECIMAL, Types.BINARY, Types.STRING, Types.LIST]):
+    codec_columns.append(Column(name=f"C{i}", type=type, scale=5))
+codec = RowCodec(codec_columns)
+row = (True, -2 ** 62, 1.5, complex(1, -2), date(2024, 2, 29), time(23, 59, 58, 999999),
+       datetime(1960, 5, 1, 12, 30, 0, 5), Decimal("-123.45600"), b"\x00\xff", "né", [1, "a"])
+print("Codec", codec.decode(codec.encode(row)) == row, codec.decode(codec.encode((None,) * 11)) == (None,) * 11)
+
+start = datetime(2024, 1, 1)
+records = [Record(columns, (Value(random.choice(["EURUSD", "GBPUSD", "USDJPY"])),
+                            Value(start + timedelta(seconds=random.randint(0, 3600))),
+                            Value(i),
+                            Value(Decimal(random.randint(10000, 20000)).scaleb(-5)),
+                            Value(random.random())))
+           for i in range(50000)]
+
+# Symbol ascending, time descending, ties in input order.
+order = Order()
+order.append(columns.get_by_alias("SYMBOL"), True)
+order.append(columns.get_by_alias("TIME"), False)
+
+def raw(record: Record) -> tuple:
+    return tuple(value.value() for value in record.values)
+
+expected = sorted((raw(record) for record in records), key=lambda r: (r[0], -r[1].timestamp()))
+
+with tempfile.TemporaryDirectory() as temp_dir:
+    sorter = ExternalSorter(order, columns, max_bytes=256 * 1024, temp_dir=temp_dir)
+    sorter.add_all(records)
+    result = [raw(record) for record in sorter.sort()]
+    print("Spilled", result == expected, sorter.runs, "runs", sorter.merge_passes, "merge passes",
+          "files left", len(os.listdir(temp_dir)))
+
+    # In memory when the budget is not exceeded.
+    result = [raw(record) for record in external_sort(records[:1000], order, columns, temp_dir=temp_dir)]
+    print("In memory", result == sorted((raw(record) for record in records[:1000]),
+                                        key=lambda r: (r[0], -r[1].timestamp())))
+
+    # Closing the stream early removes the runs.
+    sorter = ExternalSorter(order, columns, max_bytes=256 * 1024, temp_dir=temp_dir)
+    sorter.add_all(records)
+    stream = sorter.sort()
+    first = next(stream)
+    print("First", raw(first) == expected[0], "files", len(os.listdir(temp_dir)) > 0)
+    stream.close()
+    print("Closed, files left", len(os.listdir(temp_dir)))
+
+    # A sort never iterated does not leave runs, on close or when collected.
+    with ExternalSorter(order, columns, max_bytes=256 * 1024, temp_dir=temp_dir) as sorter:
+        sorter.add_all(records)
+        stream = sorter.sort()
+    print("Context manager, files left", len(os.listdir(temp_dir)))
+    sorter = ExternalSorter(order, columns, max_bytes=256 * 1024, temp_dir=temp_dir)
+    sorter.add_all(records)
+    stream = sorter.sort()
+    del sorter, stream
+    print("Collected, files left", len(os.listdir(temp_dir)))
@@ -0,0 +1,30 @@
+from decimal import Decimal
+
+from msfx.lib.db import Types, Value
+from msfx.lib.db.md import Column, ColumnList
+from msfx.lib.db.rs import Record
+
+columns = ColumnList()
+columns.append(Column(name="CARTICLE", type=Types.STRING, length=20))
+columns.append(Column(name="QSALES", type=Types.DECIMAL, length=24, scale=2))
+
+frozen = columns.freeze()
+print(frozen.aliases)
+print(frozen.types)
+print(frozen.scales)
+print(frozen.default_values)
+print(frozen.index_of("QSALES"))
+print(frozen.get_by_alias("CARTICLE"))
+
+record = Record(frozen, (Value("A-001"), Value(Decimal("12.50"))))
+print(record.get_value_by_alias("QSALES"))
+
+try:
+    frozen.append(Column(name="DESCRIPTION"))
+except PermissionError as e:
+    print(e)
+
+# The snapshot is shared until columns are appended or removed.
+print(columns.get_frozen() is columns.get_frozen(), columns.get_frozen().names)
+columns.append(Column(name="DESCRIPTION"))
+print(columns.get_frozen() is frozen, columns.get_frozen().names)
@@ -0,0 +1,19 @@
+from datetime import datetime
+from decimal import Decimal
+
+from msfx.lib.db import Types
+from msfx.lib.db.md import Column, ColumnList, get_converters
+from msfx.lib.db.rs import LazyRecord
+
+columns = ColumnList()
+columns.append(Column(name="TIME", type=Types.DATETIME))
+columns.append(Column(name="CLOSE", type=Types.DECIMAL, scale=4))
+columns.append(Column(name="VOLUME", type=Types.INTEGER))
+
+converters = get_converters(columns)
+record = LazyRecord(columns, (datetime(2024, 1, 2, 10), Decimal("1.10456"), None), converters)
+
+print(record.get_value_by_alias("CLOSE"))
+print(record.get_value_by_alias("CLOSE") is record.get_value_by_index(1))
+print(record.size())
+print(record)
@@ -0,0 +1,59 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from msfx.lib.db.cn.sqlite import SQLite
+from msfx.lib_back2.mk.importer import ImportTask, discover
+from msfx.lib_back2.task.monitor import TaskMonitor
+
+def write_file(file_name: str, start: datetime, count: int, close: float):
+    with open(file_name, "w") as file:
+        file.write("<TICKER>,<PER>,<DTYYYYMMDD>,<TIME>,<OPEN>,<HIGH>,<LOW>,<CLOSE>,<VOL>,<OPENINT>\n")
+        for i in range(count):
+            time = start + timedelta(minutes=i)
+            file.write(f"X,1,{time:%Y%m%d},{time:%H%M%S},1.1,1.2,1.0,{close},{i},0\n")
+
+class FailingImportTask(ImportTask):
+    """ Simulates a crash writing the second ticker. """
+    def write(self, ticker_info: tuple, bars) -> int:
+        if self.rows: raise RuntimeError("Crash")
+        return super().write(ticker_info, bars)
+
+def count(db, table_name: str) -> tuple:
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT COUNT(*), MIN(close), MAX(close) FROM {table_name}")
+        row = cursor.fetchone()
+        cursor.close()
+    return row
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as path:
+        data_path = os.path.join(path, "vchart")
+        os.makedirs(data_path)
+        start = datetime(2024, 1, 1)
+        # Two files of EUR/USD overlapping by 500 bars, the later file wins, and one of GBP/USD.
+        write_file(os.path.join(data_path, "FX_EUR_USD_MIN_1_2024a.txt"), start, 3000, 1.1)
+        write_file(os.path.join(data_path, "FX_EUR_USD_MIN_1_2024b.txt"), start + timedelta(minutes=2500), 3000, 1.2)
+        write_file(os.path.join(data_path, "FX_GBP_USD_MIN_1.txt"), start, 2000, 1.3)
+        # A stray file whose name does not encode a ticker.
+        write_file(os.path.join(data_path, "readme.txt"), start, 1, 1.0)
+        ignored = []
+        print({key: len(files) for key, files in discover(data_path, ignored=ignored).items()},
+              [os.path.basename(name) for name in ignored])
+
+        db = SQLite(database=os.path.join(path, "bars.db"))
+        checkpoint = os.path.join(path, "import.json")
+
+        task = FailingImportTask(db, data_path, workers=2, checkpoint=checkpoint)
+        task.executeTask()
+        print(task.get_state(), task.get_exception(), task.rows)
+
+        monitor = TaskMonitor()
+        task = ImportTask(db, data_path, workers=2, checkpoint=checkpoint, monitor=monitor)
+        task.executeTask()
+        progress = monitor.get_progress()
+        print(task.get_state(), "skipped", task.skipped, task.rows)
+        print(progress.message, progress.work_done, progress.total_work)
+        print("eur", count(db, "fx_eur_usd_min_1"), "gbp", count(db, "fx_gbp_usd_min_1"))
+        db.close()
@@ -0,0 +1,48 @@
+import time
+
+import numpy as np
+
+from msfx.lib_back2.mk.data import Bars
+from msfx.lib_back2.mk.resample import resample, Resampler
+
+def get_bars(count: int, start: str = "2024-01-01T00:00") -> Bars:
+    rng = np.random.default_rng(1)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0001, count))
+    open = np.append(close[:1], close[:-1])
+    high = np.maximum(open, close) + rng.uniform(0, 0.0002, count)
+    low = np.minimum(open, close) - rng.uniform(0, 0.0002, count)
+    time = np.datetime64(start, "us") + np.arange(count) * np.timedelta64(1, "m")
+    return Bars(time, open, high, low, close, rng.uniform(1, 100, count))
+
+bars = get_bars(1000000)
+for unit, size in [("MIN", 5), ("HR", 1), ("HR", 4), ("DAY", 1)]:
+    start_time = time.perf_counter()
+    resampled = resample(bars, unit, size)
+    print(f"{unit} {size}: {len(resampled.time)} bars in {time.perf_counter() - start_time:.3f} s")
+h4 = resample(bars, "HR", 4)
+print(h4.time[:3])
+print("H4 volume matches", bool(np.isclose(h4.volume.sum(), bars.volume.sum())))
+print("First H4 high", h4.high[0] == bars.high[:240].max(), "close", h4.close[0] == bars.close[239])
+
+# Incremental updates in chunks, the last base bar of a chunk sent again as still open.
+resampler = Resampler("HR", 4)
+position = 0
+start_time = time.perf_counter()
+while position < len(bars.time):
+    end = min(position + 997, len(bars.time))
+    resampler.update(Bars(*[column[max(position - 1, 0):end] for column in bars]))
+    position = end
+print(f"Incremental in {time.perf_counter() - start_time:.3f} s")
+incremental = resampler.bars
+print("Incremental equals", all(np.array_equal(a, b) for a, b in zip(incremental, h4)))
+
+# Update of the open base bar, the last bucket is recomputed.
+tail = Bars(*[column[-1:].copy() for column in bars])
+tail.high[0] = 2.0
+updated = resampler.update(tail)
+print(len(updated.time), updated.time[0] == h4.time[-1], updated.high[0], len(resampler.bars.time) == len(h4.time))
+
+try:
+    Resampler("WEEK", 1)
+except ValueError as e:
+    print(e)
@@ -0,0 +1,47 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from msfx.lib_back2.mk.data import MkDataVChart
+
+mk_data = MkDataVChart()
+start = datetime(2024, 1, 1)
+with tempfile.TemporaryDirectory() as path:
+    # With header and HHMMSS times.
+    file_name = os.path.join(path, "FX_EUR_USD_MIN_005.txt")
+    with open(file_name, "w") as file:
+        file.write("<TICKER>,<PER>,<DTYYYYMMDD>,<TIME>,<OPEN>,<HIGH>,<LOW>,<CLOSE>,<VOL>,<OPENINT>\n")
+        for i in range(1000):
+            time = start + timedelta(minutes=5 * i)
+            file.write(f"EURUSD,5,{time:%Y%m%d},{time:%H%M%S},1.1{i:04d},1.2,1.0,1.15,{i},0\n")
+    print(mk_data.get_ticker_info(file_name=file_name))
+    bars = mk_data.get_ticker_data(file_name=file_name)
+    print(len(bars.time), bars.time[0], bars.time[-1], bars.open[:3], bars.volume[-1])
+
+    # Small blocks split lines across blocks, the result is the same.
+    chunks = list(mk_data.get_ticker_chunks(file_name=file_name, block_size=1000))
+    print(len(chunks), "chunks, equal",
+          all(np.array_equal(np.concatenate([chunk[i] for chunk in chunks]), bars[i]) for i in range(6)))
+
+    # Without header, HHMM times and Windows line ends.
+    file_name = os.path.join(path, "FX_EUR_USD_MIN_001.txt")
+    with open(file_name, "wb") as file:
+        file.write(b"EURUSD,1,20240102,0930,1.1,1.2,1.0,1.15,10\r\nEURUSD,1,20240102,0931,1.2,1.3,1.1,1.25,20\r\n")
+    bars = mk_data.get_ticker_data(file_name=file_name)
+    print(bars.time, bars.close)
+
+    # Unpadded HHMMSS times, the format is decided by the widest time, not the first one.
+    file_name = os.path.join(path, "FX_EUR_USD_MIN_060.txt")
+    with open(file_name, "wb") as file:
+        file.write(b"EURUSD,60,20240101,0,1.1,1.2,1.0,1.15,10\nEURUSD,60,20240101,10000,1.2,1.3,1.1,1.25,20\n")
+    print(mk_data.get_ticker_data(file_name=file_name).time)
+
+    # Padded HHMM times followed by HHMMSS times are rejected.
+    with open(file_name, "wb") as file:
+        file.write(b"EURUSD,60,20240101,0000,1.1,1.2,1.0,1.15,10\nEURUSD,60,20240101,010000,1.2,1.3,1.1,1.25,20\n")
+    try:
+        mk_data.get_ticker_data(file_name=file_name)
+    except ValueError as e:
+        print(e)
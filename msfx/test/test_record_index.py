@@ -0,0 +1,58 @@
+import random
+from datetime import datetime, timedelta
+
+from msfx.lib.db import Types, Value, Key
+from msfx.lib.db.md import Column, ColumnList, Index
+from msfx.lib.db.rs import Record
+from msfx.lib.db.rs.index import RecordIndex
+
+random.seed(3)
+columns = ColumnList()
+columns.append(Column(name="SYMBOL", type=Types.STRING))
+columns.append(Column(name="TIME", type=Types.DATETIME))
+columns.append(Column(name="CLOSE", type=Types.FLOAT))
+
+start = datetime(2024, 1, 1)
+records = [Record(columns, (Value(random.choice(["EURUSD", "GBPUSD", "USDJPY"])),
+                            Value(start + timedelta(minutes=random.randint(0, 1000))),
+                            Value(random.random())))
+           for _ in range(2000)]
+
+# Non unique index, symbol ascending and time descending.
+index = Index()
+index.append(columns.get_by_alias("SYMBOL"), True)
+index.append(columns.get_by_alias("TIME"), False)
+record_index = RecordIndex(index, columns, records[:1000])
+for record in records[1000:]:
+    record_index.insert(record)
+
+def values(record: Record) -> tuple:
+    return record.get_value_by_index(0).value(), record.get_value_by_index(1).value()
+
+expected = sorted(records, key=lambda r: (values(r)[0], -values(r)[1].timestamp()))
+print("Order", [values(r) for r in record_index] == [values(r) for r in expected])
+
+gbp = record_index.get_all(["GBPUSD"])
+print("Prefix", len(gbp) == sum(1 for r in records if values(r)[0] == "GBPUSD"),
+      all(values(r)[0] == "GBPUSD" for r in gbp))
+
+# Descending time, the range starts at the later time.
+later, earlier = start + timedelta(minutes=800), start + timedelta(minutes=200)
+window = record_index.get_range(["EURUSD", later], ["EURUSD", earlier], include_end=True)
+print("Range", len(window) == sum(1 for r in records if values(r)[0] == "EURUSD" and earlier <= values(r)[1] <= later),
+      values(window[0])[1] <= later, values(window[-1])[1] >= earlier)
+print("Missing", record_index.get(["CHFJPY"]))
+
+# Unique index on time.
+unique = Index()
+unique.append(columns.get_by_alias("TIME"))
+unique.set_unique(True)
+bars = [Record(columns, (Value("EURUSD"), Value(start + timedelta(minutes=i)), Value(float(i)))) for i in range(100)]
+time_index = RecordIndex(unique, columns, reversed(bars))
+key = Key()
+key.append(Value(start + timedelta(minutes=42)))
+print("Point", time_index.get(key).get_value_by_index(2), len(time_index.get_range([start], [start + timedelta(minutes=10)])))
+try:
+    time_index.insert(bars[0])
+except ValueError as e:
+    print(e)
@@ -0,0 +1,85 @@
+import random
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from functools import cmp_to_key
+
+from msfx.lib.db import Key, OrderKey, Value, Types, get_sort_key, get_sort_bytes
+
+random.seed(7)
+
+def compare(a: list, b: list) -> int:
+    # Reference comparison segment by segment, None lowest, inverted for descending.
+    for (x, asc), (y, _) in zip(a, b):
+        if x == y: continue
+        if x is None: result = -1
+        elif y is None: result = 1
+        else: result = -1 if x < y else 1
+        return result if asc else -result
+    return 0
+
+generators = [
+    lambda: random.randint(-1000, 1000),
+    lambda: random.uniform(-10.0, 10.0),
+    lambda: Decimal(random.randint(-100000, 100000)).scaleb(-random.randint(0, 4)),
+    lambda: "".join(random.choice("ab\x00é") for _ in range(random.randint(0, 4))),
+    lambda: bytes(random.choice(b"\x00\x01\xff") for _ in range(random.randint(0, 3))),
+    lambda: date(2024, 1, 1) + timedelta(days=random.randint(-500, 500)),
+    lambda: datetime(2024, 1, 1) + timedelta(seconds=random.randint(-10 ** 6, 10 ** 6)),
+    lambda: time(random.randint(0, 23), random.randint(0, 59), 0, random.randint(0, 10)),
+    lambda: random.random() < 0.5,
+]
+
+for generate in generators:
+    for asc_first, asc_second in [(True, True), (True, False), (False, True), (False, False)]:
+        keys = []
+        for _ in range(300):
+            first = None if random.random() < 0.1 else generate()
+            second = None if random.random() < 0.1 else random.randint(0, 3)
+            keys.append([(first, asc_first), (second, asc_second)])
+        expected = sorted(keys, key=cmp_to_key(compare))
+        assert sorted(keys, key=get_sort_key) == expected, generate
+        assert sorted(keys, key=get_sort_bytes) == expected, generate
+print("Sort keys and bytes match the reference order")
+
+ok1 = OrderKey()
+ok1.append(Value(10), True)
+ok1.append(Value("John"), False)
+ok2 = OrderKey()
+ok2.append(Value(10), True)
+ok2.append(Value("Anne"), False)
+print(ok1 < ok2, ok1.get_sort_key(), ok1.get_sort_bytes().hex())
+ok2.clear()
+ok2.append(Value(10), True)
+ok2.append(Value("John"), False)
+print(ok1 == ok2)
+
+key = Key()
+key.append(Value(Types.DATE))
+key.append(Value(Decimal("-1.50")))
+print(key.get_sort_key(), key.get_sort_bytes().hex())
+
+try:
+    get_sort_key([(Value(complex(1, 1)), False)])
+except TypeError as e:
+    print(e)
+try:
+    get_sort_bytes([(2 ** 70, True)])
+except ValueError as e:
+    print(e)
+
+# Values mutated in place, the keys compare with the current values.
+value = Value(10)
+ok3 = OrderKey()
+ok3.append(value, True)
+ok4 = OrderKey()
+ok4.append(Value(20), True)
+print(ok3 < ok4, end=" ")
+value.set_integer(30)
+print(ok3 < ok4)
+
+# Equality compares the segments, also for values without sort key.
+ok5 = OrderKey()
+ok5.append(Value(complex(1, 1)), False)
+ok6 = OrderKey()
+ok6.append(Value(complex(1, 1)), False)
+print(ok5 == ok6, ok5 != ok6)